@@ -0,0 +1,63 @@
+"""
+Benchmark of ScrapingBot.append_data.
+
+Appends 100k rows (dicts) and 100k scalars and reads the result once. For comparison the old way of growing a
+DataFrame on every call (DataFrame._append, i.e. a concat of the whole frame) is measured with fewer rows, because it is quadratic.
+
+    python benchmarks/bench_append_data.py
+"""
+import os
+import sys
+import time
+
+# run from the repository root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+
+ROWS = 100000
+OLD_ROWS = 2000
+
+
+def bench_rows(n):
+    bot = ScrapingBot(None)
+    start = time.perf_counter()
+    for i in range(n):
+        bot.append_data("rows", {"page": i // 20, "title": "Title " + str(i), "price": i * 0.5})
+    appended = time.perf_counter()
+    df = bot.get_data("rows")
+    end = time.perf_counter()
+    assert len(df) == n
+    return appended - start, end - appended
+
+
+def bench_items(n):
+    bot = ScrapingBot(None)
+    start = time.perf_counter()
+    for i in range(n):
+        bot.append_data("items", i)
+    items = bot.get_data("items")
+    end = time.perf_counter()
+    assert len(items) == n
+    return end - start
+
+
+def bench_old_append(n):
+    df = pd.DataFrame([{"page": 0, "title": "Title 0", "price": 0.0}])
+    start = time.perf_counter()
+    for i in range(1, n):
+        row = pd.DataFrame([{"page": i // 20, "title": "Title " + str(i), "price": i * 0.5}])
+        df = pd.concat([df, row], ignore_index=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    append_time, read_time = bench_rows(ROWS)
+    print("append_data rows:   %d appends in %.3fs (%.2f us/append), get_data in %.3fs"
+          % (ROWS, append_time, append_time / ROWS * 1e6, read_time))
+    items_time = bench_items(ROWS)
+    print("append_data items:  %d appends in %.3fs (%.2f us/append)" % (ROWS, items_time, items_time / ROWS * 1e6))
+    old_time = bench_old_append(OLD_ROWS)
+    print("grow DataFrame:     %d appends in %.3fs (%.2f us/append)" % (OLD_ROWS, old_time, old_time / OLD_ROWS * 1e6))
@@ -0,0 +1,54 @@
+"""
+Benchmark of the ScrapingDataFormat encodings.
+
+Encodes a DataFrame of 100k rows with NaN values in every format and measures the time of the encoding plus
+json.dumps and the size of the JSON payload. For comparison the old conversion (replace NaN, then to_dict records)
+is measured as well.
+
+    python benchmarks/bench_data_format.py
+"""
+import json
+import os
+import sys
+import time
+
+# run from the repository root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from pyselenscrapr.ScrapingDataFormat import ScrapingDataFormat, encode_frame
+
+ROWS = 100000
+
+
+def make_frame(n):
+    rng = np.random.default_rng(0)
+    price = rng.random(n) * 100
+    price[rng.random(n) < 0.1] = np.nan
+    title = np.array(["Title " + str(i) for i in range(n)], dtype=object)
+    title[rng.random(n) < 0.1] = None
+    return pd.DataFrame({"page": np.arange(n) // 20, "title": title, "price": price,
+                         "url": ["https://example.com/item/" + str(i) for i in range(n)]})
+
+
+def bench(name, convert, df):
+    start = time.perf_counter()
+    body = json.dumps(convert(df))
+    end = time.perf_counter()
+    print("%-8s %.3fs  %8.1f KB" % (name, end - start, len(body) / 1024))
+
+
+if __name__ == "__main__":
+    df = make_frame(ROWS)
+    print("%d rows, time of the encoding and json.dumps, size of the JSON" % ROWS)
+    bench("old", lambda d: d.replace({np.nan: None}).to_dict(orient="records"), df)
+    bench("records", lambda d: encode_frame(d, ScrapingDataFormat.Records), df)
+    bench("split", lambda d: encode_frame(d, ScrapingDataFormat.Split), df)
+    bench("columns", lambda d: encode_frame(d, ScrapingDataFormat.Columns), df)
+    try:
+        import pyarrow
+        bench("arrow", lambda d: encode_frame(d, ScrapingDataFormat.Arrow), df)
+    except ImportError:
+        print("arrow    skipped, pyarrow is not installed")
@@ -0,0 +1,187 @@
+"""
+Benchmark suite of the engine on the ScrapingFakeDriver, without a browser.
+
+Every benchmark prints the throughput and the round-trips to the driver per operation. With the default latency of
+0 ms it measures the overhead of the engine itself, with e.g. --latency 2 the round-trips dominate like with a real
+browser. Run it before and after a change to catch performance regressions.
+
+    python benchmarks/bench_engine.py
+    python benchmarks/bench_engine.py --latency 2 --scale 0.2
+    python benchmarks/bench_engine.py --only pagination tables
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+# run from the repository root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.common.by import By
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingDataFormat import ScrapingDataFormat
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingLogic import ScrapingLogic
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+from pyselenscrapr.ScrapingStep import ScrapingStep
+from pyselenscrapr.ScrapingStepLoop import ScrapingStepLoop
+from pyselenscrapr.ScrapingStepPagination import ScrapingStepPagination, ScrapingStepPaginationMode
+
+BASE_URL = "https://fixtures.local/"
+
+
+def list_page(page, items):
+    rows = "".join("<li class=\"item\" data-id=\"%d\"><a href=\"/item/%d\">Item %d</a><span class=\"price\">%d.99</span>"
+                   "</li>" % (i, i, i, i) for i in range(page * items, (page + 1) * items))
+    return "<html><head><title>Page %d</title></head><body><h1>Page %d</h1><ul id=\"list\">%s</ul>" \
+           "<a id=\"next\" href=\"/list/%d\">Next</a></body></html>" % (page, page, rows, page + 1)
+
+
+def table_page(rows):
+    body = "".join("<tr><td>%d</td><td>Name %d</td><td>%d,%03d</td></tr>" % (i, i, i, i % 1000) for i in range(rows))
+    return "<html><body><table id=\"t\"><thead><tr><th>Id</th><th>Name</th><th>Price</th></tr></thead>" \
+           "<tbody>%s</tbody></table></body></html>" % body
+
+
+def fixtures(pages, items, table_rows):
+    site = {BASE_URL + "list/" + str(p): list_page(p, items) for p in range(1, pages + 1)}
+    site[BASE_URL + "table"] = table_page(table_rows)
+    return site
+
+
+def new_bot(driver, **kwargs):
+    return ScrapingBot(driver, pacing=ScrapingPacingNone(), **kwargs)
+
+
+def timed(driver, unit, ops, func):
+    round_trips = driver.round_trips
+    start = time.perf_counter()
+    func()
+    return unit, ops, time.perf_counter() - start, driver.round_trips - round_trips
+
+
+def bench_scheduler(args, driver):
+    n = int(20000 * args.scale)
+    bot = new_bot(driver)
+    groups = [bot.add_step_group("group " + str(g)) for g in range(4)]
+    previous = None
+    for i in range(n):
+        step = ScrapingStep("step " + str(i), lambda l: None, previous_step=previous if i % 2 == 0 else None)
+        bot.add_step(step, groups[i * 4 // n])
+        if i % 2 == 0:
+            previous = step
+    return timed(driver, "steps", n, lambda: bot.run(groups[0]))
+
+
+def bench_append_data(args, driver):
+    n = int(200000 * args.scale)
+    bot = new_bot(driver)
+    l = ScrapingLogic(driver, bot)
+
+    def append():
+        for i in range(n):
+            l.append_data("rows", {"page": i // 20, "title": "Title " + str(i), "price": i * 0.5})
+        assert len(bot.get_data("rows")) == n
+    return timed(driver, "rows", n, append)
+
+
+def bench_converted_data(args, driver):
+    n = int(100000 * args.scale)
+    bot = new_bot(driver)
+    for i in range(n):
+        bot.append_data("rows", {"page": i // 20, "title": "Title " + str(i), "price": i * 0.5})
+    data = {"rows": bot.get_data("rows")}
+    results = []
+    for name in ("Records", "Columns"):
+        bot.set_data_format(getattr(ScrapingDataFormat, name))
+        results.append(timed(driver, "rows (" + name.lower() + ")", n, lambda: bot.get_converted_data(data)))
+    return results
+
+
+def bench_pagination(args, driver):
+    pages = args.pages
+    bot = new_bot(driver)
+
+    def scrape(l):
+        for item in l.snapshot("#list .item", ["data-id"], all=True):
+            l.append_data("items", {"id": item["attributes"]["data-id"], "text": item["text"]})
+
+    step = ScrapingStepPagination("list", scrape, lambda l, p: l.get(BASE_URL + "list/" + str(p)),
+                                  lambda l, p: l.element_exists("#list"), ScrapingStepPaginationMode.AllPages,
+                                  lambda l: pages)
+    bot.add_step(step)
+    result = timed(driver, "pages", pages, bot.run)
+    assert len(bot.get_data("items")) == pages * args.items
+    return result
+
+
+def bench_loop(args, driver):
+    driver.get(BASE_URL + "list/1")
+    bot = new_bot(driver)
+
+    def read(l):
+        element = l.element()
+        l.append_data("items", {"text": element.text, "id": element.get_attribute("data-id")})
+
+    bot.add_step(ScrapingStepLoop("items", lambda l: l.find_elements(By.CSS_SELECTOR, "#list .item"),
+                                  [ScrapingStep("read", read)]))
+    result = timed(driver, "elements", args.items, bot.run)
+    assert len(bot.get_data("items")) == args.items
+    return result
+
+
+def bench_tables(args, driver):
+    driver.get(BASE_URL + "table")
+    l = ScrapingLogic(driver, new_bot(driver))
+    repeat = max(1, int(20 * args.scale))
+
+    def extract():
+        for i in range(repeat):
+            assert len(l.extract_tables("#t", concat=True)) == args.table_rows
+
+    def read_html():
+        # the way before extract_tables: the outerHTML of the table is parsed with pd.read_html
+        for i in range(repeat):
+            assert len(l.convert_table_to_df(driver.find_element(By.CSS_SELECTOR, "#t"))) == args.table_rows
+    return [timed(driver, "tables (extract_tables)", repeat, extract),
+            timed(driver, "tables (read_html)", repeat, read_html)]
+
+
+BENCHMARKS = {
+    "scheduler": bench_scheduler,
+    "append_data": bench_append_data,
+    "get_converted_data": bench_converted_data,
+    "pagination": bench_pagination,
+    "loop": bench_loop,
+    "tables": bench_tables,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds per round-trip")
+    parser.add_argument("--scale", type=float, default=1.0, help="scale the sizes of the benchmarks")
+    parser.add_argument("--pages", type=int, default=50, help="pages of the pagination benchmark")
+    parser.add_argument("--items", type=int, default=50, help="items per page")
+    parser.add_argument("--table-rows", type=int, default=500, help="rows of the table benchmark")
+    parser.add_argument("--only", nargs="*", choices=list(BENCHMARKS), help="run only these benchmarks")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    site = fixtures(args.pages, args.items, args.table_rows)
+    print("%-20s %-26s %10s %10s %12s %12s %8s" % ("benchmark", "unit", "ops", "seconds", "ops/s", "round-trips",
+                                                  "rt/op"))
+    for name, bench in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        driver = ScrapingFakeDriver(site, latency=args.latency / 1000, start_url=BASE_URL + "list/1")
+        results = bench(args, driver)
+        for unit, ops, seconds, round_trips in (results if isinstance(results, list) else [results]):
+            print("%-20s %-26s %10d %10.3f %12.1f %12d %8.2f" % (name, unit, ops, seconds, ops / seconds, round_trips,
+                                                                 round_trips / ops))
+
+
+if __name__ == "__main__":
+    main()
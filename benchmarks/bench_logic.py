@@ -0,0 +1,95 @@
+"""
+Micro-benchmark of the attribute access of ScrapingLogic.
+
+Calls driver functions through the logic on a driver that does nothing, so only the overhead of the facade is
+measured. For comparison the same calls are made with the facade before the change, which created a new wrapper
+function on every attribute access, wrapped every result (also strings and lists) into a new ScrapingLogic and built
+a new logic for every check of the bot.
+
+    python benchmarks/bench_logic.py
+"""
+import os
+import sys
+import time
+
+# run from the repository root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingElementCache import MUTATING_COMMANDS
+from pyselenscrapr.ScrapingLogic import ScrapingLogic
+
+CALLS = 500000
+
+
+class Element:
+    def find_element(self, by, value):
+        return self
+
+    def get_attribute(self, name):
+        return "value"
+
+
+class Driver:
+    def __init__(self):
+        self._element = Element()
+
+    def find_element(self, by, value):
+        return self._element
+
+    def find_elements(self, by, value):
+        return [self._element]
+
+    def get_attribute(self, name):
+        return "value"
+
+
+def old_tocontainer(func, bot):
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        if bot is not None and getattr(func, "__name__", None) in MUTATING_COMMANDS:
+            bot.element_cache().invalidate()
+        return OldScrapingLogic(result, bot)
+    return wrapper
+
+
+class OldScrapingLogic(object):
+    """
+    The facade before the change.
+    """
+    def __init__(self, driver, bot):
+        self._driver = driver
+        self._bot = bot
+
+    def __getattr__(self, item):
+        result = getattr(self._driver, item)
+        if callable(result):
+            result = old_tocontainer(result, self._bot)
+        return result
+
+
+def bench(name, func):
+    start = time.perf_counter()
+    for i in range(CALLS):
+        func()
+    return name, (time.perf_counter() - start) / CALLS * 1e9
+
+
+def run(cls, bot, new_logic):
+    driver = bot._driver
+    l = cls(driver, bot)
+    return [
+        bench("call returning a string", lambda: l.get_attribute("href")),
+        bench("call returning a list", lambda: l.find_elements("css selector", "a")),
+        bench("call returning an element", lambda: l.find_element("css selector", "a")),
+        bench("logic for a check", new_logic),
+    ]
+
+
+if __name__ == "__main__":
+    bot = ScrapingBot(Driver())
+    old = run(OldScrapingLogic, bot, lambda: OldScrapingLogic(bot._driver, bot))
+    new = run(ScrapingLogic, bot, bot._new_logic)
+    print("%-28s %12s %12s %10s" % ("", "before ns", "after ns", "reduction"))
+    for (name, before), (_, after) in zip(old, new):
+        print("%-28s %12.1f %12.1f %9.0f%%" % (name, before, after, (1 - after / before) * 100))
@@ -0,0 +1,82 @@
+"""
+Benchmark of the step scheduler of ScrapingBot.
+
+Runs plans with a growing number of steps that do nothing and prints the time per step. Half of the steps are a
+chain (every step has the step before as previous_step), the other half are independent. For comparison the same
+plans are run with the old scheduler that scans all steps of all groups for every step, which is quadratic.
+
+    python benchmarks/bench_scheduler.py
+"""
+import logging
+import os
+import sys
+import time
+
+# run from the repository root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+from pyselenscrapr.ScrapingStep import ScrapingStep, ScrapingStepInterval
+
+SIZES = [250, 1000, 4000, 16000]
+OLD_MAX_SIZE = 4000
+
+
+class LinearScanBot(ScrapingBot):
+    """
+    The scheduler before the index: every check scans the steps.
+    """
+    def all_groups_executed(self):
+        for group in self._stepGroups:
+            for step in group._steps:
+                if not step.was_executed():
+                    return False
+        return True
+
+    def get_next_step(self, step):
+        for s in self._current_group._steps:
+            if s.interval() != ScrapingStepInterval.Order or s.was_executed():
+                continue
+            if s.previous_step() is None or s.previous_step().was_executed():
+                return s
+        return None
+
+    def get_all_steps_by_interval(self, interval):
+        return [s for s in self._current_group._steps if s.interval() == interval and not s.was_executed()]
+
+    def _is_group_finished(self, group):
+        for step in group._steps:
+            if not step.was_executed():
+                return False
+        return True
+
+
+def make_bot(cls, n):
+    bot = cls(None, pacing=ScrapingPacingNone())
+    groups = [bot.add_step_group("group " + str(g)) for g in range(4)]
+    previous = None
+    for i in range(n):
+        step = ScrapingStep("step " + str(i), lambda l: None, previous_step=previous if i % 2 == 0 else None)
+        bot.add_step(step, groups[i * 4 // n])
+        if i % 2 == 0:
+            previous = step
+    return bot
+
+
+def bench(cls, n):
+    bot = make_bot(cls, n)
+    start = time.perf_counter()
+    assert bot.run(bot._stepGroups[0])
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    for n in SIZES:
+        new_time = bench(ScrapingBot, n)
+        line = "%5d steps: index %.3fs (%.1f us/step)" % (n, new_time, new_time / n * 1e6)
+        if n <= OLD_MAX_SIZE:
+            old_time = bench(LinearScanBot, n)
+            line += ", linear scan %.3fs (%.1f us/step)" % (old_time, old_time / n * 1e6)
+        print(line)
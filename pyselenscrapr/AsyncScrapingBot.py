@@ -0,0 +1,241 @@
+import asyncio
+import functools
+from typing import Union
+
+from pyselenscrapr.AsyncScrapingLogic import AsyncScrapingLogic
+from pyselenscrapr.AsyncScrapingStep import AsyncScrapingStep, maybe_await
+from pyselenscrapr.ScrapingBot import ScrapingBot, TakeScreenshotModes
+from pyselenscrapr.ScrapingCheckpoint import ScrapingCheckpoint
+from pyselenscrapr.ScrapingPacing import ScrapingPacingEvent
+from pyselenscrapr.ScrapingStep import ScrapingStep, ScrapingStepInterval, ScrapingStepErrorHandling
+from pyselenscrapr.ScrapingStepGroup import ScrapingStepGroup
+
+
+class AsyncScrapingBot(ScrapingBot):
+    """
+
+    The AsyncScrapingBot is the asyncio variant of the ScrapingBot. Steps, groups and data are handled the same way,
+    but run() is a coroutine and all pauses are awaited, so one event loop can drive many bots.
+
+    AsyncScrapingSteps are awaited with an AsyncScrapingLogic. Plain ScrapingSteps are still supported and are executed
+    in the executor of the bot.
+
+    """
+    def __init__(self, driver, *args, executor=None, **kwargs):
+        """
+        Constructor for AsyncScrapingBot. It takes the same arguments as ScrapingBot, except parallel_chains: the chains
+        of a group are run one after the other.
+
+        :param driver: the selenium driver
+        :param executor: the concurrent.futures executor for the blocking WebDriver calls, None for the default
+            executor of the event loop
+        """
+        if kwargs.get("parallel_chains", 1) > 1:
+            raise ValueError("The AsyncScrapingBot doesn't run chains in parallel, use a ScrapingBot for parallel_chains.")
+        super().__init__(driver, *args, **kwargs)
+        self._executor = executor
+
+    async def run_sync(self, func, *args, **kwargs):
+        """
+        Run a blocking function in the executor of the bot. The driver commands it sends are attributed to the step
+        that is running.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(
+            self._run_for_step, getattr(self._active, "step", None), func, *args, **kwargs))
+
+    def _run_for_step(self, step_name, func, *args, **kwargs):
+        # the thread of the executor has its own active step
+        self._set_active_step(step_name)
+        return func(*args, **kwargs)
+
+    async def asleep(self, seconds):
+        self._element_cache.invalidate()
+        await self._clock.asleep(seconds)
+
+    async def apace(self, event: ScrapingPacingEvent, seconds: float):
+        """
+        Pause the bot with the pacing policy without blocking the event loop.
+
+        :param event: the ScrapingPacingEvent that causes the pause
+        :param seconds: the default pause in seconds, the policy decides if it is used
+        :return: the seconds the bot paused
+        """
+        self._element_cache.invalidate()
+        paused = await self._pacing.apause(event, seconds, self)
+        self._count_sleep(paused)
+        return paused
+
+    async def _aon_exception(self, e, step):
+        await self.run_sync(self._on_exception, e, step)
+
+    async def _run_step(self, step, retryInterval=0):
+        if not isinstance(step, AsyncScrapingStep):
+            return await self.run_sync(ScrapingBot._run_step, self, step, retryInterval)
+
+        with self._observe_step(step) as observation:
+            self._element_cache.invalidate()
+            try:
+                if step.can_execute is not None:
+                    with observation.phase("can_execute"):
+                        can_execute = await maybe_await(step.can_execute(AsyncScrapingLogic(self._driver, self)))
+                    if not can_execute:
+                        observation.outcome = "skipped"
+                        return
+            except Exception as e:
+                if step.error_handling() != ScrapingStepErrorHandling.Ignore:
+                    await self._aon_exception(e, step)
+
+            try:
+                if step.previous_step() is not None and not step.previous_step().was_executed():
+                    observation.outcome = "skipped"
+                    return
+            except Exception as e:
+                if step.error_handling() != ScrapingStepErrorHandling.Ignore:
+                    await self._aon_exception(e, step)
+
+            if step.before_validation is not None:
+                try:
+                    await maybe_await(step.before_validation())
+                except Exception as e:
+                    if step.error_handling() != ScrapingStepErrorHandling.Ignore:
+                        await self._aon_exception(e, step)
+                    else:
+                        self._on_warning(e)
+
+            for i in range(self._max_retries):
+                observation.attempt(i)
+                try:
+                    l = AsyncScrapingLogic(self._driver, self)
+                    with observation.phase("execute"):
+                        await step.execute(l)
+                    self._element_cache.invalidate()
+                    with observation.phase("was_executed"):
+                        executed = await step.is_executed(l)
+                    if executed:
+                        step.set_executed()
+                        observation.outcome = "executed"
+                    else:
+                        observation.outcome = "not_executed"
+                    break
+                except Exception as e:
+                    if step.error_handling() != ScrapingStepErrorHandling.Ignore:
+                        await self._aon_exception(e, step)
+                    else:
+                        self._on_warning(e)
+
+                    if step.can_retry():
+                        await step.retry()
+                    else:
+                        if step.exit_bot_when_errored():
+                            message = "The bot will exit because of an error in the step: "+step.name()
+                            await self._aon_exception(message, None)
+                            raise Exception(message)
+
+                        break
+
+            if step.after_validation is not None:
+                await maybe_await(step.after_validation())
+
+    async def _run_before_step(self, step):
+        steps = self.get_all_steps_by_interval(ScrapingStepInterval.BeforeAnyStep)
+        for s in steps:
+            await self._run_step(s)
+
+    async def _run_after_step(self, step):
+        if self._take_screenshots_mode == TakeScreenshotModes.Always:
+            await self.run_sync(self._take_screenshot, step)
+        elif self._take_screenshots_mode == TakeScreenshotModes.ErrorContext:
+            await self.run_sync(self._record_screenshot, step)
+        steps = self.get_all_steps_by_interval(ScrapingStepInterval.AfterAnyStep)
+        for s in steps:
+            await self._run_step(s)
+
+    async def run(self, first_group: Union[str , ScrapingStepGroup]  = None,
+                  resume_from: Union[str, ScrapingCheckpoint, dict] = None):
+        """
+        Run the bot and execute all steps in the defined groups. At the end the backend is flushed.
+
+        :param first_group: This is the name of the first group to start. If it is None we use "default" as the first group.
+        :param resume_from: a checkpoint file, a ScrapingCheckpoint or a checkpoint state to continue an interrupted
+            run from.
+        :return: True if the bot finished successfully, False otherwise.
+        """
+        first_group = self._resume(first_group, resume_from)
+        self._profiler.reset()
+        try:
+            return await self._run(first_group)
+        finally:
+            await self.run_sync(self.save_checkpoint, True)
+            await self.run_sync(self._flush_screenshots)
+            self._log_profile()
+            await self.run_sync(self._flush_backend)
+
+    async def _run(self, first_group: Union[str , ScrapingStepGroup]  = None):
+        group = None
+        if first_group is None:
+            first_group = "default"
+        if first_group is not None and isinstance(first_group, str):
+            if len(self._stepGroups) > 0:
+                group = next((x for x in self._stepGroups if x.name == first_group), None)
+        elif first_group is not None and isinstance(first_group, ScrapingStepGroup):
+            group = first_group
+
+        if group is None:
+            raise Exception("Group not found - please enter a valid group name or object to start the execution from.")
+        self.set_current_group(group)
+        next_step : ScrapingStep = None
+        while not self.finished():
+            last_step = next_step
+
+            if self._repeat_count > self._repeat_count_till_error:
+                await self._aon_exception("The same step was repeated too many times", last_step)
+                self._observe_group("failed")
+                return False
+
+            while not self._is_group_finished(self._current_group):
+                next_step = self.get_next_step(next_step)
+
+                if next_step is None:
+                    break
+
+                if next_step == last_step:
+                    self._repeat_count += 1
+                else:
+                    self._repeat_count = 0
+
+                await self._run_before_step(next_step)
+
+                success = False
+                try:
+                    self._on_debug("Running step: ", next_step.name())
+                    await self._run_step(next_step)
+                    success = True
+                except Exception as e:
+                    self._on_debug("Exception: ", e)
+                    if next_step.error_handling() != ScrapingStepErrorHandling.Ignore:
+                        await self._aon_exception(e, next_step)
+
+                if success:
+                    await self._run_after_step(next_step)
+
+                    await self.apace(ScrapingPacingEvent.AfterStep, 2)
+                    self._on_debug("Finished step: ", next_step.name())
+                    await self.run_sync(self.save_checkpoint)
+                else:
+                    if next_step.exit_bot_when_errored():
+                        await self._aon_exception("The bot will exit because of an error in the step: "+next_step.name(), next_step)
+                        self._observe_group("failed")
+                        return False
+                    self._on_debug("Failed step: ", next_step.name()+ " retrying "+str(self._max_retries)+" times.")
+                    await self.apace(ScrapingPacingEvent.AfterFailedStep, 3)
+                    await self.run_sync(self.save_checkpoint)
+
+            self._run_after_group(self._current_group)
+            self._observe_group("finished" if self._is_group_finished(self._current_group) else "unfinished")
+
+            await self.apace(ScrapingPacingEvent.AfterGroup, 1)
+            self.set_current_group(self.get_next_group())
+
+        await self.apace(ScrapingPacingEvent.AfterRun, 1)
+        return True
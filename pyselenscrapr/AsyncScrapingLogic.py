@@ -0,0 +1,103 @@
+from pyselenscrapr.ScrapingLogic import ScrapingLogic
+
+
+def toasync(func, bot):
+    async def wrapper(*args, **kwargs):
+        result = await bot.run_sync(func, *args, **kwargs)
+        # only driver and element objects are wrapped, so strings, numbers and lists are returned as they are
+        if hasattr(result, "find_element"):
+            return AsyncScrapingLogic(result, bot)
+        return result
+    return wrapper
+
+
+class AsyncScrapingLogic(object):
+    """
+    AsyncScrapingLogic is the asyncio variant of ScrapingLogic and is passed to the callbacks of the steps of an
+    AsyncScrapingBot.
+
+    All driver functions and all helper functions of ScrapingLogic can be used, but they return awaitables. The
+    blocking WebDriver round-trip runs in the executor of the bot, sleeps and waits are awaited on the event loop.
+    A callback can be an ``async def`` function or a lambda that returns the awaitable:
+
+    .. code-block:: python
+
+        AsyncScrapingStep("Open page", lambda l: l.get("https://www.google.de"),
+                          was_executed=lambda l: l.element_exists("//textarea"))
+    """
+    def __init__(self, driver, bot):
+        """
+        Constructor for AsyncScrapingLogic. Will be called from the bot.
+
+        :param driver: the selenium driver or element
+        :param bot: the AsyncScrapingBot that is using the driver
+        """
+        self._driver = driver
+        self._bot = bot
+        self._logic = ScrapingLogic(driver, bot)
+
+    def __getattr__(self, item):
+        if hasattr(ScrapingLogic, item):
+            result = getattr(self._logic, item)
+        else:
+            result = getattr(self._driver, item)
+        if callable(result):
+            result = toasync(result, self._bot)
+        return result
+
+    def __repr__(self):
+        return repr(self._driver)
+
+    async def attribute(self, name):
+        """
+        Read a property of the driver like current_url or page_source without blocking the event loop.
+
+        :param name: the name of the property
+        :return: the value of the property
+        """
+        return await self._bot.run_sync(getattr, self._driver, name)
+
+    async def sleep(self, seconds):
+        """
+        Sleep for a given amount of seconds without blocking the event loop.
+
+        :param seconds: the amount of seconds to sleep
+        :return: None
+        """
+        await self._bot.asleep(seconds)
+
+    async def pace(self, event, seconds):
+        """
+        Pause with the pacing policy of the bot.
+
+        :param event: the ScrapingPacingEvent that causes the pause
+        :param seconds: the default pause in seconds
+        :return: the seconds that were paused
+        """
+        return await self._bot.apace(event, seconds)
+
+    # the data goes through the sync logic, so a buffered logic buffers it
+    def set_data(self, key, value, send_to_backend=False):
+        self._logic.set_data(key, value, send_to_backend=send_to_backend)
+
+    def append_data(self, key, value, send_to_backend=False):
+        self._logic.append_data(key, value, send_to_backend=send_to_backend)
+
+    def has_data(self, key):
+        return self._logic.has_data(key)
+
+    def get_data(self, key):
+        return self._logic.get_data(key)
+
+
+class AsyncScrapingLogicIterator(AsyncScrapingLogic):
+    def __init__(self, logic: AsyncScrapingLogic, element, index):
+        super().__init__(logic._driver, logic._bot)
+        self._element = element
+        self._index = index
+
+    def index(self):
+        return self._index
+
+    def element(self):
+        return self._element
@@ -0,0 +1,188 @@
+import inspect
+import random
+import time
+from typing import Callable
+
+from pyselenscrapr.AsyncScrapingLogic import AsyncScrapingLogic, AsyncScrapingLogicIterator
+from pyselenscrapr.ScrapingFingerprintIndex import ScrapingFingerprintIndex
+from pyselenscrapr.ScrapingPacing import ScrapingPacingEvent
+from pyselenscrapr.ScrapingStep import ScrapingStep, IScrapingStep
+from pyselenscrapr.ScrapingStepPagination import ScrapingLogicPage, ScrapingStepPagination, \
+    ScrapingStepPaginationMode
+
+
+async def maybe_await(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class AsyncScrapingStep(ScrapingStep):
+    """
+    AsyncScrapingStep is the asyncio variant of ScrapingStep. It takes the same arguments, but all callbacks get an
+    AsyncScrapingLogic and can return an awaitable.
+    """
+    async def execute(self, logic: AsyncScrapingLogic):
+        retData = await maybe_await(self._execute(logic))
+        return retData
+
+    async def is_executed(self, logic: AsyncScrapingLogic):
+        if self._was_executed is not None:
+            return await maybe_await(self._was_executed(logic))
+        return True
+
+    async def retry(self):
+        if self._retry is not None:
+            await maybe_await(self._retry())
+
+
+class AsyncScrapingStepLoop(AsyncScrapingStep):
+    """
+    The asyncio variant of ScrapingStepLoop. The iteration steps can be AsyncScrapingSteps or plain callbacks. The
+    elements are processed one after the other on the driver of the bot.
+    """
+    def __init__(self, name: str,
+                 iteration_callback: Callable[[AsyncScrapingLogic], any],
+                 iteration_steps: list):
+        super().__init__(name, lambda x: self.execute(x))
+        self._iteration_callback = iteration_callback
+        self._iteration_steps = iteration_steps
+        self.current_iteration = 0
+
+    async def execute(self, logic: AsyncScrapingLogic):
+        self.elements = await maybe_await(self._iteration_callback(logic))
+
+        index = 0
+        for element in self.elements:
+            try:
+                for step in self._iteration_steps:
+                    l = AsyncScrapingLogicIterator(logic, element, index)
+                    await maybe_await(step.execute(l))
+                    await logic.pace(ScrapingPacingEvent.AfterLoopElement, 2)
+            except Exception as e:
+                await logic._bot.run_sync(logic._bot._on_exception, e, step)
+            index += 1
+
+
+class AsyncScrapingLogicPage(AsyncScrapingLogic):
+    """
+    The AsyncScrapingLogic of one page of an AsyncScrapingStepPagination with a fingerprint index. The data of the page
+    is buffered, so it can be stored in the index, and is written to the bot with merge_data().
+    """
+    def __init__(self, driver, bot, page):
+        super().__init__(driver, bot)
+        self._logic = ScrapingLogicPage(driver, bot, page)
+
+    def page(self):
+        return self._logic.page()
+
+    def merge_data(self):
+        self._logic.merge_data()
+
+
+class AsyncScrapingStepPagination(AsyncScrapingStep, ScrapingStepPagination):
+    """
+    The asyncio variant of ScrapingStepPagination. goto_page, validate_page, execute and page_count get an
+    AsyncScrapingLogic and can return an awaitable. The pages are scraped one after the other on the driver of the bot.
+    """
+    def __init__(self, name: str,
+                 execute: Callable[[IScrapingStep], any],
+                 goto_page: Callable[[IScrapingStep, int], None],
+                 validate_page: Callable[[IScrapingStep, int], bool],
+                 pagination_mode: ScrapingStepPaginationMode,
+                 page_count: Callable[[IScrapingStep], int],
+                 exit_bot_when_errored: bool = False,
+                 fingerprint_index: ScrapingFingerprintIndex = None,
+                 fingerprint_selector: str = None,
+                 fingerprint_attribute: str = "textContent",
+                 fingerprint_scope: str = None):
+        """
+        Constructor for AsyncScrapingStepPagination, see ScrapingStepPagination for the arguments. Parallel sessions
+        are not supported.
+        """
+        ScrapingStepPagination.__init__(self, name, execute, goto_page, validate_page, pagination_mode, page_count,
+                                        exit_bot_when_errored=exit_bot_when_errored,
+                                        fingerprint_index=fingerprint_index,
+                                        fingerprint_selector=fingerprint_selector,
+                                        fingerprint_attribute=fingerprint_attribute,
+                                        fingerprint_scope=fingerprint_scope)
+
+    async def retry(self):
+        await self.robot.apace(ScrapingPacingEvent.Retry, 1)
+
+    async def sleep_random(self):
+        t = random.randint(self._min_wait_time, self._max_wait_time)
+        await self.robot.apace(ScrapingPacingEvent.BetweenPages, t)
+
+    async def _anavigate(self, l, page, retry=3):
+        for i in range(0, retry):
+            try:
+                await maybe_await(self._goto_page(l, page))
+                await l.pace(ScrapingPacingEvent.AfterNavigation, 1)
+                if await maybe_await(self._validate_page(l, page)):
+                    return True
+            except Exception as e:
+                self.log("Error: " + str(e))
+                await l.pace(ScrapingPacingEvent.Retry, 1)
+        return False
+
+    async def _ascrape(self, l, page):
+        # the async variant of _scrape, returns the outcome of the page for the metrics
+        bot = self.robot
+        try:
+            fingerprint = None
+            if self._fingerprint_index is not None:
+                fingerprint = await l.fingerprint(self._fingerprint_selector, self._fingerprint_attribute)
+                hit, stored = await bot.run_sync(self._fingerprint_index.get, self._fingerprint_scope, page,
+                                                 fingerprint) if fingerprint is not None else (False, None)
+                if hit:
+                    self.log("Page " + str(page) + " didn't change, the data of the index is used")
+                    for operation, key, value, send_to_backend in stored["data"]:
+                        getattr(l, operation)(key, value, send_to_backend=send_to_backend)
+                    self._page_results[page] = stored["result"]
+                    return "replayed"
+
+            self._page_results[page] = await maybe_await(self._execute(l))
+            if fingerprint is not None:
+                await bot.run_sync(self._store_fingerprint, l._logic, page, fingerprint)
+            await l.take_screenshot(self, l._driver)
+            await l.pace(ScrapingPacingEvent.AfterPage, 1)
+            return "ok"
+        except Exception as e:
+            self.log("Error on try to scrape logic" + str(e))
+            return "failed"
+
+    async def execute(self, logic: AsyncScrapingLogic):
+        self._site = await self.robot.run_sync(self._metrics_site, logic)
+        self._start_pages(await maybe_await(self._page_count_to_scrape(logic)))
+        self._page_results = {}
+        self._failed_pages = {}
+
+        while not self.finished():
+            next_page = self._get_next_page()
+            self.log("Scraping page " + str(next_page) + " of " + str(self._page_count_value) + " pages")
+            self.log("Pages left: " + str(len([x for x in self._executionList if x is None])))
+
+            if next_page is None:
+                break
+
+            retry = 3
+            started = time.perf_counter()
+            l = AsyncScrapingLogic(logic._driver, logic._bot)
+            if not await self._anavigate(l, next_page, retry):
+                self._failed_pages[next_page] = "Could not navigate to page " + str(next_page) + " after " + \
+                                                str(retry) + " attempts."
+                self._observe_page(started, "failed")
+                self.raise_exception(self._failed_pages[next_page])
+
+            if self._fingerprint_index is not None:
+                l = AsyncScrapingLogicPage(logic._driver, logic._bot, next_page)
+                outcome = await self._ascrape(l, next_page)
+                l.merge_data()
+            else:
+                outcome = await self._ascrape(l, next_page)
+            self._observe_page(started, outcome)
+
+            self._page_done(next_page)
+            await self.robot.run_sync(self.save_checkpoint)
+            await self.sleep_random()
@@ -1,7 +1,14 @@
+import gzip
 import json
 import logging
+import queue
+import threading
+import time
 from abc import ABC
 import requests
+from requests.adapters import HTTPAdapter
+
+from pyselenscrapr.ScrapingDataFormat import ScrapingDataFormat
 
 # interface IScrapingBackend with the method "saveData" and "errorHandling" and "notify"
 class IScrapingBackend(ABC):
@@ -17,27 +24,204 @@ class IScrapingBackend(ABC):
     def notify(self, message: str):
         pass
 
+    def data_format(self) -> int:
+        """
+        :return: the ScrapingDataFormat in which the backend wants to get DataFrames
+        """
+        return ScrapingDataFormat.Records
+
+    def save_changes(self, data: dict, delivered):
+        """
+        Save the changes of ScrapingBot.send_changes_to_backend(). delivered() has to be called when the backend
+        received the changes, only then they are not sent again. A backend that sends in the background calls it
+        after the delivery.
+
+        :param data: the changes
+        :param delivered: a function without arguments
+        """
+        self.saveData(data)
+        delivered()
+
+    def flush(self):
+        """
+        Wait until everything that was passed to the backend is written. Called at the end of ScrapingBot.run().
+        """
+        pass
+
+    def close(self):
+        """
+        Flush the backend and release its resources.
+        """
+        self.flush()
+
 
 class ScrapingBackendWebhook(IScrapingBackend):
     """
     This class is used to send the data you scraped to a webhook.
+
+    All requests use one pooled requests.Session. With background=True the requests are sent by a background thread,
+    so the bot doesn't wait for the webhook. The queue of the thread is bounded, if it is full the bot waits until
+    there is space again. With batch_size > 1 up to batch_size saveData payloads are sent together as a JSON list in
+    one POST to the data route, so the body of the data route is a list of dicts then instead of a dict, also for a
+    single payload.
+
+    DataFrames are sent in the ScrapingDataFormat data_format. The format is also sent in the header X-Data-Format, so
+    a Python webhook can decode them with pyselenscrapr.ScrapingDataFormat.decode_frame.
     """
     _url = None
-    def __init__(self, url, error_route="/error", notify_route="/notify", data_route="/data"):
+    _format_names = {ScrapingDataFormat.Records: "records", ScrapingDataFormat.Split: "split",
+                     ScrapingDataFormat.Columns: "columns", ScrapingDataFormat.Arrow: "arrow"}
+
+    def __init__(self, url, error_route="/error", notify_route="/notify", data_route="/data",
+                 background=False, batch_size=1, batch_interval=1.0, queue_size=1000,
+                 compress=False, retries=3, backoff=0.5, timeout=30, pool_size=4, session=None,
+                 data_format=ScrapingDataFormat.Records):
+        """
+        Constructor for ScrapingBackendWebhook
+
+        :param url: the base url of the webhook
+        :param error_route: the route for errors
+        :param notify_route: the route for notifications
+        :param data_route: the route for the data
+        :param background: send the requests in a background thread
+        :param batch_size: the maximum number of saveData payloads in one POST, only used with background=True
+        :param batch_interval: the maximum time in seconds a payload waits for the batch to be filled
+        :param queue_size: the maximum number of requests waiting in the background queue
+        :param compress: send the body gzip compressed
+        :param retries: the number of retries of a failed request
+        :param backoff: the pause before the first retry in seconds, it doubles with every retry
+        :param timeout: the timeout of a request in seconds
+        :param pool_size: the number of connections that are kept open
+        :param session: a requests.Session to use instead of a new one
+        :param data_format: the ScrapingDataFormat of the DataFrames in the data
+        """
         self._url = url
         self._error_route = url + error_route
         self._notify_route = url + notify_route
         self._data_route = url + data_route
+        self._background = background
+        self._batch_size = max(1, batch_size)
+        self._batch_interval = batch_interval
+        self._compress = compress
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = timeout
+        self._data_format = data_format
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self._session = session
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _post(self, route, payload):
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Accept": "application/json",
+                   "X-Data-Format": self._format_names[self._data_format]}
+        if self._compress:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        for attempt in range(self._retries + 1):
+            try:
+                ret = self._session.post(route, data=body, headers=headers, timeout=self._timeout)
+                logging.debug("data return")
+                logging.debug(ret.status_code)
+                if ret.status_code < 500 or attempt >= self._retries:
+                    return ret
+            except requests.RequestException as e:
+                if attempt >= self._retries:
+                    raise e
+                logging.debug(e)
+            time.sleep(self._backoff * (2 ** attempt))
+
+    def _send(self, route, payload, delivered=None):
+        if not self._background:
+            ret = self._post(route, payload)
+            if delivered is not None:
+                if not ret.ok:
+                    raise Exception("The webhook answered with the status " + str(ret.status_code))
+                delivered()
+            return ret
+        self._start()
+        # blocks when the queue is full, so a slow webhook slows down the bot instead of filling the memory
+        self._queue.put((route, payload, delivered))
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run_sender, name="ScrapingBackendWebhook", daemon=True)
+                self._thread.start()
+
+    def _post_logged(self, route, payload, delivered):
+        try:
+            ret = self._post(route, payload)
+        except Exception as e:
+            logging.error(e)
+            return
+        if not ret.ok:
+            logging.error("The webhook answered with the status " + str(ret.status_code))
+            return
+        for d in delivered:
+            if d is not None:
+                # an error of a callback must not stop the thread, the other callbacks are still called
+                try:
+                    d()
+                except Exception as e:
+                    logging.error(e)
+
+    def _run_sender(self):
+        batch = []
+        while True:
+            try:
+                item = self._queue.get(timeout=self._batch_interval if len(batch) > 0 else None)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item[0] == self._data_route and self._batch_size > 1:
+                batch.append(item)
+                if len(batch) < self._batch_size:
+                    continue
+                # the batch is full, the item is already part of it
+                item = None
+
+            # send the waiting batch first, so the order of the requests is kept
+            if len(batch) > 0:
+                try:
+                    self._post_logged(self._data_route, [b[1] for b in batch], [b[2] for b in batch])
+                finally:
+                    # flush() waits for every item, also if sending it failed
+                    for i in range(len(batch)):
+                        self._queue.task_done()
+                    batch = []
+
+            if item is not None:
+                try:
+                    if item[0] is None:
+                        return
+                    self._post_logged(item[0], item[1], [item[2]])
+                finally:
+                    self._queue.task_done()
+
+    def data_format(self) -> int:
+        return self._data_format
 
     def saveData(self, data: dict, key: str = None):
         try:
-            d = json.dumps(data)
-            ret = requests.post(self._data_route, data=d, headers={"Content-Type": "application/json", "Accept": "application/json"})
-            logging.debug("data return")
-            logging.debug(ret.status_code)
-            logging.debug(ret)
+            self._send(self._data_route, data)
+        except Exception as e:
+            logging.error(e)
+            raise e
+
+    def save_changes(self, data: dict, delivered):
+        # delivered() is called when the webhook answered with a success status, in the background after the POST
+        try:
+            self._send(self._data_route, data, delivered)
         except Exception as e:
-            print(e)
+            logging.error(e)
             raise e
 
     def errorHandling(self, error: Exception, debugData=None):
@@ -45,22 +229,26 @@ class ScrapingBackendWebhook(IScrapingBackend):
             d = {"error": str(error)}
             if debugData is not None:
                 d["debug"] = debugData
-            d_json = json.dumps(d)
-            ret = requests.post(self._error_route, data=d_json, headers={"Content-Type": "application/json", "Accept": "application/json"})
-            logging.debug("data return")
-            logging.debug(ret.status_code)
-            logging.debug(ret)
+            self._send(self._error_route, d)
         except Exception as e:
             logging.error(e)
             raise e
 
     def notify(self, message: str):
         try:
-            d = json.dumps({"message": str(message)})
-            ret = requests.post(self._notify_route, data=d, headers={"Content-Type": "application/json", "Accept": "application/json"})
-            logging.debug("data return")
-            logging.debug(ret.status_code)
-            logging.debug(ret)
+            self._send(self._notify_route, {"message": str(message)})
         except Exception as e:
             logging.error(e)
-            raise e
\ No newline at end of file
+            raise e
+
+    def flush(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        self.flush()
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put((None, None, None))
+            self._thread.join()
+        self._thread = None
+        self._session.close()
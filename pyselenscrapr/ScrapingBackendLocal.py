@@ -0,0 +1,384 @@
+import csv
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from pyselenscrapr.ScrapingBackend import IScrapingBackend
+
+
+def _safe_name(key) -> str:
+    name = re.sub(r"[^0-9A-Za-z_]+", "_", str(key)).strip("_")
+    return name if name != "" else "data"
+
+
+def _plain(value):
+    # values that are not a scalar are written as JSON
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return json.dumps(value, default=str)
+
+
+class ScrapingRecordBatch:
+    """
+    The buffered records of one key, stored column by column.
+    """
+    def __init__(self):
+        self.columns = {}
+        self.size = 0
+
+    def append(self, row: dict):
+        for name in row:
+            if name not in self.columns:
+                self.columns[name] = [None] * self.size
+        for name, values in self.columns.items():
+            values.append(row.get(name))
+        self.size += 1
+
+    def rows(self):
+        names = list(self.columns.keys())
+        for i in range(self.size):
+            yield {name: self.columns[name][i] for name in names}
+
+
+class ScrapingBackendLocal(IScrapingBackend):
+    """
+    The base class of the local backends. The records that are passed to saveData are buffered per key in column
+    batches and written when flush_rows records are buffered, flush_interval seconds have passed or flush() is called.
+
+    saveData accepts the data of ScrapingBot.send_data_to_backend and single appended values. A dict is one record, a
+    list of dicts are many records and all other values are written as a record with the column "value". Every call
+    appends its records. Errors are written as records of the key "_errors".
+
+    The changes of send_changes_to_backend (delta_sync=True) go to save_changes: appended rows are written once, rows
+    that are sent again with an offset the backend already has are skipped. A key that was set replaces the records
+    the key had before, see the backends for how. The changes are reported as delivered when they are written.
+
+    To keep the memory of the bot flat, create the bot with stream_data=True, then appended data is only written to
+    the backend and not kept in the bot.
+    """
+    def __init__(self, flush_rows: int = 1000, flush_interval: float = 5.0):
+        """
+        :param flush_rows: the number of buffered records that trigger a write
+        :param flush_interval: the maximum time in seconds records are buffered, also if nothing else is saved
+        """
+        self._flush_rows = flush_rows
+        self._flush_interval = flush_interval
+        self._batches = {}
+        # the keys whose batch replaces the records that were written before
+        self._replaced = set()
+        # the number of appended rows of every key that were received with save_changes
+        self._offsets = {}
+        self._delivered = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def _records(self, value):
+        if isinstance(value, dict):
+            return [value]
+        if isinstance(value, (list, tuple)):
+            return [v if isinstance(v, dict) else {"value": v} for v in value]
+        return [{"value": value}]
+
+    def _add(self, key, value, replace=False):
+        batch = self._batches.get(key)
+        if batch is None or replace:
+            batch = ScrapingRecordBatch()
+            self._batches[key] = batch
+        if replace:
+            self._replaced.add(key)
+        records = self._records(value)
+        for record in records:
+            batch.append(record)
+            self._buffered += 1
+        return len(records)
+
+    def _added(self):
+        if self._buffered >= self._flush_rows or time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+        elif self._timer is None and (self._buffered > 0 or len(self._replaced) > 0 or len(self._delivered) > 0):
+            # an idle bot doesn't save anything, so the interval is also checked by a timer
+            self._timer = threading.Timer(self._flush_interval, self._flush_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_timer(self):
+        try:
+            with self._lock:
+                self._timer = None
+                self.flush()
+        except Exception as e:
+            logging.error(e)
+
+    def saveData(self, data: dict, key: str = None):
+        with self._lock:
+            for k, value in data.items():
+                self._add(k, value)
+            self._added()
+
+    def save_changes(self, data: dict, delivered):
+        with self._lock:
+            for k, value in data["set"].items():
+                self._offsets[k] = self._add(k, value, replace=True)
+            for k, appended in data["append"].items():
+                offset = appended["offset"]
+                rows = self._records(appended["rows"])
+                received = self._offsets.get(k, 0)
+                self._offsets[k] = max(received, offset + len(rows))
+                if offset < received:
+                    # the rows were sent again because the delivery wasn't reported yet
+                    rows = rows[received - offset:]
+                self._add(k, rows)
+            self._delivered.append(delivered)
+            self._added()
+
+    def errorHandling(self, error: Exception, debugData=None):
+        with self._lock:
+            self._add("_errors", {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "error": str(error),
+                                  "debug": json.dumps(debugData, default=str) if debugData is not None else None})
+            self.flush()
+
+    def notify(self, message: str):
+        logging.info(message)
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            for key, batch in self._batches.items():
+                if key in self._replaced:
+                    self._write(key, batch, replace=True)
+                elif batch.size > 0:
+                    self._write(key, batch)
+            self._batches = {}
+            self._replaced = set()
+            self._buffered = 0
+            self._last_flush = time.monotonic()
+            delivered = self._delivered
+            self._delivered = []
+        for d in delivered:
+            try:
+                d()
+            except Exception as e:
+                logging.error(e)
+
+    def _write(self, key, batch: ScrapingRecordBatch, replace: bool = False):
+        """
+        :param replace: the records replace the records of the key that were written before
+        """
+        raise NotImplementedError
+
+
+class ScrapingBackendJsonl(ScrapingBackendLocal):
+    """
+    Writes every record as a JSON line {"key": ..., "data": {...}} to a file. The file is only appended to: when a key
+    was set, the first line of its records has "replace": true and the lines of the key before it are replaced. A set
+    without records is written as {"key": ..., "replace": true} without data.
+    """
+    def __init__(self, path: str, fsync: bool = False, **kwargs):
+        """
+        :param path: the path of the JSONL file, records are appended if it exists
+        :param fsync: sync the file to the disk after every write
+        """
+        super().__init__(**kwargs)
+        self._path = path
+        self._fsync = fsync
+        self._file = open(path, "a", encoding="utf-8", buffering=1024 * 1024)
+
+    def _write(self, key, batch, replace=False):
+        lines = [json.dumps({"key": key, "data": row}, default=str) + "\n" for row in batch.rows()]
+        if replace:
+            marker = {"key": key, "replace": True}
+            if len(lines) > 0:
+                marker["data"] = next(batch.rows())
+            lines[:1] = [json.dumps(marker, default=str) + "\n"]
+        self._file.write("".join(lines))
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class ScrapingBackendCsv(ScrapingBackendLocal):
+    """
+    Writes the records of every key into its own CSV file <key>.csv in a directory. When columns show up that are not
+    in the file, the file is written again with the new columns, the old rows are empty in them. A key that was set
+    replaces its file.
+    """
+    def __init__(self, directory: str, fsync: bool = False, **kwargs):
+        """
+        :param directory: the directory of the CSV files
+        :param fsync: sync the files to the disk after every write
+        """
+        super().__init__(**kwargs)
+        self._directory = directory
+        self._fsync = fsync
+        self._headers = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _header(self, path, batch):
+        if path in self._headers:
+            return self._headers[path], False
+        header = None
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, newline="", encoding="utf-8") as f:
+                header = next(csv.reader(f), None)
+        new_file = header is None
+        if new_file:
+            header = [str(c) for c in batch.columns.keys()]
+        self._headers[path] = header
+        return header, new_file
+
+    def _add_columns(self, path, header, added):
+        # the rows are copied into a file with the new header, which replaces the old file
+        tmp_path = path + ".tmp"
+        with open(path, newline="", encoding="utf-8") as f, open(tmp_path, "w", newline="", encoding="utf-8") as out:
+            reader = csv.reader(f)
+            writer = csv.writer(out)
+            next(reader, None)
+            writer.writerow(header + added)
+            empty = [""] * len(added)
+            for row in reader:
+                writer.writerow(row + empty)
+            out.flush()
+            if self._fsync:
+                os.fsync(out.fileno())
+        os.replace(tmp_path, path)
+        self._headers[path] = header + added
+        return self._headers[path]
+
+    def _replace(self, path, batch):
+        tmp_path = path + ".tmp"
+        header = [str(c) for c in batch.columns.keys()]
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if len(header) > 0:
+                writer.writerow(header)
+                writer.writerows(zip(*[[_plain(v) for v in values] for values in batch.columns.values()]))
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        if len(header) > 0:
+            self._headers[path] = header
+        else:
+            self._headers.pop(path, None)
+
+    def _write(self, key, batch, replace=False):
+        path = os.path.join(self._directory, _safe_name(key) + ".csv")
+        if replace:
+            return self._replace(path, batch)
+        header, new_file = self._header(path, batch)
+        columns = {str(name): values for name, values in batch.columns.items()}
+        missing = [None] * batch.size
+        added = [name for name in columns if name not in header]
+        if len(added) > 0:
+            header = self._add_columns(path, header, added)
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(header)
+            writer.writerows(zip(*[[_plain(v) for v in columns.get(name, missing)] for name in header]))
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+
+
+class ScrapingBackendSqlite(ScrapingBackendLocal):
+    """
+    Writes the records of every key into its own table of a SQLite database. Columns are added to the table when they
+    show up, values that are not a scalar are stored as JSON. A key that was set replaces the rows of its table.
+    """
+    def __init__(self, path: str, **kwargs):
+        """
+        :param path: the path of the SQLite database
+        """
+        super().__init__(**kwargs)
+        self._path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._table_columns = {}
+
+    def _columns(self, table):
+        if table not in self._table_columns:
+            rows = self._connection.execute('PRAGMA table_info("' + table + '")').fetchall()
+            self._table_columns[table] = [r[1] for r in rows]
+        return self._table_columns[table]
+
+    def _write(self, key, batch, replace=False):
+        table = _safe_name(key)
+        names = [str(name).replace('"', '""') for name in batch.columns.keys()]
+        existing = self._columns(table)
+        if replace and len(existing) > 0:
+            # in the same transaction as the new rows
+            self._connection.execute('DELETE FROM "' + table + '"')
+        if len(names) == 0:
+            self._connection.commit()
+            return
+        if len(existing) == 0:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS "' + table + '" (' +
+                                     ", ".join('"' + n + '"' for n in names) + ")")
+            existing.extend(names)
+        for name in names:
+            if name not in existing:
+                self._connection.execute('ALTER TABLE "' + table + '" ADD COLUMN "' + name + '"')
+                existing.append(name)
+        values = [[_plain(v) for v in column] for column in batch.columns.values()]
+        self._connection.executemany('INSERT INTO "' + table + '" (' + ", ".join('"' + n + '"' for n in names) +
+                                     ") VALUES (" + ", ".join("?" * len(names)) + ")", zip(*values))
+        self._connection.commit()
+
+    def close(self):
+        self.flush()
+        self._connection.close()
+
+
+class ScrapingBackendParquet(ScrapingBackendLocal):
+    """
+    Writes the records of every key as Parquet files into the directory <key>/ with one part file per write, so every
+    written part is complete even if the process dies. The directory can be read with pandas.read_parquet. A key that
+    was set replaces the part files of its directory. Needs pyarrow.
+    """
+    def __init__(self, directory: str, **kwargs):
+        """
+        :param directory: the directory of the Parquet datasets
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("ScrapingBackendParquet needs pyarrow, install it with: pip install pyarrow")
+        super().__init__(**kwargs)
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._directory = directory
+        self._parts = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _write(self, key, batch, replace=False):
+        directory = os.path.join(self._directory, _safe_name(key))
+        os.makedirs(directory, exist_ok=True)
+        if replace:
+            for name in os.listdir(directory):
+                if name.endswith(".parquet"):
+                    os.remove(os.path.join(directory, name))
+            self._parts[key] = 0
+            if batch.size == 0:
+                return
+        part = self._parts.get(key, len(os.listdir(directory)))
+        columns = {}
+        for name, values in batch.columns.items():
+            try:
+                columns[str(name)] = self._pa.array(values)
+            except (self._pa.ArrowInvalid, self._pa.ArrowTypeError):
+                columns[str(name)] = self._pa.array([None if v is None else str(_plain(v)) for v in values])
+        self._pq.write_table(self._pa.table(columns), os.path.join(directory, "part-%05d.parquet" % part))
+        self._parts[key] = part + 1
@@ -1,19 +1,33 @@
 import logging as log
+import threading
 import time
+from contextlib import contextmanager
 from typing import Callable
 
 import numpy as np
 import pandas as pd
 from typing import Union
 from pyselenscrapr.ScrapingBackend import IScrapingBackend
+from pyselenscrapr.ScrapingCheckpoint import ScrapingCheckpoint
+from pyselenscrapr.ScrapingDataFormat import ScrapingDataFormat, encode_frame
+from pyselenscrapr.ScrapingDataStore import ScrapingDataStore
+from pyselenscrapr.ScrapingDriverProfiler import ScrapingDriverProfiler
+from pyselenscrapr.ScrapingElementCache import ScrapingElementCache
 from pyselenscrapr.ScrapingLogic import ScrapingLogic
+from pyselenscrapr.ScrapingMetrics import ScrapingMetrics, ScrapingStepObservation
+from pyselenscrapr.ScrapingPacing import IScrapingPacing, ScrapingClock, ScrapingPacingEvent, ScrapingPacingFixed
+from pyselenscrapr.ScrapingScreenshots import ScrapingScreenshotWriter
 from pyselenscrapr.ScrapingStep import ScrapingStep, ScrapingStepInterval, ScrapingStepErrorHandling
+from pyselenscrapr.ScrapingStepChains import ScrapingChainRunner, find_independent_chains
 from pyselenscrapr.ScrapingStepGroup import ScrapingStepGroup
+from pyselenscrapr.ScrapingStepScheduler import ScrapingStepScheduler
+from pyselenscrapr.ScrapingTaskLog import ScrapingTaskLog
 
 class TakeScreenshotModes:
     """
     This enum is used to define when the bot should take a screenshot of the current page.
     """
+    ErrorContext = 3 # keep the screenshots of the last steps in memory and write them when an error occurs
     OnError = 2 # take a screenshot when an error occurs
     Always = 1 # take a screenshot for each step
     Never = 0 # never take a screenshot
@@ -28,6 +42,7 @@ class ScrapingBot:
     """
     _data = {}
     _driver = None
+    _logic = None
     _warning_handler = None
     _current_group = None
     _exception_handler = None
@@ -40,17 +55,61 @@ class ScrapingBot:
     _take_screenshots_mode = TakeScreenshotModes.Never
     _screenshot_path = "."
     _backend : IScrapingBackend = None
+    _pacing : IScrapingPacing = None
+    _clock : ScrapingClock = None
 
     def __init__(self, driver, max_retries=3,
                  take_screenshots_mode=TakeScreenshotModes.Never,
                  backend : IScrapingBackend = None,
-                 repeat_count_till_error=5):
+                 repeat_count_till_error=5,
+                 pacing : IScrapingPacing = None,
+                 clock : ScrapingClock = None,
+                 element_cache : bool = True,
+                 dom_snapshot : bool = False,
+                 delta_sync : bool = False,
+                 stream_data : bool = False,
+                 data_format : int = None,
+                 parallel_chains : int = 1,
+                 driver_factory : Callable[[], object] = None,
+                 quit_drivers : bool = True,
+                 checkpoint : ScrapingCheckpoint = None,
+                 screenshot_writer : ScrapingScreenshotWriter = None,
+                 task_log_size : int = 1000,
+                 task_log_retention : dict = None,
+                 metrics : bool = True,
+                 profile_driver : bool = False):
         self._repeat_count_till_error = repeat_count_till_error
-        self._driver = driver
+        self._data = ScrapingDataStore()
+        self._stepGroups = []
+        self._scheduler = ScrapingStepScheduler()
+        self._pacing = pacing if pacing is not None else ScrapingPacingFixed()
+        self._clock = clock if clock is not None else ScrapingClock()
+        self._element_cache = ScrapingElementCache(element_cache)
+        self._metrics = ScrapingMetrics(metrics)
+        self._active = threading.local()
+        self._profiler = ScrapingDriverProfiler(profile_driver, self)
+        self._dom_snapshot = dom_snapshot
+        self._delta_sync = delta_sync
+        self._sequence = 0
+        # the token and the sequence number of the last changes that were sent
+        self._sent_sequence = None
+        self._stream_data = stream_data
+        self._streamed = {}
+        self._data_format = data_format
+        if parallel_chains > 1 and driver_factory is None:
+            raise Exception("A driver_factory is required to run independent chains in parallel.")
+        self._parallel_chains = parallel_chains
+        self._driver_factory = driver_factory
+        self._quit_drivers = quit_drivers
+        self._checkpoint = checkpoint
+        self._checkpoint_paused = 0
+        self._driver = self._profiler.attach(driver)
         self._backend = backend
         self._max_retries = max_retries
-        self._task_logs = []
+        self._task_logs = ScrapingTaskLog(task_log_size, task_log_retention)
         self._take_screenshots_mode = take_screenshots_mode
+        self._screenshot_writer = screenshot_writer if screenshot_writer is not None else \
+            ScrapingScreenshotWriter(self._screenshot_path)
 
     def _on_warning(self, w):
         if self._warning_handler is not None:
@@ -65,32 +124,69 @@ class ScrapingBot:
         if self._backend is not None:
             self._backend.notify(message)
 
-    def _take_screenshot(self, step):
+    def _screenshot_name(self, step):
+        group = self._current_group.name if self._current_group is not None else ""
+        return group + "_" + (step.name() if step is not None else "error")
+
+    def _take_screenshot(self, step, driver=None, force=False):
+        """
+        :param driver: the driver of the session that ran the step, the driver of the session of the thread if it is
+            None
+        :param force: write the screenshot also if it is identical to a written one
+        """
+        try:
+            self._screenshot_writer.capture(driver if driver is not None else self._session_driver(),
+                                            self._screenshot_name(step), force)
+        except Exception as e:
+            log.debug(e)
+
+    def _record_screenshot(self, step, driver=None):
+        try:
+            self._screenshot_writer.record(driver if driver is not None else self._session_driver(),
+                                           self._screenshot_name(step))
+        except Exception as e:
+            log.debug(e)
+
+    def set_screenshot_path(self, path):
+        """
+        Set the directory of the screenshots.
+        """
+        self._screenshot_path = path
+        self._screenshot_writer.set_path(path)
+
+    def screenshot_writer(self) -> ScrapingScreenshotWriter:
+        return self._screenshot_writer
+
+    def _log_profile(self):
+        if self._profiler.enabled:
+            log.info("Driver round-trips of the run:\n" + self._profiler.format_report())
+
+    def _flush_screenshots(self):
         try:
-            self._driver.save_screenshot(self._screenshot_path+self.group_name()+"_"+step.name()+".png")
-        except:
-            pass
+            self._screenshot_writer.flush()
+        except Exception as e:
+            self._on_warning(e)
 
     def _raise_exception(self, message):
         self._on_exception(message, None)
         raise Exception(message)
 
     def _on_exception(self, e, step):
-        self._task_logs.append({
-            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "message": str(e),
-            "step": step.name(),
-            "level": "error"
-        })
-        if self._take_screenshots_mode == TakeScreenshotModes.OnError or \
-                self._take_screenshots_mode == TakeScreenshotModes.Always:
+        # the message of an error is formatted now, the exception would keep the frames of its traceback alive
+        self._task_logs.append("error", str(e), step=step.name() if step is not None else None)
+        if step is not None and (self._take_screenshots_mode == TakeScreenshotModes.OnError or \
+                self._take_screenshots_mode == TakeScreenshotModes.Always):
             self._take_screenshot(step)
+        elif self._take_screenshots_mode == TakeScreenshotModes.ErrorContext:
+            # the steps before the error and the page at the error, which often didn't change since the last step
+            self._screenshot_writer.flush_context()
+            self._take_screenshot(step, force=True)
         if self._exception_handler is not None:
             self._exception_handler(e)
         else:
             log.error(e)
         if self._backend is not None:
-            self._backend.errorHandling(e, debugData=self._task_logs)
+            self._backend.errorHandling(e, debugData=self._task_logs.report())
 
     def set_warning_handler(self, param):
         self._warning_handler = param
@@ -98,12 +194,64 @@ class ScrapingBot:
     def set_exception_handler(self, param):
         self._exception_handler = param
 
+    def set_pacing(self, pacing: IScrapingPacing):
+        self._pacing = pacing
+
+    def clock(self) -> ScrapingClock:
+        return self._clock
+
+    def set_dom_snapshot(self, enabled: bool):
+        """
+        In the DOM snapshot mode the page_source is read once per page state and element_exists, element_count,
+        element_text and get_all_elements are answered from it. Form values typed into inputs are not part of the
+        page_source, so don't use it for checks on them. The mode needs the element cache.
+        """
+        self._dom_snapshot = enabled
+
+    def element_cache(self) -> ScrapingElementCache:
+        """
+        The cache of the element lookups of the current page state. Use element_cache().stats() to get the hit and miss
+        counters.
+        """
+        return self._element_cache
+
+    def metrics(self) -> ScrapingMetrics:
+        """
+        The latency and retry metrics of the steps, groups and pages. Use metrics().to_prometheus() or
+        metrics().to_json() to export them.
+        """
+        return self._metrics
+
+    def profiler(self) -> ScrapingDriverProfiler:
+        """
+        The round-trips to the driver per step and helper, if the bot was created with profile_driver=True. The report
+        of the last run is available with profiler().report() or profiler().format_report().
+        """
+        return self._profiler
+
+    def _new_driver(self, factory):
+        # a worker session, its commands are profiled like the ones of the driver of the bot
+        return self._profiler.attach(factory())
+
+    def _set_active_step(self, name):
+        # pauses and driver commands are counted for the step that ran last in the thread
+        self._active.step = name
+
+    def _set_session_driver(self, driver):
+        # the driver of the worker session that runs in this thread, None for the driver of the bot
+        self._active.driver = driver
+
+    def _session_driver(self):
+        driver = getattr(self._active, "driver", None)
+        return driver if driver is not None else self._driver
+
     def take_screenshot_on_error(self, path):
         self._take_screenshot_on_error = path
 
     def add_step_group(self, group_name: str):
         group = ScrapingStepGroup(group_name)
         self._stepGroups.append(group)
+        self._scheduler.add_group(group)
         return group
 
 
@@ -129,106 +277,159 @@ class ScrapingBot:
         if group is None:
             group = ScrapingStepGroup("default")
             self._stepGroups.append(group)
+            self._scheduler.add_group(group)
 
         group.add_step(step_or_callback)
 
         return step_or_callback
 
-    def _run_step(self, step, retryInterval=0):
-        try:
-            if step.can_execute is not None and not step.can_execute(ScrapingLogic(self._driver, self)):
-                return
-        except Exception as e:
-            if step.error_handling() != ScrapingStepErrorHandling.Ignore:
-                self._on_exception(e, step)
+    def _new_logic(self):
+        # the logic only keeps the driver and the bot, so one logic is shared by all steps on the driver of the bot
+        if self._logic is None or self._logic._driver is not self._driver:
+            self._logic = ScrapingLogic(self._driver, self)
+        return self._logic
 
+    @contextmanager
+    def _observe_step(self, step):
+        """
+        The metrics and the attribution of a run of a step, used by the sync and the async bot. Pauses and driver
+        commands are counted for the step that ran last in the thread.
+        """
+        self._set_active_step(step.name())
+        observation = ScrapingStepObservation(self._metrics, step.name())
         try:
-            if step.previous_step() is not None and not step.previous_step().was_executed():
-                return
-        except Exception as e:
-            if step.error_handling() != ScrapingStepErrorHandling.Ignore:
-                self._on_exception(e, step)
-
-        if step.before_validation is not None:
+            yield observation
+        finally:
+            observation.finish()
+
+    def _run_step(self, step, retryInterval=0, logic_factory: Callable[[], ScrapingLogic] = None):
+        if logic_factory is None:
+            logic_factory = self._new_logic
+        with self._observe_step(step) as observation:
+            self._element_cache.invalidate()
             try:
-                step.before_validation()
+                if step.can_execute is not None:
+                    with observation.phase("can_execute"):
+                        can_execute = step.can_execute(logic_factory())
+                    if not can_execute:
+                        observation.outcome = "skipped"
+                        return
             except Exception as e:
                 if step.error_handling() != ScrapingStepErrorHandling.Ignore:
                     self._on_exception(e, step)
-                else:
-                    self._on_warning(e)
 
-        for i in range(self._max_retries):
             try:
-                l = ScrapingLogic(self._driver, self)
-                step.execute(l)
-                if step.is_executed(l):
-                    step.set_executed()
-                break
+                if step.previous_step() is not None and not step.previous_step().was_executed():
+                    observation.outcome = "skipped"
+                    return
             except Exception as e:
                 if step.error_handling() != ScrapingStepErrorHandling.Ignore:
                     self._on_exception(e, step)
-                else:
-                    self._on_warning(e)
 
-                if step.can_retry():
-                    step.retry()
-                else:
-                    if step.exit_bot_when_errored():
-                        self._raise_exception("The bot will exit because of an error in the step: "+step.name())
+            if step.before_validation is not None:
+                try:
+                    step.before_validation()
+                except Exception as e:
+                    if step.error_handling() != ScrapingStepErrorHandling.Ignore:
+                        self._on_exception(e, step)
+                    else:
+                        self._on_warning(e)
 
+            for i in range(self._max_retries):
+                observation.attempt(i)
+                try:
+                    l = logic_factory()
+                    with observation.phase("execute"):
+                        step.execute(l)
+                    self._element_cache.invalidate()
+                    with observation.phase("was_executed"):
+                        executed = step.is_executed(l)
+                    if executed:
+                        step.set_executed()
+                        observation.outcome = "executed"
+                    else:
+                        observation.outcome = "not_executed"
                     break
+                except Exception as e:
+                    if step.error_handling() != ScrapingStepErrorHandling.Ignore:
+                        self._on_exception(e, step)
+                    else:
+                        self._on_warning(e)
+
+                    if step.can_retry():
+                        step.retry()
+                    else:
+                        if step.exit_bot_when_errored():
+                            self._raise_exception("The bot will exit because of an error in the step: "+step.name())
 
+                        break
 
 
-        if step.after_validation is not None:
-            step.after_validation()
+
+            if step.after_validation is not None:
+                step.after_validation()
 
     def sleep(self, seconds):
-        time.sleep(seconds)
+        self._element_cache.invalidate()
+        self._clock.sleep(seconds)
+
+    def pace(self, event: ScrapingPacingEvent, seconds: float, logic: ScrapingLogic = None):
+        """
+        Pause the bot with the pacing policy.
+
+        :param event: the ScrapingPacingEvent that causes the pause
+        :param seconds: the default pause in seconds, the policy decides if it is used
+        :param logic: the logic that pauses, conditions of the policy are checked on it. None for a logic of the
+            session that runs in this thread.
+        :return: the seconds the bot paused
+        """
+        self._element_cache.invalidate()
+        previous = getattr(self._active, "logic", None)
+        self._active.logic = logic
+        try:
+            paused = self._pacing.pause(event, seconds, self)
+        finally:
+            self._active.logic = previous
+        self._count_sleep(paused)
+        return paused
+
+    def _count_sleep(self, paused):
+        self._metrics.count_sleep(getattr(self._active, "step", None) or "", paused)
+
+    def _pacing_logic(self):
+        # the logic that paused, or a logic of the session of the thread, a worker has its own driver
+        logic = getattr(self._active, "logic", None)
+        if logic is not None:
+            return logic
+        driver = self._session_driver()
+        if driver is self._driver:
+            return self._new_logic()
+        return ScrapingLogic(driver, self)
 
     def _on_debug(self, msg, *args):
-        msg = msg+" ".join([str(x) for x in args])
-        log.debug(msg)
-        self._task_logs.append({
-            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "message": msg,
-            "level": "debug"
-        })
+        entry = self._task_logs.append("debug", msg, *args)
+        # the entry is only formatted if debug logging is enabled
+        log.debug("%s", entry)
 
     def all_groups_executed(self):
-        for group in self._stepGroups:
-            for step in group._steps:
-                if not step.was_executed():
-                    return False
-        return True
+        return self._scheduler.finished()
 
     def get_next_step(self, step):
-        for s in self._current_group._steps:
-            if s.interval() != ScrapingStepInterval.Order:
-                continue
-            if s.was_executed():
-                continue
-            if s.previous_step() is None:
-                return s
-            if s.previous_step().was_executed():
-                return s
-
-
-        return None
+        return self._scheduler.next_step(self._current_group)
 
     def set_current_group(self, group):
         self._current_group = group
+        self._group_started = time.perf_counter()
+
+    def _observe_group(self, outcome):
+        if self._current_group is not None:
+            self._metrics.observe_group(self._current_group.name, time.perf_counter() - self._group_started, outcome)
 
     def finished(self):
         return self.all_groups_executed()
 
     def get_all_steps_by_interval(self, interval):
-        steps = []
-        for step in self._current_group._steps:
-            if step.interval() == interval and not step.was_executed():
-                steps.append(step)
-        return steps
+        return self._scheduler.steps_by_interval(self._current_group, interval)
 
     def _run_before_step(self, step):
         steps = self.get_all_steps_by_interval(ScrapingStepInterval.BeforeAnyStep)
@@ -245,6 +446,8 @@ class ScrapingBot:
     def _run_after_step(self, step):
         if self._take_screenshots_mode == TakeScreenshotModes.Always:
             self._take_screenshot(step)
+        elif self._take_screenshots_mode == TakeScreenshotModes.ErrorContext:
+            self._record_screenshot(step)
         steps = self.get_all_steps_by_interval(ScrapingStepInterval.AfterAnyStep)
         for s in steps:
             self._run_step(s)
@@ -253,18 +456,29 @@ class ScrapingBot:
         pass
 
     def _is_group_finished(self, group):
-        for step in group._steps:
-            if not step.was_executed():
-                return False
-        return True
+        return self._scheduler.is_group_finished(group)
 
-    def run(self, first_group: Union[str , ScrapingStepGroup]  = None):
+    def run(self, first_group: Union[str , ScrapingStepGroup]  = None,
+            resume_from: Union[str, ScrapingCheckpoint, dict] = None):
         """
-        Run the bot and execute all steps in the defined groups.
+        Run the bot and execute all steps in the defined groups. At the end the backend is flushed.
 
         :param first_group: This is the name of the first group to start. If it is None we use "default" as the first group.
+        :param resume_from: a checkpoint file, a ScrapingCheckpoint or a checkpoint state to continue an interrupted
+            run from. The steps that were executed are skipped and the data of the checkpoint is restored.
         :return: True if the bot finished successfully, False otherwise.
         """
+        first_group = self._resume(first_group, resume_from)
+        self._profiler.reset()
+        try:
+            return self._run(first_group)
+        finally:
+            self.save_checkpoint(force=True)
+            self._flush_screenshots()
+            self._log_profile()
+            self._flush_backend()
+
+    def _run(self, first_group: Union[str , ScrapingStepGroup]  = None):
         if first_group is None:
             first_group = "default"
         if first_group is not None and isinstance(first_group, str):
@@ -282,8 +496,15 @@ class ScrapingBot:
 
             if self._repeat_count > self._repeat_count_till_error:
                 self._on_exception("The same step was repeated too many times", last_step)
+                self._observe_group("failed")
                 return False
 
+            if self._parallel_chains > 1:
+                chains = find_independent_chains(self._current_group)
+                if len(chains) > 1 and not ScrapingChainRunner(self, self._current_group, chains).run():
+                    self._observe_group("failed")
+                    return False
+
             while not self._is_group_finished(self._current_group):
                 next_step = self.get_next_step(next_step)
 
@@ -310,33 +531,125 @@ class ScrapingBot:
                 if success:
                     self._run_after_step(next_step)
 
-                    self.sleep(2)
+                    self.pace(ScrapingPacingEvent.AfterStep, 2)
                     self._on_debug("Finished step: ", next_step.name())
+                    self.save_checkpoint()
                 else:
                     if next_step.exit_bot_when_errored():
                         self._on_exception("The bot will exit because of an error in the step: "+next_step.name(), next_step)
+                        self._observe_group("failed")
                         return False
                     self._on_debug("Failed step: ", next_step.name()+ " retrying "+str(self._max_retries)+" times.")
-                    self.sleep(3)
+                    self.pace(ScrapingPacingEvent.AfterFailedStep, 3)
+                    self.save_checkpoint()
 
 
             self._run_after_group(self._current_group)
+            self._observe_group("finished" if self._is_group_finished(self._current_group) else "unfinished")
 
-            self.sleep(1)
+            self.pace(ScrapingPacingEvent.AfterGroup, 1)
             self.set_current_group(self.get_next_group())
 
-        self.sleep(1)
+        self.pace(ScrapingPacingEvent.AfterRun, 1)
         return True
 
+    ##############################################################################################################
+    # Checkpoints
+    ##############################################################################################################
+
+    def _step_keys(self):
+        # a step is identified by its group, its position in the group and its name, so the keys are the same when
+        # the bot is built again by the same code
+        for group in self._stepGroups:
+            for position, step in enumerate(list(group._steps)):
+                yield str(group.name) + "/" + str(position) + "/" + step.name(), step
+
+    def checkpoint_state(self) -> dict:
+        """
+        :return: the state of the run that is saved in a checkpoint
+        """
+        steps = {}
+        for key, step in self._step_keys():
+            steps[key] = {"executed": step.was_executed(), "state": step.checkpoint_state()}
+        return {
+            "version": 1,
+            "group": self._current_group.name if self._current_group is not None else None,
+            "steps": steps,
+            "data": self._data,
+            "streamed": self._streamed,
+            "sequence": self._sequence
+        }
+
+    def save_checkpoint(self, force=False):
+        """
+        Save a checkpoint if the bot was created with a ScrapingCheckpoint and its interval passed. Steps that have
+        progress inside of them, like pagination and loop steps, call this after every page or element.
+
+        :param force: save even if the interval didn't pass
+        """
+        if self._checkpoint is None or self._checkpoint_paused > 0:
+            return
+        if not force and not self._checkpoint.due():
+            return
+        try:
+            self._checkpoint.save(self.checkpoint_state())
+        except Exception as e:
+            self._on_warning(e)
+
+    def _resume(self, first_group, resume_from):
+        if resume_from is None:
+            return first_group
+        if isinstance(resume_from, str):
+            resume_from = ScrapingCheckpoint(resume_from)
+        state = resume_from.load() if isinstance(resume_from, ScrapingCheckpoint) else resume_from
+        if state is None:
+            return first_group
+
+        steps = state["steps"]
+        for key, step in self._step_keys():
+            if key not in steps:
+                continue
+            if steps[key]["executed"]:
+                step.set_executed()
+            elif steps[key]["state"] is not None:
+                step.restore_state(steps[key]["state"])
+        self._data = state["data"]
+        self._streamed = state["streamed"]
+        self._sequence = state["sequence"]
+        self._on_debug("Resumed from checkpoint, executed steps: ",
+                       len([k for k in steps if steps[k]["executed"]]))
+
+        if first_group is None and state["group"] is not None and \
+                any(group.name == state["group"] for group in self._stepGroups):
+            return state["group"]
+        return first_group
+
     ##############################################################################################################
     # Data handling
     ##############################################################################################################
 
+    def set_data_format(self, data_format):
+        """
+        Set the ScrapingDataFormat of the DataFrames that are sent to the backend. None uses the format of the backend.
+        """
+        self._data_format = data_format
+
+    def data_format(self):
+        """
+        :return: the ScrapingDataFormat of the DataFrames that are sent to the backend
+        """
+        if self._data_format is not None:
+            return self._data_format
+        if self._backend is not None:
+            return self._backend.data_format()
+        return ScrapingDataFormat.Records
+
     def get_converted_data(self, data):
         retdata = {}
+        data_format = self.data_format()
         for key, value in data.items():
             if isinstance(value, pd.DataFrame):
-                retdata[key] = value.replace({np.nan:None}).to_dict(orient='records')
+                retdata[key] = encode_frame(value, data_format)
             else:
                 retdata[key] = value
 
@@ -347,18 +660,77 @@ class ScrapingBot:
             if self._backend is not None:
                 d_converted = self.get_converted_data(data)
                 self._backend.saveData(d_converted)
+                return True
+        except Exception as e:
+            self._on_warning(e)
+        return False
+
+    def send_changes_to_backend(self):
+        """
+        Send only the data that changed since the last successful send. The backend gets a dict with a sequence
+        number, the keys that were set ("set") and the rows or items that were appended ("append"). Appended data
+        contains its offset, so a backend can ignore rows it already has:
+
+        .. code-block:: python
+
+            {"sequence": 3, "set": {"title": "..."}, "append": {"rows": {"offset": 100, "rows": [...]}}}
+
+        The changes are only marked as sent when the backend reports the delivery with the callback of
+        IScrapingBackend.save_changes. A backend that sends in the background reports it later, changes that are sent
+        again until then have the same offsets. The same changes are sent again with the same sequence number, and the
+        number only advances when the backend took the changes, so a failed send leaves no gap.
+
+        :return: True if there was nothing to send or the backend took the changes, False otherwise
+        """
+        if self._backend is None:
+            return False
+        changed_set, changed_append, token = self._data.changes()
+        if len(token) == 0:
+            return True
+        sequence = self._sequence + 1
+        if self._sent_sequence is not None and self._sent_sequence[0] == token:
+            # nothing changed since the last send, which wasn't delivered yet
+            sequence = self._sent_sequence[1]
+        appended = self.get_converted_data({key: rows for key, (offset, rows) in changed_append.items()})
+        payload = {
+            "sequence": sequence,
+            "set": self.get_converted_data(changed_set),
+            "append": {key: {"offset": changed_append[key][0], "rows": rows} for key, rows in appended.items()}
+        }
+        try:
+            self._backend.save_changes(payload, lambda: self._data.acknowledge(token))
+        except Exception as e:
+            self._on_warning(e)
+            return False
+        self._sequence = max(self._sequence, sequence)
+        self._sent_sequence = (token, sequence)
+        return True
+
+    def _flush_backend(self):
+        try:
+            if self._backend is not None:
+                self._backend.flush()
         except Exception as e:
             self._on_warning(e)
 
     def send_error_to_backend(self, error):
         if self._backend is not None:
-            self._backend.errorHandling(error, debugData=self._task_logs)
+            self._backend.errorHandling(error, debugData=self._task_logs.report())
 
     def send_data_to_backend(self, key=None, data=None):
+        """
+        Send data to the backend. Without arguments all data is sent, or only the changes since the last send if the
+        bot was created with delta_sync=True.
+
+        :param key: send only the data of this key
+        :param data: send this data instead of the data of the bot
+        """
+        if key is None and data is None and self._delta_sync:
+            return self.send_changes_to_backend()
         if data is None:
             data = self._data
         if key is not None:
-            data = data[key]
+            data = {key: data[key]}
 
         self.save_backend_data(data)
 
@@ -368,44 +740,56 @@ class ScrapingBot:
             self.save_backend_data({key: value})
 
     def append_data(self, key, value, send_to_backend=False):
-        if key in self._data:
-            # pandas dataframe
-            if isinstance(self._data[key], pd.DataFrame):
-                # append elements to the dataframe
-                self._data[key] = self._data[key]._append(value, ignore_index=True)
-            elif isinstance(self._data[key], list):
-                self._data[key].append(value)
-            elif isinstance(self._data[key], str):
-                self._data[key] = [self._data[key], value]
-            elif isinstance(self._data[key], int):
-                self._data[key] = [self._data[key], value]
-            elif isinstance(self._data[key], float):
-                self._data[key] = [self._data[key], value]
-            elif isinstance(self._data[key], dict):
-                self._data[key] = [self._data[key], value]
-            elif isinstance(self._data[key], tuple):
-                self._data[key] = [self._data[key], value]
-            elif isinstance(self._data[key], set):
-                self._data[key] = [self._data[key], value]
-            # pandas dataframe
-            elif isinstance(self._data[key], pd.DataFrame):
-                # append elements to the dataframe
-                self._data[key] = self._data[key].append(value)
-        else:
-            self._data[key] = value
+        """
+        Append a value to the data of a key. Rows (dicts, lists of dicts, Series or DataFrames) are collected into a
+        DataFrame, all other values into a list. The values are buffered and the DataFrame or list is only built when
+        the data is read, so appending is O(1).
+
+        :param key: the key of the data
+        :param value: the value to append
+        :param send_to_backend: send the appended value to the backend
+        """
+        if self._stream_data and self._backend is not None:
+            # the value is only written to the backend, the bot only remembers that there is data for the key
+            self._streamed[key] = self._streamed.get(key, 0) + 1
+            self.save_backend_data({key: value})
+            return
+
+        self._data.append(key, value)
 
         if send_to_backend:
             self.save_backend_data({key: value})
 
     def has_data(self, key):
-        if key in self._data:
+        if key in self._data or key in self._streamed:
             return True
         return False
 
     def get_data(self, key):
+        """
+        :param key: the key of the data
+        :return: the data of the key, None if there is no data
+        :raises Exception: if the data of the key was streamed to the backend with stream_data=True, it is not kept in
+            the bot then, use streamed_count()
+        """
+        if key in self._streamed:
+            raise Exception("The data of " + str(key) + " was streamed to the backend and is not kept in the bot.")
         if key in self._data:
             return self._data[key]
         return None
 
+    def streamed_count(self, key) -> int:
+        """
+        :param key: the key of the data
+        :return: the number of values that were appended to the key and streamed to the backend
+        """
+        return self._streamed.get(key, 0)
+
     def get_task_log(self):
+        """
+        :return: the entries of the task log as dicts with the keys time, message, step and level, the oldest first
+        """
+        return self._task_logs.entries()
+
+    def task_log(self) -> ScrapingTaskLog:
         return self._task_logs
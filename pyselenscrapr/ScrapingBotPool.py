@@ -0,0 +1,157 @@
+import logging as log
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+
+
+class ScrapingBotPoolResult:
+    """
+    The result of one job of a ScrapingBotPool.
+    """
+    def __init__(self, job, index: int, success: bool = False, data: dict = None, error: Exception = None,
+                 task_log: list = None):
+        self.job = job
+        self.index = index
+        self.success = success
+        self.data = data if data is not None else {}
+        self.error = error
+        self.task_log = task_log if task_log is not None else []
+
+    def __repr__(self):
+        return "ScrapingBotPoolResult(index=" + str(self.index) + ", success=" + str(self.success) + \
+            ", error=" + repr(self.error) + ")"
+
+
+class ScrapingBotPool:
+    """
+    The ScrapingBotPool runs many jobs concurrently. Every job gets its own ScrapingBot with isolated data and steps,
+    the bots share a pool of WebDriver sessions. There is one session per worker, so the throughput scales with the
+    number of workers.
+
+    For example:
+
+    .. code-block:: python
+
+        def setup(bot, job):
+            bot.add_step(ScrapingStep("Open page", lambda l: l.get(job["url"])))
+
+        pool = ScrapingBotPool(lambda: webdriver.Remote(...), setup, max_workers=4)
+        for result in pool.run([{"url": "https://..."}, {"url": "https://..."}]):
+            print(result.success, result.data)
+    """
+    def __init__(self, driver_factory: Callable[[], object],
+                 setup: Callable[[ScrapingBot, object], None],
+                 max_workers: int = 4,
+                 bot_factory: Callable[[object], ScrapingBot] = None,
+                 first_group=None,
+                 quit_drivers: bool = True,
+                 **bot_kwargs):
+        """
+        Constructor for ScrapingBotPool
+
+        :param driver_factory: a function that creates a new selenium driver session
+        :param setup: a function that gets the new bot and the job and adds the steps for the job to the bot
+        :param max_workers: the number of bots that run at the same time and the maximum number of driver sessions
+        :param bot_factory: a function that creates a bot for a driver, None to create a ScrapingBot with bot_kwargs
+        :param first_group: the group that is passed to ScrapingBot.run()
+        :param quit_drivers: quit all driver sessions when the pool is closed
+        :param bot_kwargs: the arguments that are passed to the ScrapingBot constructor
+        """
+        self._driver_factory = driver_factory
+        self._setup = setup
+        self._max_workers = max_workers
+        self._bot_factory = bot_factory
+        self._first_group = first_group
+        self._quit_drivers = quit_drivers
+        self._bot_kwargs = bot_kwargs
+        self._idle_drivers = queue.Queue()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def _create_bot(self, driver) -> ScrapingBot:
+        if self._bot_factory is not None:
+            return self._bot_factory(driver)
+        return ScrapingBot(driver, **self._bot_kwargs)
+
+    def _acquire_driver(self):
+        try:
+            return self._idle_drivers.get_nowait()
+        except queue.Empty:
+            pass
+        driver = self._driver_factory()
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def _release_driver(self, driver, broken=False):
+        if not broken:
+            self._idle_drivers.put(driver)
+            return
+        # a driver that raised in run() may be in any state, so a new session is created for the next job
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        self._quit_driver(driver)
+
+    def _quit_driver(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            log.warning(e)
+
+    def _run_job(self, index, job) -> ScrapingBotPoolResult:
+        result = ScrapingBotPoolResult(job, index)
+        try:
+            driver = self._acquire_driver()
+        except Exception as e:
+            result.error = e
+            return result
+
+        broken = False
+        bot = None
+        try:
+            bot = self._create_bot(driver)
+            self._setup(bot, job)
+            result.success = bot.run(self._first_group)
+        except Exception as e:
+            log.error(e)
+            result.error = e
+            broken = True
+        finally:
+            if bot is not None:
+                result.data = bot._data.to_dict()
+                result.task_log = bot.get_task_log()
+            self._release_driver(driver, broken)
+        return result
+
+    def run(self, jobs: list) -> [ScrapingBotPoolResult]:
+        """
+        Run all jobs and wait until they are finished.
+
+        :param jobs: a list of jobs, every job is passed to the setup function
+        :return: a list of ScrapingBotPoolResult in the order of the jobs
+        """
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = [executor.submit(self._run_job, i, job) for i, job in enumerate(jobs)]
+            return [f.result() for f in futures]
+
+    def close(self):
+        """
+        Quit all driver sessions of the pool if quit_drivers is set.
+        """
+        with self._lock:
+            drivers = self._drivers
+            self._drivers = []
+        self._idle_drivers = queue.Queue()
+        if self._quit_drivers:
+            for driver in drivers:
+                self._quit_driver(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
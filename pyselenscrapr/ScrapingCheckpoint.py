@@ -0,0 +1,143 @@
+import logging
+import os
+import pickle
+import struct
+import time
+
+from pyselenscrapr.ScrapingDataStore import ScrapingDataStore
+
+_RECORD_HEADER = struct.Struct("<Q")
+
+
+class ScrapingCheckpoint:
+    """
+    Saves the state of a run to a local file, so a run that crashed or was interrupted can be resumed with
+    ScrapingBot.run(resume_from=...). The state contains the executed steps, the progress of pagination and loop
+    steps and the data of the bot.
+
+    Checkpoints are incremental: the complete state is only written every compact_every checkpoints, the checkpoints
+    in between append the data that changed since the last one to a journal file next to the checkpoint
+    (<path>.journal). Loading reads the complete state and replays the journal.
+
+    The files are written with pickle, only load checkpoints that you created yourself.
+    """
+    def __init__(self, path: str, interval: float = 30.0, fsync: bool = False, compact_every: int = 20):
+        """
+        Constructor for ScrapingCheckpoint
+
+        :param path: the path of the checkpoint file
+        :param interval: the minimum time in seconds between two checkpoints, 0 to write after every step and page
+        :param fsync: sync the file to the disk after every write
+        :param compact_every: write the complete state every compact_every checkpoints, 1 to always write it
+        """
+        self._path = path
+        self._interval = interval
+        self._fsync = fsync
+        self._compact_every = max(1, compact_every)
+        self._last_save = None
+        # the generation of the complete state, the records of the journal belong to it
+        self._generation = None
+        self._position = None
+        self._journaled = 0
+
+    def path(self) -> str:
+        return self._path
+
+    def journal_path(self) -> str:
+        return self._path + ".journal"
+
+    def due(self) -> bool:
+        """
+        :return: True if the interval passed since the last checkpoint
+        """
+        return self._last_save is None or time.monotonic() - self._last_save >= self._interval
+
+    def save(self, state: dict):
+        """
+        Write the state. The complete state replaces the file atomically and a record is appended to the journal at
+        once, so a crash during the write keeps the last checkpoint.
+        """
+        data = state.get("data")
+        if not isinstance(data, ScrapingDataStore) or self._position is None or \
+                self._journaled + 1 >= self._compact_every:
+            self._save_complete(state, data)
+        else:
+            record = dict(state)
+            record["data"] = data.journal(self._position)
+            self._append_journal((self._generation, record))
+            self._journaled += 1
+        self._last_save = time.monotonic()
+
+    def _save_complete(self, state, data):
+        generation = time.time_ns()
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((generation, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self._path)
+        # the records of the old generation are ignored on load, so a crash before the journal is gone is harmless
+        if os.path.exists(self.journal_path()):
+            os.remove(self.journal_path())
+        self._generation = generation
+        self._position = data.journal_position() if isinstance(data, ScrapingDataStore) else None
+        self._journaled = 0
+
+    def _append_journal(self, record):
+        body = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self.journal_path(), "ab") as f:
+            # the length in front of the record tells a record that was cut off from a corrupt one
+            f.write(_RECORD_HEADER.pack(len(body)) + body)
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+
+    def load(self):
+        """
+        Only the last record of the journal may be cut off, it is skipped then. A corrupt record before it raises an
+        Exception.
+
+        :return: the saved state, or None if there is no checkpoint file
+        """
+        if not os.path.exists(self._path):
+            return None
+        with open(self._path, "rb") as f:
+            generation, state = pickle.load(f)
+        if not os.path.exists(self.journal_path()):
+            return state
+        size = os.path.getsize(self.journal_path())
+        with open(self.journal_path(), "rb") as f:
+            while True:
+                start = f.tell()
+                header = f.read(_RECORD_HEADER.size)
+                if len(header) == 0:
+                    break
+                try:
+                    if len(header) < _RECORD_HEADER.size:
+                        raise EOFError("the length of the record is cut off")
+                    length = _RECORD_HEADER.unpack(header)[0]
+                    body = f.read(length)
+                    if len(body) < length:
+                        raise EOFError("the record is cut off")
+                    record_generation, record = pickle.loads(body)
+                except (EOFError, pickle.UnpicklingError) as e:
+                    if f.tell() < size:
+                        # the records are incremental, the ones after it can't be replayed without it
+                        raise Exception("The record at byte " + str(start) + " of the journal " +
+                                        self.journal_path() + " is corrupt: " + str(e))
+                    # only the last record can be cut off by a crash during the write
+                    logging.warning("Skipped the last record of the journal " + self.journal_path() + ": " + str(e))
+                    break
+                if record_generation != generation:
+                    continue
+                data = state["data"]
+                data.apply_journal(record["data"])
+                state = dict(record)
+                state["data"] = data
+        return state
+
+    def remove(self):
+        for path in (self._path, self.journal_path()):
+            if os.path.exists(path):
+                os.remove(path)
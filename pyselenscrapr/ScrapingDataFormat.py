@@ -0,0 +1,77 @@
+import base64
+
+import pandas as pd
+
+
+class ScrapingDataFormat:
+    """
+    This enum is used to define how DataFrames are encoded in the data that is sent to the backend.
+    """
+    Records = 0 # a list of dicts, one per row: [{"a": 1, "b": 2}, ...]
+    Split = 1 # {"columns": ["a", "b"], "data": [[1, 2], ...]}
+    Columns = 2 # {"columns": {"a": [1, ...], "b": [2, ...]}}
+    Arrow = 3 # {"format": "arrow", "data": "<base64 of an Arrow IPC stream>"}, needs pyarrow
+
+
+def _without_nan(df: pd.DataFrame) -> pd.DataFrame:
+    # NaN and NaT become None in one vectorized step, the object dtype also turns numpy scalars into python ones
+    values = df.astype(object)
+    for i, dtype in enumerate(df.dtypes):
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            # timestamps aren't JSON serializable, they are sent as ISO 8601 strings
+            values.iloc[:, i] = df.iloc[:, i].map(lambda v: v.isoformat(), na_action="ignore")
+    return values.where(df.notna(), None)
+
+
+def _column_names(df, data_format):
+    columns = [c if isinstance(c, (str, int, float, bool)) or c is None else str(c) for c in df.columns]
+    if data_format != ScrapingDataFormat.Split and len(set(columns)) < len(columns):
+        # the rows or columns are dicts keyed by the column name, a duplicate would silently overwrite the data
+        duplicates = sorted(set(str(c) for c in columns if columns.count(c) > 1))
+        raise ValueError("The DataFrame has duplicate column names: " + ", ".join(duplicates))
+    return columns
+
+
+def encode_frame(df: pd.DataFrame, data_format: int = ScrapingDataFormat.Records):
+    """
+    Encode a DataFrame for the backend. NaN and NaT values are sent as None (null), timestamps as ISO 8601 strings.
+    Records and Columns need unique column names, a ValueError is raised otherwise.
+
+    :param df: the DataFrame
+    :param data_format: a ScrapingDataFormat
+    :return: a JSON serializable value
+    """
+    if data_format == ScrapingDataFormat.Arrow:
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return {"format": "arrow", "data": base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")}
+
+    columns = _column_names(df, data_format)
+    if data_format == ScrapingDataFormat.Columns:
+        return {"columns": {name: _without_nan(df.iloc[:, [i]]).iloc[:, 0].tolist()
+                            for i, name in enumerate(columns)}}
+
+    values = _without_nan(df).values.tolist()
+    if data_format == ScrapingDataFormat.Split:
+        return {"columns": columns, "data": values}
+    return [dict(zip(columns, row)) for row in values]
+
+
+def decode_frame(value) -> pd.DataFrame:
+    """
+    Decode a DataFrame that was encoded with encode_frame. Can be used in a backend.
+
+    :param value: the encoded DataFrame
+    :return: the DataFrame
+    """
+    if isinstance(value, list):
+        return pd.DataFrame(value)
+    if value.get("format") == "arrow":
+        import pyarrow as pa
+        return pa.ipc.open_stream(base64.b64decode(value["data"])).read_all().to_pandas()
+    if isinstance(value.get("columns"), dict):
+        return pd.DataFrame(value["columns"])
+    return pd.DataFrame(value["data"], columns=value["columns"])
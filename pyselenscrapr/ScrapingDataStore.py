@@ -0,0 +1,291 @@
+import threading
+from collections.abc import MutableMapping
+
+import pandas as pd
+
+
+class ScrapingDataAccumulator:
+    """
+    Collects the values that are appended to one key of the bot data. Appending is O(1), the result is built lazily
+    when it is read.
+
+    If the first value is a DataFrame, a dict or a list of dicts, the accumulator collects rows. Rows are buffered and
+    converted to a DataFrame chunk every chunk_size rows, the chunks are concatenated once on read. Otherwise the
+    accumulator collects items and is read as a flat list.
+    """
+    def __init__(self, value, chunk_size: int = 10000):
+        self._chunk_size = chunk_size
+        self._chunks = []
+        self._rows = []
+        self._items = []
+        self._frame = None
+        self._is_frame = isinstance(value, (pd.DataFrame, pd.Series, dict)) or \
+            (isinstance(value, list) and len(value) > 0 and all(isinstance(v, dict) for v in value))
+        if self._is_frame or not isinstance(value, list):
+            self.append(value)
+        else:
+            # a list as first value is the initial list of items
+            self._items.extend(value)
+
+    def is_frame(self) -> bool:
+        return self._is_frame
+
+    def append(self, value):
+        self._frame = None
+        if not self._is_frame:
+            self._items.append(value)
+            return
+        if isinstance(value, pd.DataFrame):
+            self._flush_rows()
+            self._chunks.append(value)
+        elif isinstance(value, pd.Series):
+            self._rows.append(value.to_dict())
+        elif isinstance(value, dict):
+            self._rows.append(value)
+        elif isinstance(value, (list, tuple)):
+            self._rows.extend(v if isinstance(v, dict) else {0: v} for v in value)
+        else:
+            self._rows.append({0: value})
+        if len(self._rows) >= self._chunk_size:
+            self._flush_rows()
+
+    def extend(self, values):
+        """
+        Append the rows or items of values_from(), e.g. to replay them from a checkpoint journal.
+        """
+        if self._is_frame:
+            self.append(values)
+        else:
+            self._frame = None
+            self._items.extend(values)
+
+    def _flush_rows(self):
+        if len(self._rows) > 0:
+            self._chunks.append(pd.DataFrame(self._rows))
+            self._rows = []
+
+    def __len__(self):
+        if not self._is_frame:
+            return len(self._items)
+        return sum(len(c) for c in self._chunks) + len(self._rows)
+
+    def values_from(self, offset: int):
+        """
+        :param offset: the number of rows or items to skip
+        :return: the rows or items after offset as a DataFrame or list
+        """
+        if not self._is_frame:
+            return self._items[offset:]
+        # only the chunks after offset are sliced and concatenated, the whole frame is not built for a delta
+        frames = []
+        position = 0
+        for chunk in self._chunks:
+            if position + len(chunk) > offset:
+                frames.append(chunk.iloc[max(0, offset - position):])
+            position += len(chunk)
+        if position + len(self._rows) > offset:
+            frames.append(pd.DataFrame(self._rows[max(0, offset - position):]))
+        if len(frames) == 0:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            # a shallow copy, so the index of the chunk isn't changed
+            frame = frames[0].copy(deep=False)
+        else:
+            frame = pd.concat(frames, ignore_index=True)
+        frame.index = pd.RangeIndex(offset, offset + len(frame))
+        return frame
+
+    def value(self):
+        """
+        :return: the DataFrame of all rows, or the list of all items
+        """
+        if not self._is_frame:
+            return self._items
+        if self._frame is None:
+            self._flush_rows()
+            if len(self._chunks) == 0:
+                self._frame = pd.DataFrame()
+            elif len(self._chunks) == 1:
+                self._frame = self._chunks[0]
+            else:
+                self._frame = pd.concat(self._chunks, ignore_index=True)
+            # the materialized frame is the only chunk now, so the next read doesn't concatenate again
+            self._chunks = [self._frame]
+        return self._frame
+
+
+class ScrapingDataStore(MutableMapping):
+    """
+    The data of a ScrapingBot. It behaves like a dict, but values that are collected with append() are stored in a
+    ScrapingDataAccumulator and materialized when they are read.
+    """
+    def __init__(self, chunk_size: int = 10000):
+        self._chunk_size = chunk_size
+        self._values = {}
+        # keys that have to be sent completely, with a version to detect changes during a send
+        self._dirty = {}
+        self._version = 0
+        # the number of rows or items of an accumulator that were acknowledged by the backend
+        self._watermarks = {}
+        # the version of the last set of every key, for the journal of incremental checkpoints
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # the store is pickled into checkpoints, the lock is created again on load
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_versions", {})
+        self._lock = threading.Lock()
+
+    def _mark_dirty(self, key):
+        with self._lock:
+            self._version += 1
+            self._dirty[key] = self._version
+            self._versions[key] = self._version
+            self._watermarks.pop(key, None)
+
+    def append(self, key, value):
+        current = self._values.get(key)
+        if isinstance(current, ScrapingDataAccumulator):
+            current.append(value)
+        elif key in self._values:
+            # a value that was set with set_data becomes the first value of the accumulator
+            accumulator = ScrapingDataAccumulator(current, self._chunk_size)
+            accumulator.append(value)
+            self._values[key] = accumulator
+            self._mark_dirty(key)
+        else:
+            self._values[key] = ScrapingDataAccumulator(value, self._chunk_size)
+            with self._lock:
+                # a new version, so a journal doesn't take the accumulator for a removed one with the same key
+                self._version += 1
+                self._versions[key] = self._version
+
+    def changes(self):
+        """
+        Collect the data that changed since the last acknowledge().
+
+        :return: a tuple (set, append, token). set is a dict of the keys that have to be replaced completely, append a
+            dict of key -> (offset, new rows or items) and token has to be passed to acknowledge() after the backend
+            received the changes.
+        """
+        changed_set = {}
+        changed_append = {}
+        token = {}
+        with self._lock:
+            dirty = dict(self._dirty)
+            watermarks = dict(self._watermarks)
+        for key, value in self._values.items():
+            length = len(value) if isinstance(value, ScrapingDataAccumulator) else None
+            if key in dirty:
+                changed_set[key] = self[key]
+                token[key] = (dirty[key], length)
+            elif length is not None:
+                offset = watermarks.get(key, 0)
+                if length > offset:
+                    changed_append[key] = (offset, value.values_from(offset))
+                    token[key] = (None, length)
+        return changed_set, changed_append, token
+
+    def acknowledge(self, token):
+        """
+        Mark the changes of a changes() call as received by the backend. It can be called from the thread of a
+        backend that sends in the background.
+        """
+        with self._lock:
+            for key, (version, length) in token.items():
+                if version is not None:
+                    if self._dirty.get(key) != version:
+                        # the key was set again during the send
+                        continue
+                    del self._dirty[key]
+                if length is not None and length > self._watermarks.get(key, 0):
+                    self._watermarks[key] = length
+
+    def journal_position(self) -> dict:
+        """
+        :return: the position of every key, pass it to journal() to get the changes after it
+        """
+        return {key: (self._versions.get(key), len(value) if isinstance(value, ScrapingDataAccumulator) else None)
+                for key, value in list(self._values.items())}
+
+    def journal(self, position: dict) -> dict:
+        """
+        Collect the changes since a position for an incremental checkpoint. Keys that were set again are contained
+        completely, of the other accumulators only the rows or items after the position.
+
+        :param position: the result of journal_position() or of the last journal(), it is updated to the new position
+        :return: a dict that apply_journal() replays on a copy of the store at the position
+        """
+        values = {}
+        rows = {}
+        for key, value in list(self._values.items()):
+            version = self._versions.get(key)
+            length = len(value) if isinstance(value, ScrapingDataAccumulator) else None
+            if key not in position or position[key][0] != version:
+                values[key] = value
+            elif length is not None and length > position[key][1]:
+                rows[key] = value.values_from(position[key][1])
+            position[key] = (version, length)
+        removed = [key for key in position if key not in self._values]
+        for key in removed:
+            del position[key]
+        with self._lock:
+            bookkeeping = {"dirty": dict(self._dirty), "version": self._version,
+                           "watermarks": dict(self._watermarks), "versions": dict(self._versions)}
+        return {"values": values, "rows": rows, "removed": removed, "bookkeeping": bookkeeping}
+
+    def apply_journal(self, journal: dict):
+        """
+        Replay a journal() of the store.
+        """
+        for key in journal["removed"]:
+            self._values.pop(key, None)
+        self._values.update(journal["values"])
+        for key, rows in journal["rows"].items():
+            self._values[key].extend(rows)
+        bookkeeping = journal["bookkeeping"]
+        with self._lock:
+            self._dirty = bookkeeping["dirty"]
+            self._version = bookkeeping["version"]
+            self._watermarks = bookkeeping["watermarks"]
+            self._versions = bookkeeping["versions"]
+
+    def __getitem__(self, key):
+        value = self._values[key]
+        if isinstance(value, ScrapingDataAccumulator):
+            return value.value()
+        return value
+
+    def __setitem__(self, key, value):
+        self._values[key] = value
+        self._mark_dirty(key)
+
+    def __delitem__(self, key):
+        del self._values[key]
+        self._dirty.pop(key, None)
+        self._watermarks.pop(key, None)
+        self._versions.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return "ScrapingDataStore(" + repr(list(self._values.keys())) + ")"
+
+    def to_dict(self) -> dict:
+        """
+        :return: a plain dict with all values materialized
+        """
+        return {key: self[key] for key in self._values}
@@ -0,0 +1,175 @@
+from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+
+from pyselenscrapr.ScrapingElementCache import MUTATING_COMMANDS
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+
+class _SoupNode:
+    """
+    A node of the BeautifulSoup tree, used for CSS selectors.
+    """
+    def __init__(self, tag):
+        self._tag = tag
+
+    def tag_name(self):
+        return self._tag.name
+
+    def attribute(self, name):
+        value = self._tag.get(name)
+        if isinstance(value, list):
+            return " ".join(value)
+        return value
+
+    def text(self):
+        return self._tag.get_text()
+
+    def inner_html(self):
+        return self._tag.decode_contents()
+
+    def outer_html(self):
+        return str(self._tag)
+
+
+class _LxmlNode:
+    """
+    A node of the lxml tree, used for XPATH selectors.
+    """
+    def __init__(self, element):
+        self._element = element
+
+    def tag_name(self):
+        return self._element.tag
+
+    def attribute(self, name):
+        return self._element.get(name)
+
+    def text(self):
+        return self._element.text_content()
+
+    def inner_html(self):
+        html = self._element.text or ""
+        for child in self._element:
+            html += lxml.html.tostring(child, encoding="unicode")
+        return html
+
+    def outer_html(self):
+        # tostring also writes the tail text after the element, which is not part of outerHTML
+        return lxml.html.tostring(self._element, encoding="unicode", with_tail=False)
+
+
+class ScrapingSnapshotElement:
+    """
+    An element of a ScrapingDomSnapshot. The text and the attributes are read from the snapshot. Everything else,
+    e.g. click() or is_displayed(), is forwarded to the real WebElement, which is looked up on first use.
+    """
+    def __init__(self, node, logic, by, selector, index):
+        self._node = node
+        self._logic = logic
+        self._by = by
+        self._selector = selector
+        self._index = index
+        self._web_element = None
+
+    @property
+    def text(self):
+        return self._node.text().strip()
+
+    @property
+    def tag_name(self):
+        return self._node.tag_name()
+
+    def get_attribute(self, name):
+        if name == "outerHTML":
+            return self._node.outer_html()
+        if name == "innerHTML":
+            return self._node.inner_html()
+        if name in ("innerText", "textContent"):
+            return self._node.text()
+        return self._node.attribute(name)
+
+    def web_element(self):
+        """
+        :return: the real WebElement of the driver
+        """
+        if self._web_element is None:
+            self._web_element = self._logic._driver.find_elements(self._by, self._selector)[self._index]
+        return self._web_element
+
+    def __getattr__(self, item):
+        result = getattr(self.web_element(), item)
+        if callable(result) and item in MUTATING_COMMANDS:
+            func = result
+
+            def wrapper(*args, **kwargs):
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._logic._invalidate_cache()
+            return wrapper
+        return result
+
+    def __repr__(self):
+        return "ScrapingSnapshotElement(" + repr(self._selector) + ", " + str(self._index) + ")"
+
+
+class ScrapingDomSnapshot:
+    """
+    A parsed copy of the page_source of the driver. Read-only queries of ScrapingLogic are answered from it without a
+    round-trip. CSS selectors are evaluated with BeautifulSoup, XPATH selectors with lxml if it is installed.
+
+    The snapshot only knows the HTML of the page, so form values that were typed into an input are not part of it.
+    """
+    def __init__(self, html: str):
+        self._html = html if html is not None else ""
+        self._soup = None
+        self._tree = None
+
+    def _select_css(self, selector):
+        if self._soup is None:
+            self._soup = BeautifulSoup(self._html, "html.parser")
+        return [_SoupNode(t) for t in self._soup.select(selector)]
+
+    def _select_xpath(self, selector):
+        if lxml is None:
+            return None
+        if self._tree is None:
+            self._tree = lxml.html.fromstring(self._html) if self._html.strip() != "" else None
+        if self._tree is None:
+            return []
+        try:
+            result = self._tree.xpath(selector)
+        except etree.XPathError:
+            return None
+        if not isinstance(result, list):
+            return None
+        return [_LxmlNode(e) for e in result if isinstance(e, etree._Element)]
+
+    def select(self, by, selector):
+        """
+        Evaluate a selector on the snapshot.
+
+        :param by: By.CSS_SELECTOR or By.XPATH
+        :param selector: the selector
+        :return: a list of nodes, or None if the selector can't be evaluated locally
+        """
+        try:
+            if by == By.XPATH:
+                return self._select_xpath(selector)
+            return self._select_css(selector)
+        except Exception:
+            return None
+
+    def elements(self, logic, by, selector):
+        """
+        :return: a list of ScrapingSnapshotElement, or None if the selector can't be evaluated locally
+        """
+        nodes = self.select(by, selector)
+        if nodes is None:
+            return None
+        return [ScrapingSnapshotElement(n, logic, by, selector, i) for i, n in enumerate(nodes)]
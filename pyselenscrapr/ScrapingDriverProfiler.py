@@ -0,0 +1,152 @@
+import functools
+import inspect
+import threading
+import time
+
+
+class _ActiveHelper(threading.local):
+    # the ScrapingLogic helper or driver function that a step called in this thread, only set while profiling
+    name = None
+
+
+_active_helper = _ActiveHelper()
+
+
+def profiling(bot) -> bool:
+    profiler = getattr(bot, "_profiler", None)
+    return profiler is not None and profiler.enabled
+
+
+def profiled_call(name, func, *args, **kwargs):
+    """
+    Call a function as the helper name. The outermost helper is the one the step called, so a helper that is called
+    by another helper doesn't change it.
+    """
+    if _active_helper.name is not None:
+        return func(*args, **kwargs)
+    _active_helper.name = name
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _active_helper.name = None
+
+
+def _profiled_helper(name, func):
+    @functools.wraps(func)
+    def helper(self, *args, **kwargs):
+        if not profiling(self._bot):
+            return func(self, *args, **kwargs)
+        return profiled_call(name, func, self, *args, **kwargs)
+    return helper
+
+
+def profile_helpers(cls):
+    """
+    Wrap the public helper methods of a ScrapingLogic class, so the commands they send are attributed to them.
+    """
+    for name, value in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(value):
+            setattr(cls, name, _profiled_helper(name, value))
+    return cls
+
+
+class ScrapingDriverProfiler:
+    """
+    Counts and times the wire commands of the selenium drivers of a bot. Every command is attributed to the step that
+    is running and to the ScrapingLogic helper that sent it, e.g. element_text. Commands that a step sends with a
+    driver method through the logic are attributed to "driver.<method>", commands that are sent directly on the
+    driver to "".
+
+    The profiler wraps the execute method of the driver, which every command of the driver and of its WebElements
+    goes through. The helpers of the logic and the driver functions that are called through it name themselves in a
+    thread-local while the profiler is enabled.
+    """
+    def __init__(self, enabled: bool = False, bot=None):
+        """
+        Constructor for ScrapingDriverProfiler
+
+        :param enabled: wrap the drivers, if False attach() does nothing
+        :param bot: the bot, the active step is read from it
+        """
+        self.enabled = enabled
+        self._bot = bot
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def attach(self, driver):
+        """
+        Wrap the execute method of a driver, so its commands are counted.
+
+        :param driver: a selenium driver
+        :return: the driver
+        """
+        if not self.enabled or driver is None or "_profiled_execute" in vars(driver):
+            return driver
+        execute = getattr(driver, "execute", None)
+        if execute is None:
+            return driver
+
+        def profiled_execute(command, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return execute(command, *args, **kwargs)
+            finally:
+                self._record(command, time.perf_counter() - started)
+
+        driver._profiled_execute = execute
+        driver.execute = profiled_execute
+        return driver
+
+    def detach(self, driver):
+        if "_profiled_execute" in vars(driver):
+            del driver.execute
+            del driver._profiled_execute
+
+    def _record(self, command, seconds):
+        step = getattr(self._bot._active, "step", None) if self._bot is not None else None
+        key = (step or "", _active_helper.name or "", command)
+        with self._lock:
+            calls = self._calls.get(key)
+            if calls is None:
+                self._calls[key] = [1, seconds]
+            else:
+                calls[0] += 1
+                calls[1] += seconds
+
+    def reset(self):
+        with self._lock:
+            self._calls = {}
+
+    def total(self) -> dict:
+        with self._lock:
+            calls = list(self._calls.values())
+        return {"calls": sum(c[0] for c in calls), "seconds": sum(c[1] for c in calls)}
+
+    def report(self) -> list:
+        """
+        :return: a list of dicts with the keys step, helper, calls, seconds and commands, the most expensive first.
+            commands has the calls and the seconds of every wire command the helper sent.
+        """
+        with self._lock:
+            calls = [(key, list(value)) for key, value in self._calls.items()]
+        rows = {}
+        for (step, helper, command), (count, seconds) in calls:
+            row = rows.setdefault((step, helper), {"step": step, "helper": helper, "calls": 0, "seconds": 0.0,
+                                                   "commands": {}})
+            row["calls"] += count
+            row["seconds"] += seconds
+            row["commands"][command] = {"calls": count, "seconds": seconds}
+        return sorted(rows.values(), key=lambda r: r["seconds"], reverse=True)
+
+    def format_report(self, limit: int = 20) -> str:
+        """
+        :param limit: the number of rows
+        :return: the report as a text table
+        """
+        rows = self.report()
+        lines = ["%-30s %-30s %8s %10s" % ("step", "helper", "calls", "ms")]
+        for r in rows[:limit]:
+            lines.append("%-30s %-30s %8d %10.1f" % (r["step"], r["helper"], r["calls"], r["seconds"] * 1000))
+        total = self.total()
+        lines.append("%-61s %8d %10.1f" % ("total", total["calls"], total["seconds"] * 1000))
+        return "\n".join(lines)
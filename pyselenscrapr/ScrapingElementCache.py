@@ -0,0 +1,79 @@
+import threading
+from functools import lru_cache
+
+from selenium.webdriver.common.by import By
+
+
+# driver commands that can change the page, the cache is cleared after them
+MUTATING_COMMANDS = {"get", "back", "forward", "refresh", "execute_script", "execute_async_script", "click",
+                     "send_keys", "submit", "clear", "close", "switch_to_window", "switch_to_frame",
+                     "add_cookie", "delete_cookie", "delete_all_cookies"}
+
+
+@lru_cache(maxsize=1024)
+def compile_selector(selector: str):
+    """
+    Compile a CSS or XPATH selector to the locator tuple of selenium.
+
+    :param selector: CSS or XPATH selector
+    :return: a tuple of the By strategy and the selector
+    """
+    if selector.startswith("//"):
+        return By.XPATH, selector
+    return By.CSS_SELECTOR, selector
+
+
+class ScrapingElementCache:
+    """
+    The ScrapingElementCache keeps the results of element lookups for one page state of the bot. A page state ends
+    when the bot starts a step, finishes the execute of a step, pauses, navigates or sends a command that can change
+    the page, when the url changes or when a cached element is stale. Repeated lookups of the same selector in the
+    can_execute and was_executed callbacks of a step then cost no round-trip.
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = {}
+        self._url = None
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :param key: a hashable key of the lookup, e.g. ("element", By.XPATH, "//h3")
+        :return: a tuple (True, value) for a hit, (False, None) for a miss
+        """
+        if not self.enabled:
+            return False, None
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+        return False, None
+
+    def put(self, key, value):
+        if self.enabled:
+            with self._lock:
+                self._entries[key] = value
+
+    def invalidate(self):
+        with self._lock:
+            if len(self._entries) > 0:
+                self.invalidations += 1
+            self._entries = {}
+
+    def check_url(self, url):
+        """
+        Clear the cache if the url is not the url of the cached page state.
+
+        :param url: the current url of the driver
+        """
+        if url != self._url:
+            self.invalidate()
+            self._url = url
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations,
+                "entries": len(self._entries)}
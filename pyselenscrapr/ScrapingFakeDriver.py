@@ -0,0 +1,432 @@
+import base64
+import collections
+import os
+import time
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+
+from pyselenscrapr.ScrapingLogic import SNAPSHOT_SCRIPT, TABLES_SCRIPT
+from pyselenscrapr.ScrapingWaits import WAIT_DOM_QUIET_SCRIPT, WAIT_ELEMENT_GONE_SCRIPT, WAIT_ELEMENT_SCRIPT, \
+    WAIT_NETWORK_IDLE_SCRIPT, WAIT_READY_STATE_SCRIPT, WAIT_RELOAD_SCRIPT, WAIT_TEXT_CHANGE_SCRIPT
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# the command of WebElement.is_displayed, selenium runs an atom script for it
+IS_ELEMENT_DISPLAYED = "isElementDisplayed"
+
+# a transparent 1x1 PNG
+_PNG = base64.b64decode("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg==")
+
+NOT_FOUND = "<html><head><title>Not Found</title></head><body><h1>Not Found</h1></body></html>"
+
+
+def _text(tag):
+    return tag.get_text()
+
+
+def _attribute(tag, name):
+    if name == "outerHTML":
+        return str(tag)
+    if name == "innerHTML":
+        return tag.decode_contents()
+    if name in ("innerText", "textContent"):
+        return _text(tag)
+    value = tag.get(name)
+    if isinstance(value, list):
+        return " ".join(value)
+    return value
+
+
+def _visible(tag):
+    # only the hidden attribute and inline styles are known without a browser
+    for t in [tag] + list(tag.parents):
+        if t.name == "[document]":
+            break
+        style = (t.get("style") or "").replace(" ", "").lower()
+        if t.get("hidden") is not None or "display:none" in style or (t is tag and "visibility:hidden" in style):
+            return False
+    return True
+
+
+def _table_grid(table):
+    # the same grid as TABLES_SCRIPT builds in the browser
+    rows = [r for r in table.find_all("tr") if r.find_parent("table") is table]
+    grid = [[] for _ in rows]
+    header_rows = 0
+    header_done = False
+    for r, row in enumerate(rows):
+        cells = row.find_all(["td", "th"], recursive=False)
+        all_th = len(cells) > 0
+        c = 0
+        for cell in cells:
+            if cell.name != "th":
+                all_th = False
+            while c < len(grid[r]) and grid[r][c] is not None:
+                c += 1
+            text = _text(cell).strip()
+            row_span = max(1, int(cell.get("rowspan", 1) or 1))
+            col_span = max(1, int(cell.get("colspan", 1) or 1))
+            for dr in range(row_span):
+                if r + dr >= len(rows):
+                    break
+                for dc in range(col_span):
+                    line = grid[r + dr]
+                    while len(line) <= c + dc:
+                        line.append(None)
+                    line[c + dc] = text
+            c += col_span
+        in_head = row.parent is not None and row.parent.name == "thead"
+        if not header_done and (in_head or all_th):
+            header_rows += 1
+        else:
+            header_done = True
+    width = max([len(line) for line in grid] + [0])
+    for line in grid:
+        line.extend([None] * (width - len(line)))
+    return {"rows": grid, "header_rows": header_rows}
+
+
+class ScrapingFakeElement:
+    """
+    An element of a ScrapingFakeDriver. Every method is a round-trip to the fake driver, like on a real WebElement.
+    """
+    def __init__(self, parent, tag):
+        self.parent = parent
+        self._tag = tag
+
+    def _execute(self, command, params=None):
+        params = dict(params) if params is not None else {}
+        params["id"] = self
+        return self.parent.execute(command, params)
+
+    @property
+    def text(self):
+        return self._execute(Command.GET_ELEMENT_TEXT)
+
+    @property
+    def tag_name(self):
+        return self._execute(Command.GET_ELEMENT_TAG_NAME)
+
+    def get_attribute(self, name):
+        return self._execute(Command.GET_ELEMENT_ATTRIBUTE, {"name": name})
+
+    def get_property(self, name):
+        return self._execute(Command.GET_ELEMENT_PROPERTY, {"name": name})
+
+    def is_displayed(self):
+        return self._execute(IS_ELEMENT_DISPLAYED)
+
+    def is_enabled(self):
+        return self._execute(Command.IS_ELEMENT_ENABLED)
+
+    def click(self):
+        self._execute(Command.CLICK_ELEMENT)
+
+    def send_keys(self, *value):
+        self._execute(Command.SEND_KEYS_TO_ELEMENT, {"text": "".join(str(v) for v in value)})
+
+    def clear(self):
+        self._execute(Command.CLEAR_ELEMENT)
+
+    def find_element(self, by=By.ID, value=None):
+        return self._execute(Command.FIND_CHILD_ELEMENT, {"using": by, "value": value})
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._execute(Command.FIND_CHILD_ELEMENTS, {"using": by, "value": value})
+
+    def __eq__(self, other):
+        return isinstance(other, ScrapingFakeElement) and other._tag is self._tag
+
+    def __hash__(self):
+        return id(self._tag)
+
+    def __repr__(self):
+        return "ScrapingFakeElement(<" + str(self._tag.name) + ">)"
+
+
+class ScrapingFakeDriver:
+    """
+    An in-process stand-in for a selenium driver that serves local HTML fixtures. It answers find_element(s),
+    execute_script, get, page_source, current_url, title and the screenshot methods, and runs the scripts of
+    ScrapingLogic (snapshot(), extract_tables()) in Python. Use it to test bots and to measure the overhead of the
+    engine without a browser.
+
+    Every call is a command of execute(), which sleeps the simulated latency and counts the round-trips, so the
+    ScrapingDriverProfiler sees the same commands as with a real driver. Clicking a link navigates to its href, other
+    scripts than the ones of ScrapingLogic return None unless a handler is registered with add_script(). The page
+    doesn't change by itself, so the waits of ScrapingLogic check their condition once and don't wait.
+
+    Elements that were found with an XPATH selector are copies of the page elements.
+    """
+    def __init__(self, fixtures=None, latency: float = 0.0, page_load_latency: float = 0.0,
+                 start_url: str = "about:blank"):
+        """
+        Constructor for ScrapingFakeDriver
+
+        :param fixtures: a dict url -> HTML, or a function that gets the url and returns the HTML or None
+        :param latency: the seconds every round-trip takes
+        :param page_load_latency: the additional seconds a navigation takes
+        :param start_url: the url of the first page
+        """
+        self._fixtures = fixtures if fixtures is not None else {}
+        self.latency = latency
+        self.page_load_latency = page_load_latency
+        self.round_trips = 0
+        self.commands = collections.Counter()
+        self._scripts = {}
+        self.add_script(SNAPSHOT_SCRIPT, self._snapshot_script)
+        self.add_script(TABLES_SCRIPT, self._tables_script)
+        self.add_script("return document.readyState", lambda *args: "complete")
+        self.add_script("window._incomplete_data = true", self._set_reload_marker)
+        # the page doesn't change by itself, so the conditions of the waits are checked once
+        self.add_script(WAIT_READY_STATE_SCRIPT, lambda *args: True)
+        self.add_script(WAIT_NETWORK_IDLE_SCRIPT, lambda *args: True)
+        self.add_script(WAIT_DOM_QUIET_SCRIPT, lambda *args: True)
+        self.add_script(WAIT_RELOAD_SCRIPT, lambda *args: not self._reload_marker)
+        self.add_script(WAIT_ELEMENT_SCRIPT, self._wait_element_script)
+        self.add_script(WAIT_ELEMENT_GONE_SCRIPT, self._wait_element_gone_script)
+        self.add_script(WAIT_TEXT_CHANGE_SCRIPT, self._wait_text_change_script)
+        self._history = []
+        self._load(start_url)
+
+    @classmethod
+    def from_directory(cls, path: str, base_url: str = "https://fixtures.local/", **kwargs):
+        """
+        A driver that serves the .html files of a directory, e.g. path/list/2.html as base_url + "list/2.html".
+        """
+        def fixture(url):
+            if not url.startswith(base_url):
+                return None
+            file_name = os.path.join(path, url[len(base_url):].split("?")[0].split("#")[0] or "index.html")
+            if not os.path.isfile(file_name):
+                return None
+            with open(file_name, encoding="utf-8") as f:
+                return f.read()
+        return cls(fixture, start_url=base_url, **kwargs)
+
+    def add_script(self, script: str, handler):
+        """
+        Answer a script of execute_script() with a handler.
+
+        :param script: the script as it is passed to execute_script
+        :param handler: a function that gets the arguments of the script and returns the result
+        """
+        self._scripts[script.strip()] = handler
+
+    def reset_stats(self):
+        self.round_trips = 0
+        self.commands = collections.Counter()
+
+    def _fixture(self, url):
+        if callable(self._fixtures):
+            html = self._fixtures(url)
+        else:
+            html = self._fixtures.get(url)
+        return html if html is not None else NOT_FOUND
+
+    def _load(self, url):
+        self._reload_marker = False
+        self._url = url
+        self._html = self._fixture(url) if url != "about:blank" else "<html><head></head><body></body></html>"
+        self._soup = BeautifulSoup(self._html, "html.parser")
+        self._tree = None
+
+    def _select(self, by, value, tag=None):
+        if by == By.ID:
+            by, value = By.CSS_SELECTOR, "[id=\"" + value + "\"]"
+        elif by == By.NAME:
+            by, value = By.CSS_SELECTOR, "[name=\"" + value + "\"]"
+        elif by == By.CLASS_NAME:
+            by, value = By.CSS_SELECTOR, "." + value
+        elif by == By.TAG_NAME:
+            by, value = By.CSS_SELECTOR, value
+        if by == By.XPATH:
+            if lxml is None:
+                raise ImportError("XPATH selectors of the fake driver need lxml")
+            html = str(tag) if tag is not None else self._html
+            tree = lxml.html.fromstring(html)
+            result = tree.xpath(value)
+            if not isinstance(result, list):
+                return []
+            return [BeautifulSoup(lxml.html.tostring(e, encoding="unicode", with_tail=False), "html.parser").find()
+                    for e in result if isinstance(e.tag, str)]
+        if by == By.LINK_TEXT:
+            return [a for a in (tag or self._soup).find_all("a") if _text(a).strip() == value]
+        if by == By.PARTIAL_LINK_TEXT:
+            return [a for a in (tag or self._soup).find_all("a") if value in _text(a)]
+        return (tag or self._soup).select(value)
+
+    def _find(self, params, tag=None, all=False):
+        tags = self._select(params["using"], params["value"], tag)
+        if all:
+            return [ScrapingFakeElement(self, t) for t in tags]
+        if len(tags) == 0:
+            raise NoSuchElementException("Unable to locate element: " + str(params["value"]))
+        return ScrapingFakeElement(self, tags[0])
+
+    def _snapshot_script(self, selector, is_xpath, names, all, context=None):
+        tag = context._tag if context is not None else None
+        tags = self._select(By.XPATH if is_xpath else By.CSS_SELECTOR, selector, tag)
+        if not all:
+            tags = tags[:1]
+        return [{
+            "text": _text(t),
+            "value": t.get("value"),
+            "attributes": {n: _attribute(t, n) for n in names},
+            "visible": _visible(t),
+            "rect": {"x": 0, "y": 0, "width": 0, "height": 0}
+        } for t in tags]
+
+    def _set_reload_marker(self):
+        self._reload_marker = True
+
+    def _wait_select(self, selector, is_xpath, context):
+        return self._select(By.XPATH if is_xpath else By.CSS_SELECTOR, selector,
+                            context._tag if context is not None else None)
+
+    def _wait_element_script(self, timeout, selector, is_xpath, state, context=None):
+        tags = self._wait_select(selector, is_xpath, context)
+        if len(tags) == 0:
+            return False
+        if state == "present":
+            return True
+        return _visible(tags[0]) and (state == "visible" or tags[0].get("disabled") is None)
+
+    def _wait_element_gone_script(self, timeout, selector, is_xpath, hidden, context=None):
+        tags = self._wait_select(selector, is_xpath, context)
+        return len(tags) == 0 or (hidden and not _visible(tags[0]))
+
+    def _wait_text_change_script(self, timeout, selector, is_xpath, old, context=None):
+        tags = self._wait_select(selector, is_xpath, context)
+        return old is not None and len(tags) > 0 and _text(tags[0]) != old
+
+    def _tables_script(self, selector, is_xpath, tables):
+        if tables is None:
+            tables = self._select(By.XPATH if is_xpath else By.CSS_SELECTOR, selector)
+        else:
+            tables = [t._tag for t in tables]
+        return [_table_grid(t) for t in tables]
+
+    def _click(self, element):
+        tag = element._tag
+        a = tag if tag.name == "a" else tag.find_parent("a")
+        if a is not None and a.get("href"):
+            self._navigate(urljoin(self._url, a["href"]))
+
+    def _navigate(self, url):
+        if self.page_load_latency > 0:
+            time.sleep(self.page_load_latency)
+        self._history.append(self._url)
+        self._load(url)
+
+    def execute(self, driver_command: str, params: dict = None):
+        """
+        Run a command like the command executor of a remote driver.
+        """
+        self.round_trips += 1
+        self.commands[driver_command] += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+        params = params if params is not None else {}
+        element = params.get("id")
+        if driver_command == Command.GET:
+            self._navigate(params["url"])
+        elif driver_command == Command.GET_CURRENT_URL:
+            return self._url
+        elif driver_command == Command.GET_TITLE:
+            title = self._soup.find("title")
+            return _text(title) if title is not None else ""
+        elif driver_command == Command.GET_PAGE_SOURCE:
+            return self._html
+        elif driver_command == Command.FIND_ELEMENT:
+            return self._find(params)
+        elif driver_command == Command.FIND_ELEMENTS:
+            return self._find(params, all=True)
+        elif driver_command == Command.FIND_CHILD_ELEMENT:
+            return self._find(params, element._tag)
+        elif driver_command == Command.FIND_CHILD_ELEMENTS:
+            return self._find(params, element._tag, all=True)
+        elif driver_command in (Command.W3C_EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC):
+            handler = self._scripts.get(params["script"].strip())
+            return handler(*params["args"]) if handler is not None else None
+        elif driver_command == Command.GET_ELEMENT_TEXT:
+            return _text(element._tag).strip()
+        elif driver_command == Command.GET_ELEMENT_TAG_NAME:
+            return element._tag.name
+        elif driver_command in (Command.GET_ELEMENT_ATTRIBUTE, Command.GET_ELEMENT_PROPERTY):
+            return _attribute(element._tag, params["name"])
+        elif driver_command == IS_ELEMENT_DISPLAYED:
+            return _visible(element._tag)
+        elif driver_command == Command.IS_ELEMENT_ENABLED:
+            return element._tag.get("disabled") is None
+        elif driver_command == Command.CLICK_ELEMENT:
+            self._click(element)
+        elif driver_command == Command.SEND_KEYS_TO_ELEMENT:
+            element._tag["value"] = (element._tag.get("value") or "") + params["text"]
+        elif driver_command == Command.CLEAR_ELEMENT:
+            element._tag["value"] = ""
+        elif driver_command == Command.GO_BACK:
+            if len(self._history) > 0:
+                self._load(self._history.pop())
+        elif driver_command == Command.REFRESH:
+            self._load(self._url)
+        elif driver_command == Command.SCREENSHOT:
+            return base64.b64encode(_PNG).decode("ascii")
+        return None
+
+    def get(self, url):
+        self.execute(Command.GET, {"url": url})
+
+    @property
+    def current_url(self):
+        return self.execute(Command.GET_CURRENT_URL)
+
+    @property
+    def title(self):
+        return self.execute(Command.GET_TITLE)
+
+    @property
+    def page_source(self):
+        return self.execute(Command.GET_PAGE_SOURCE)
+
+    def find_element(self, by=By.ID, value=None):
+        return self.execute(Command.FIND_ELEMENT, {"using": by, "value": value})
+
+    def find_elements(self, by=By.ID, value=None):
+        return self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value})
+
+    def execute_script(self, script, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT, {"script": script, "args": list(args)})
+
+    def execute_async_script(self, script, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT_ASYNC, {"script": script, "args": list(args)})
+
+    def set_script_timeout(self, time_to_wait):
+        self.execute(Command.SET_TIMEOUTS, {"script": int(float(time_to_wait) * 1000)})
+
+    def back(self):
+        self.execute(Command.GO_BACK)
+
+    def refresh(self):
+        self.execute(Command.REFRESH)
+
+    def get_screenshot_as_base64(self):
+        return self.execute(Command.SCREENSHOT)
+
+    def get_screenshot_as_png(self):
+        return base64.b64decode(self.get_screenshot_as_base64())
+
+    def save_screenshot(self, filename):
+        with open(filename, "wb") as f:
+            f.write(self.get_screenshot_as_png())
+        return True
+
+    def quit(self):
+        self.execute(Command.QUIT)
@@ -0,0 +1,73 @@
+import pickle
+import sqlite3
+import threading
+import time
+
+
+class ScrapingFingerprintIndex:
+    """
+    A persistent index of page fingerprints for incremental recrawls. For every page of a pagination step it stores
+    the fingerprint of the page content and the data the page produced. When a page has the same fingerprint in the
+    next run, the step reuses the stored data instead of scraping the page again.
+
+    The index is a SQLite database, the stored data is pickled. Only open index files that you created yourself.
+    """
+    def __init__(self, path: str):
+        """
+        :param path: the path of the SQLite database
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS fingerprints (scope TEXT, page INTEGER, "
+                                 "fingerprint TEXT, result BLOB, updated REAL, PRIMARY KEY (scope, page))")
+        self._connection.commit()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, scope: str, page: int, fingerprint: str):
+        """
+        :param scope: the name of the pagination, usually the name of the step
+        :param page: the page number
+        :param fingerprint: the fingerprint of the current page content
+        :return: a tuple (hit, result). hit is True if the page has the same fingerprint as in the index, result is
+            the stored result of the page then.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT fingerprint, result FROM fingerprints WHERE scope = ? AND page = ?",
+                                           (scope, page)).fetchone()
+            if row is None or row[0] != fingerprint:
+                self._misses += 1
+                return False, None
+            self._hits += 1
+            return True, pickle.loads(row[1])
+
+    def put(self, scope: str, page: int, fingerprint: str, result):
+        """
+        Store the fingerprint and the result of a page.
+
+        :param result: a picklable value
+        """
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?)",
+                                     (scope, page, fingerprint, blob, time.time()))
+            self._connection.commit()
+
+    def clear(self, scope: str = None):
+        """
+        Remove the pages of a scope or of all scopes, so they are scraped again.
+        """
+        with self._lock:
+            if scope is None:
+                self._connection.execute("DELETE FROM fingerprints")
+            else:
+                self._connection.execute("DELETE FROM fingerprints WHERE scope = ?", (scope,))
+            self._connection.commit()
+
+    def stats(self) -> dict:
+        return {"hits": self._hits, "misses": self._misses}
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -1,16 +1,185 @@
+import hashlib
 import time
+from io import StringIO
 
 import pandas as pd
 from selenium.webdriver import Keys
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 
+from pyselenscrapr.ScrapingDataStore import ScrapingDataStore
+from pyselenscrapr.ScrapingDomSnapshot import ScrapingDomSnapshot, ScrapingSnapshotElement
+from pyselenscrapr.ScrapingDriverProfiler import profile_helpers, profiled_call, profiling
+from pyselenscrapr.ScrapingElementCache import MUTATING_COMMANDS, compile_selector
+from pyselenscrapr.ScrapingWaits import WAIT_DOM_QUIET_SCRIPT, WAIT_ELEMENT_GONE_SCRIPT, WAIT_ELEMENT_SCRIPT, \
+    WAIT_NETWORK_IDLE_SCRIPT, WAIT_READY_STATE_SCRIPT, WAIT_RELOAD_SCRIPT, WAIT_TEXT_CHANGE_SCRIPT, is_unload_error, \
+    wait_async
+
+
+# Resolves a CSS or XPATH selector and reads everything the helpers need from the matches in one round-trip.
+# arguments: selector, is xpath, attribute names, all matches, context element or null
+SNAPSHOT_SCRIPT = """
+var selector = arguments[0], isXPath = arguments[1], names = arguments[2], all = arguments[3];
+var root = arguments[4] || document;
+var elements = [];
+if (isXPath) {
+    var r = document.evaluate(selector, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var i = 0; i < r.snapshotLength && (all || elements.length < 1); i++) {
+        elements.push(r.snapshotItem(i));
+    }
+} else if (all) {
+    elements = Array.prototype.slice.call(root.querySelectorAll(selector));
+} else {
+    var e = root.querySelector(selector);
+    if (e) { elements.push(e); }
+}
+return elements.map(function (e) {
+    var attributes = {};
+    for (var i = 0; i < names.length; i++) {
+        var v = e[names[i]];
+        if (v === undefined || v === null || typeof v === "object" || typeof v === "function") {
+            v = e.getAttribute ? e.getAttribute(names[i]) : null;
+        }
+        attributes[names[i]] = (v === undefined || v === null) ? null : String(v);
+    }
+    var rect = e.getBoundingClientRect ? e.getBoundingClientRect() : {x: 0, y: 0, width: 0, height: 0};
+    var style = e.nodeType === 1 ? window.getComputedStyle(e) : null;
+    var visible = !!(e.offsetWidth || e.offsetHeight || (e.getClientRects && e.getClientRects().length)) &&
+        style !== null && style.visibility !== "hidden" && style.display !== "none";
+    return {
+        "text": e.innerText !== undefined ? e.innerText : e.textContent,
+        "value": e.value !== undefined && e.value !== null ? String(e.value) : null,
+        "attributes": attributes,
+        "visible": visible,
+        "rect": {"x": rect.x, "y": rect.y, "width": rect.width, "height": rect.height}
+    };
+});
+"""
+
+# Reads the cell grids of tables in one round-trip. Cells with rowspan or colspan are copied into every cell they
+# cover. arguments: selector or null, is xpath, list of table elements or null
+TABLES_SCRIPT = """
+var selector = arguments[0], isXPath = arguments[1], tables = arguments[2];
+if (!tables) {
+    tables = [];
+    if (isXPath) {
+        var r = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < r.snapshotLength; i++) { tables.push(r.snapshotItem(i)); }
+    } else {
+        tables = Array.prototype.slice.call(document.querySelectorAll(selector));
+    }
+}
+return tables.map(function (table) {
+    var rows = table.rows || [], grid = [], headerRows = 0, headerDone = false, width = 0;
+    for (var r = 0; r < rows.length; r++) {
+        grid[r] = grid[r] || [];
+        var cells = rows[r].cells, c = 0, allTh = cells.length > 0;
+        for (var i = 0; i < cells.length; i++) {
+            var cell = cells[i];
+            if (cell.tagName !== "TH") { allTh = false; }
+            while (grid[r][c] !== undefined) { c++; }
+            var text = (cell.innerText !== undefined ? cell.innerText : cell.textContent).trim();
+            var rowSpan = Math.max(1, cell.rowSpan || 1), colSpan = Math.max(1, cell.colSpan || 1);
+            for (var dr = 0; dr < rowSpan && r + dr < rows.length; dr++) {
+                grid[r + dr] = grid[r + dr] || [];
+                for (var dc = 0; dc < colSpan; dc++) { grid[r + dr][c + dc] = text; }
+            }
+            c += colSpan;
+        }
+        var inHead = rows[r].parentNode && rows[r].parentNode.tagName === "THEAD";
+        if (!headerDone && (inHead || allTh)) { headerRows++; } else { headerDone = true; }
+    }
+    for (var r = 0; r < grid.length; r++) { width = Math.max(width, grid[r].length); }
+    for (var r = 0; r < grid.length; r++) {
+        for (var c = 0; c < width; c++) { if (grid[r][c] === undefined) { grid[r][c] = null; } }
+    }
+    return {"rows": grid, "header_rows": headerRows};
+});
+"""
+
+
+def _unique_columns(columns):
+    # duplicate column names get a suffix like in pd.read_html, e.g. "A", "A.1"
+    seen = {}
+    result = []
+    for c in columns:
+        if c in seen:
+            seen[c] += 1
+            result.append(str(c) + "." + str(seen[c]))
+        else:
+            seen[c] = 0
+            result.append(c)
+    return result
+
+
+def grid_to_df(rows, header_rows=0):
+    """
+    Build a DataFrame from the cell grid of a table. Columns that only contain numbers are converted like
+    pd.read_html does it.
+
+    :param rows: a list of rows, every row is a list of cell texts
+    :param header_rows: the number of rows at the top that are the header
+    :return: a pandas DataFrame
+    """
+    header = rows[:header_rows]
+    body = rows[header_rows:]
+    if len(header) == 0:
+        columns = None
+    elif len(header) == 1:
+        columns = _unique_columns(header[0])
+    else:
+        columns = pd.MultiIndex.from_tuples(list(zip(*header)))
+    width = len(rows[0]) if len(rows) > 0 else 0
+    df = pd.DataFrame(body, columns=columns if columns is not None else range(width))
+    df = df.replace({"": None})
+    columns = []
+    converted = False
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        if not column.isna().all():
+            try:
+                column = pd.to_numeric(column.str.replace(",", "", regex=False))
+                converted = True
+            except (ValueError, TypeError, AttributeError):
+                pass
+        columns.append(column)
+    if converted:
+        # the frame is built again by position, the names of the columns can repeat
+        names = df.columns
+        df = pd.concat(columns, axis=1)
+        df.columns = names
+    return df
+
+
+# the types of results that are wrapped into a ScrapingLogic, by type
+_wrapped_types = {}
+
+
+def _wraps(result) -> bool:
+    # only driver and element objects are wrapped, so strings, numbers and lists are returned as they are
+    cls = type(result)
+    wrapped = _wrapped_types.get(cls)
+    if wrapped is None:
+        wrapped = _wrapped_types[cls] = hasattr(cls, "find_element")
+    return wrapped
+
 
 def tocontainer(func, bot):
+    mutating = bot is not None and getattr(func, "__name__", None) in MUTATING_COMMANDS
+    helper = "driver." + str(getattr(func, "__name__", "?")) if profiling(bot) else None
+
     def wrapper(*args, **kwargs):
-        result = func(*args, **kwargs)
-        return ScrapingLogic(result, bot)
+        if helper is not None:
+            result = profiled_call(helper, func, *args, **kwargs)
+        else:
+            result = func(*args, **kwargs)
+        if mutating:
+            bot.element_cache().invalidate()
+        if _wraps(result):
+            return ScrapingLogic(result, bot)
+        return result
     return wrapper
 
 class ScrapingLogic(object):
@@ -18,8 +187,18 @@ class ScrapingLogic(object):
     ScraipingLogic is a class that is the main interface between the bot and the selenium driver.
     It contains a lot of helper functions that make it easier to interact with the driver.
 
-    You can use all driver functions and also the functions in this class.
+    You can use all driver functions and also the functions in this class. Driver functions that return an element or
+    a driver return it as a ScrapingLogic, all other results are returned as they are.
+
+    The bot passes the same logic to all steps that run on its driver, so a logic has no state of its own and
+    attributes can't be set on it. Keep the state of a run in the data of the bot with set_data() and get_data().
     """
+    __slots__ = ("_driver", "_bot", "_methods")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        profile_helpers(cls)
+
     def __init__(self, driver, bot):
         """
         Constructor for ScrapingLogic. Will be called from the bot.
@@ -29,19 +208,79 @@ class ScrapingLogic(object):
         """
         self._driver = driver
         self._bot = bot
+        # the wrapped driver functions by name, see __getattr__
+        self._methods = {}
 
     def __getitem__(self, item):
         result = self._driver[item]
-        if isinstance(result, type(self._driver)):
-            result = ScrapingLogic(result)
+        if _wraps(result):
+            result = ScrapingLogic(result, self._bot)
         return result
 
     def __getattr__(self, item):
+        method = self._methods.get(item)
+        if method is not None:
+            return method
         result = getattr(self._driver, item)
         if callable(result):
             result = tocontainer(result, self._bot)
+            # the function is only wrapped once per logic
+            self._methods[item] = result
+        elif item == "current_url":
+            cache = self._cache()
+            if cache is not None:
+                cache.check_url(result)
         return result
 
+    def _cache(self):
+        # only lookups on the driver of the bot are cached, not the ones inside of an element or a worker session
+        if self._bot is None or self._driver is not self._bot._driver:
+            return None
+        cache = self._bot.element_cache()
+        if not cache.enabled:
+            return None
+        return cache
+
+    def _dom(self) -> ScrapingDomSnapshot:
+        # the snapshot is stored in the element cache, so it is refreshed whenever the page state changes
+        cache = self._cache()
+        if cache is None or not self._bot._dom_snapshot:
+            return None
+        hit, dom = cache.get(("dom",))
+        if not hit:
+            dom = ScrapingDomSnapshot(self._driver.page_source)
+            cache.put(("dom",), dom)
+        return dom
+
+    def _invalidate_cache(self):
+        if self._bot is not None:
+            self._bot.element_cache().invalidate()
+
+    def _on_element(self, selector, action):
+        """
+        Run an action on the element of a selector. If the element is stale, it is looked up again once. The element
+        cache is cleared afterwards because the action can change the page.
+        """
+        if isinstance(selector, str):
+            e = self.get_best_element(selector)
+        else:
+            e = selector
+        if e is None:
+            return False
+        try:
+            action(e)
+        except StaleElementReferenceException:
+            self._invalidate_cache()
+            if not isinstance(selector, str):
+                raise
+            e = self.get_best_element(selector)
+            if e is None:
+                return False
+            action(e)
+        finally:
+            self._invalidate_cache()
+        return True
+
     def __repr__(self):
         return repr(self._driver)
 
@@ -51,7 +290,23 @@ class ScrapingLogic(object):
         :param seconds:  the amount of seconds to sleep
         :return:  None
         """
+        if self._bot is not None:
+            self._bot.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def pace(self, event, seconds):
+        """
+        Pause with the pacing policy of the bot.
+
+        :param event: the ScrapingPacingEvent that causes the pause
+        :param seconds: the default pause in seconds
+        :return: the seconds that were paused
+        """
+        if self._bot is not None:
+            return self._bot.pace(event, seconds, self)
         time.sleep(seconds)
+        return seconds
 
     def replace_input_text(self, selector, keys):
         """
@@ -112,27 +367,76 @@ class ScrapingLogic(object):
         :param keys: the keys that should be sent to the element
         :return: True if the operation was successful, False otherwise
         """
-        e = self.get_best_element(selector)
-
-        if e is not None:
-            e.send_keys(keys)
-            return True
-        return False
+        return self._on_element(selector, lambda e: e.send_keys(keys))
 
 
     def is_visible(self, selector):
-        e = self.get_best_element(selector)
-        if e is None:
+        snapshot = self.snapshot(selector)
+        if snapshot is None:
             return False
-        displayed = e.is_displayed()
-        return displayed
+        return snapshot["visible"]
+
+    def _script_driver(self):
+        if hasattr(self._driver, "execute_script"):
+            return self._driver, None
+        # the logic wraps a WebElement, so the selector is resolved inside of this element
+        return self._driver.parent, self._driver
+
+    def snapshot(self, selector, attributes=None, all=False):
+        """
+        Read an element in a single round-trip. The selector is resolved in the browser and the text, the value, the
+        listed attributes, the visibility and the bounding box of the match are returned together.
+
+        :param selector: CSS or XPATH selector
+        :param attributes: a list of attribute or property names that should be read, e.g. ["href", "innerHTML"]
+        :param all: if True all matches are returned, otherwise only the first one
+        :return: a dict with the keys text, value, attributes, visible and rect. None if nothing matches. If all is
+            True a list of these dicts.
+        """
+        # the values are read on every call and not kept in the element cache, the page can change them with
+        # javascript without a command of the bot
+        attributes = list(attributes) if attributes is not None else []
+        driver, context = self._script_driver()
+        by, selector = compile_selector(selector)
+        try:
+            result = driver.execute_script(SNAPSHOT_SCRIPT, selector, by == By.XPATH, attributes, all, context)
+        except Exception:
+            result = None
+        if result is None:
+            result = []
+        if all:
+            return result
+        if len(result) > 0:
+            return result[0]
+        return None
+
+    def fingerprint(self, selector, attribute="textContent"):
+        """
+        A hash of the content of all elements that match the selector, read in one round-trip. Use it to check if
+        the relevant part of a page changed.
+
+        :param selector: CSS or XPATH selector
+        :param attribute: the property that is hashed, e.g. "textContent", "innerText" or "innerHTML"
+        :return: the hex sha256 of the content, None if nothing matches
+        """
+        matches = self.snapshot(selector, [attribute], all=True)
+        if len(matches) == 0:
+            return None
+        content = "\x1f".join(m["attributes"][attribute] or "" for m in matches)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
     def set_data(self, key, value, send_to_backend=False):
         self._bot.set_data(key, value, send_to_backend=send_to_backend)
 
-    def take_screenshot(self, step):
+    def take_screenshot(self, step, driver=None):
+        """
+        Take a screenshot of the session of this logic, worker sessions don't screenshot the driver of the bot.
+
+        :param step: the step, used for the name of the screenshot
+        :param driver: the driver to screenshot, the driver of this logic if it is None
+        """
         try:
-            self._bot._take_screenshot(step)
+            self._bot._take_screenshot(step, driver if driver is not None else self._script_driver()[0])
         except Exception as e:
             pass
 
@@ -152,26 +456,50 @@ class ScrapingLogic(object):
         self._bot.backend_notify(message)
 
     def convert_table_to_df(self, t):
-        df = pd.read_html(t.get_attribute("outerHTML"))
+        df = pd.read_html(StringIO(t.get_attribute("outerHTML")))
         if len(df) > 0:
             df = df[0]
         return df
 
+    def extract_tables(self, selector="table", tables=None, concat=False):
+        """
+        Extract tables into DataFrames with a single round-trip. The cell grid of every table is read in the browser,
+        rowspan and colspan are resolved and the DataFrames are built directly from the grids, without parsing the
+        HTML again.
+
+        :param selector: CSS or XPATH selector of the tables, ignored if tables is given
+        :param tables: a list of table WebElements
+        :param concat: if True a single DataFrame of all tables is returned
+        :return: a list of DataFrames, or a single DataFrame if concat is True (None if there is no table)
+        """
+        by, selector = compile_selector(selector)
+        driver, context = self._script_driver()
+        grids = driver.execute_script(TABLES_SCRIPT, selector, by == By.XPATH,
+                                      list(tables) if tables is not None else None)
+        dfs = [grid_to_df(g["rows"], g["header_rows"]) for g in (grids or [])]
+        if concat:
+            if len(dfs) == 0:
+                return None
+            return pd.concat(dfs, ignore_index=True)
+        return dfs
+
     def get_number_of_content(self, selector):
 
         try:
-            e = self.get_best_element(selector)
-            if e is not None:
-                return int(e.get_attribute("innerText"))
+            snapshot = self.snapshot(selector, ["innerText"])
+            if snapshot is not None:
+                return int(snapshot["attributes"]["innerText"])
         except:
             pass
         return None
 
     def convert_tables_to_df(self, tables):
-        dfs = []
-        for table in tables:
-            df = self.convert_table_to_df(table)
-            dfs.append(df)
+        tables = list(tables)
+        if len(tables) > 0 and not any(isinstance(t, ScrapingSnapshotElement) for t in tables):
+            dfs = self.extract_tables(tables=tables)
+        else:
+            # elements of the DOM snapshot already have their HTML, so they are parsed locally
+            dfs = [self.convert_table_to_df(table) for table in tables]
         if len(dfs) <= 0:
             return None
         if len(dfs) == 1:
@@ -179,49 +507,158 @@ class ScrapingLogic(object):
         return dfs
 
     def get_all_elements(self, selector):
-        by = By.CSS_SELECTOR
-        if selector.startswith("//"):
-            by = By.XPATH
+        by, selector = compile_selector(selector)
+        dom = self._dom()
+        if dom is not None:
+            e = dom.elements(self, by, selector)
+            if e is not None:
+                return e
+        cache = self._cache()
+        if cache is not None:
+            hit, e = cache.get(("elements", by, selector))
+            if hit:
+                return list(e)
         try:
             e = self._driver.find_elements(by, selector)
+            # empty results are not cached, so a check that waits for an element sees it as soon as it appears
+            if cache is not None and len(e) > 0:
+                cache.put(("elements", by, selector), list(e))
             return e
         except:
             pass
         return []
 
+    def _wait(self, script, timeout, *args):
+        # a timeout or a page that unloads ends the wait with False, errors of the script or the driver are raised
+        driver, context = self._script_driver()
+        try:
+            return wait_async(driver, script, timeout, *args)
+        except TimeoutException:
+            return False
+        except Exception as e:
+            if is_unload_error(e):
+                return False
+            raise
+        finally:
+            # the page can change while waiting
+            self._invalidate_cache()
+
+    def _wait_for_selector(self, script, selector, timeout, option):
+        by, selector = compile_selector(selector)
+        return self._wait(script, timeout, selector, by == By.XPATH, option, self._script_driver()[1])
+
     def wait_for_reload(self, timeout=40, min_wait=0.1):
-        was_incomplete = False
-        # set a windows javascript variable to true if the page is still loading
-        self._driver.execute_script("window._incomplete_data = true")
-        for i in range(int(timeout/min_wait)):
-            time.sleep(min_wait)
-            # check if the variable is still true
-            was_incomplete = self._driver.execute_script("return window._incomplete_data")
-            # if the page is not loading anymore, return
-            if not was_incomplete:
-                # when document readystate
-                if self._driver.execute_script("return document.readyState") == "complete":
-                    return True
-        return False
+        """
+        Wait until the page was reloaded and is complete. A marker is set on the current page, the wait is over when
+        the marker is gone and the new page is complete. Call it before the action that reloads the page.
+
+        :param timeout: the deadline in seconds
+        :param min_wait: the pause before the wait is started again on the new page
+        :return: True if the page was reloaded, False at the deadline
+        """
+        deadline = time.monotonic() + timeout
+        driver, context = self._script_driver()
+        driver.execute_script("window._incomplete_data = true")
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                return wait_async(driver, WAIT_RELOAD_SCRIPT, remaining)
+            except TimeoutException:
+                return False
+            except Exception as e:
+                if not is_unload_error(e):
+                    raise
+                # the page unloaded while the script was waiting, so the wait goes on on the new page
+                time.sleep(min(min_wait, remaining))
+            finally:
+                self._invalidate_cache()
+
+    def wait_for_ready_state(self, state="complete", timeout=20):
+        """
+        Wait until the document has a ready state, in a single round-trip.
+
+        :param state: "interactive" or "complete"
+        :param timeout: the deadline in seconds
+        :return: True if the document has the state, False at the deadline
+        """
+        return self._wait(WAIT_READY_STATE_SCRIPT, timeout, state)
+
+    def wait_for_element(self, selector, timeout=20, state="present"):
+        """
+        Wait until an element appears. The browser checks the selector on every change of the DOM and the wait
+        returns in a single round-trip as soon as the element is there.
+
+        :param selector: CSS or XPATH selector
+        :param timeout: the deadline in seconds
+        :param state: "present", "visible" or "clickable" (visible and not disabled)
+        :return: True if the element appeared, False at the deadline
+        """
+        return self._wait_for_selector(WAIT_ELEMENT_SCRIPT, selector, timeout, state)
+
+    def wait_for_element_gone(self, selector, timeout=20, hidden=False):
+        """
+        Wait until an element disappears, e.g. a loading indicator.
+
+        :param selector: CSS or XPATH selector
+        :param timeout: the deadline in seconds
+        :param hidden: if True an element that is hidden counts as gone
+        :return: True if the element is gone, False at the deadline
+        """
+        return self._wait_for_selector(WAIT_ELEMENT_GONE_SCRIPT, selector, timeout, hidden)
+
+    def wait_for_text_change(self, selector, text=None, timeout=20):
+        """
+        Wait until the text of an element changes.
+
+        :param selector: CSS or XPATH selector
+        :param text: the old text, None for the text of the element when the wait starts
+        :param timeout: the deadline in seconds
+        :return: True if the text changed, False at the deadline
+        """
+        return self._wait_for_selector(WAIT_TEXT_CHANGE_SCRIPT, selector, timeout, text)
+
+    def wait_for_network_idle(self, idle=0.5, timeout=30):
+        """
+        Wait until no fetch or XMLHttpRequest call of the page was pending for idle seconds. The requests are counted
+        from the first wait on a page, requests that started before are not known.
+
+        :param idle: the seconds without a pending request
+        :param timeout: the deadline in seconds
+        :return: True if the network is idle, False at the deadline
+        """
+        return self._wait(WAIT_NETWORK_IDLE_SCRIPT, timeout, int(idle * 1000))
+
+    def wait_for_dom_quiet(self, quiet=0.5, timeout=30):
+        """
+        Wait until the DOM did not change for quiet seconds, e.g. after the results of a search were rendered.
+
+        :param quiet: the seconds without a change of the DOM
+        :param timeout: the deadline in seconds
+        :return: True if the DOM is quiet, False at the deadline
+        """
+        return self._wait(WAIT_DOM_QUIET_SCRIPT, timeout, int(quiet * 1000))
 
     def get_best_element(self, selector):
-        by = By.CSS_SELECTOR
-        if selector.startswith("//"):
-            by = By.XPATH
+        by, selector = compile_selector(selector)
+        cache = self._cache()
+        if cache is not None:
+            hit, e = cache.get(("element", by, selector))
+            if hit:
+                return e
         try:
             e = self._driver.find_element(by, selector)
+            if cache is not None and e is not None:
+                cache.put(("element", by, selector), e)
             return e
         except:
             pass
         return None
 
     def element_count(self, selector):
-        by = By.CSS_SELECTOR
-        if selector.startswith("//"):
-            by = By.XPATH
         try:
-            e = self._driver.find_elements(by, selector)
-            return len(e)
+            return len(self.get_all_elements(selector))
         except:
             return 0
 
@@ -244,26 +681,23 @@ class ScrapingLogic(object):
                 if len(e) > len(longest):
                     longest = e
             return longest
-        by = By.CSS_SELECTOR
-        if selector.startswith("//"):
-            by = By.XPATH
-
-        e = self._driver.find_element(by, selector)
-        if e is not None:
+        attributes = ["data-value", "value", "innerHTML", "innerText", "textContent"]
+        dom = self._dom()
+        local = dom.elements(self, *compile_selector(selector)) if dom is not None else None
+        if local is not None:
+            if len(local) == 0:
+                return None
+            snapshot = {"text": local[0].text, "attributes": {a: local[0].get_attribute(a) for a in attributes}}
+        else:
+            snapshot = self.snapshot(selector, attributes)
+        if snapshot is not None:
             elements = []
 
-            if e.text is not None:
-                elements.append(e.text)
-            if e.get_attribute("data-value") is not None:
-                elements.append(e.get_attribute("data-value"))
-            if e.get_attribute("value") is not None:
-                elements.append(e.get_attribute("value"))
-            if e.get_attribute("innerHTML") is not None:
-                elements.append(e.get_attribute("innerHTML"))
-            if e.get_attribute("innerText") is not None:
-                elements.append(e.get_attribute("innerText"))
-            if e.get_attribute("textContent") is not None:
-                elements.append(e.get_attribute("textContent"))
+            if snapshot["text"] is not None:
+                elements.append(snapshot["text"])
+            for value in snapshot["attributes"].values():
+                if value is not None:
+                    elements.append(value)
             if len(elements) > 0:
                 return get_best_match(elements)
         return None
@@ -272,36 +706,41 @@ class ScrapingLogic(object):
         """
         Wait until an element is present. This function will wait until an element is present in the DOM.
 
-        :param selector:  CSS or XPATH selector
+        :param selector:  CSS or XPATH selector, a locator tuple of selenium or an element
         :param timeout: the timeout in seconds
         :return: True if the element is present, False otherwise
         """
         if isinstance(selector, str):
-            e = self.get_best_element(selector)
-        else:
-            e = selector
-        if e is not None:
+            return self.wait_for_element(selector, timeout)
+        if isinstance(selector, tuple):
+            # a locator of selenium, e.g. (By.ID, "name")
             try:
-                wait = WebDriverWait(self._driver, timeout)
-                wait.until(EC.presence_of_element_located(e))
+                WebDriverWait(self._driver, timeout).until(EC.presence_of_element_located(selector))
                 return True
-            except:
-                pass
-        return False
+            except TimeoutException:
+                return False
+        if selector is None:
+            return False
+        # an element is present as long as it is attached to the page
+        return not EC.staleness_of(selector)(None)
 
     def wait_until_clickable(self, selector, timeout=10):
+        """
+        Wait until an element is visible and enabled.
+
+        :param selector: CSS or XPATH selector, a locator tuple of selenium or an element
+        :param timeout: the timeout in seconds
+        :return: True if the element is clickable, False otherwise
+        """
         if isinstance(selector, str):
-            e = self.get_best_element(selector)
-        else:
-            e = selector
-        if e is not None:
+            return self.wait_for_element(selector, timeout, state="clickable")
+        if selector is not None:
             try:
                 wait = WebDriverWait(self._driver, timeout)
-                wait.until(EC.element_to_be_clickable(e))
+                wait.until(EC.element_to_be_clickable(selector))
                 return True
             except:
                 pass
-
         return False
 
     def element_exists(self, selector):
@@ -315,24 +754,10 @@ class ScrapingLogic(object):
         return False
 
     def set_attribute(self, selector, attribute, value):
-        if isinstance(selector, str):
-            e = self.get_best_element(selector)
-        else:
-            e = selector
-        if e is not None:
-            e.set_attribute(attribute, value)
-            return True
-        return False
+        return self._on_element(selector, lambda e: e.set_attribute(attribute, value))
 
     def scroll_to_element(self, selector):
-        if isinstance(selector, str):
-            e = self.get_best_element(selector)
-        else:
-            e = selector
-        if e is not None:
-            self._driver.execute_script("arguments[0].scrollIntoView();", e)
-            return True
-        return False
+        return self._on_element(selector, lambda e: self._driver.execute_script("arguments[0].scrollIntoView();", e))
 
     def click_on_element_by_xpath_with_jquery(self, xpath):
         self._driver.execute_script(
@@ -340,19 +765,15 @@ class ScrapingLogic(object):
             xpath)
 
     def inner_text_contains(self, selector, text):
-        b = self.get_best_element(selector)
-        if b is not None:
-            innerTExt = b.get_attribute("innerText")
+        snapshot = self.snapshot(selector, ["innerText"])
+        if snapshot is not None:
+            innerTExt = snapshot["attributes"]["innerText"]
             if innerTExt is not None:
                 return innerTExt.find(text) >= 0
         return False
 
     def click_on_best_element(self, selector):
-        e = self.get_best_element(selector)
-        if e is not None:
-            e.click()
-            return True
-        return False
+        return self._on_element(selector, lambda e: e.click())
 
     def click_by_jquery_on_node(self, parent_button):
         if isinstance(parent_button, str):
@@ -366,4 +787,56 @@ class ScrapingLogic(object):
         self._driver.execute_script(
             "window.scrollTo(arguments[0].getBoundingClientRect().left, arguments[0].getBoundingClientRect().top - (window.innerHeight/2) + document.documentElement.scrollTop);",
             object)
-        return True
\ No newline at end of file
+        return True
+
+
+profile_helpers(ScrapingLogic)
+
+
+class ScrapingLogicBuffered(ScrapingLogic):
+    """
+    A ScrapingLogic for a worker session that runs in parallel to others. The data that is set or appended is buffered
+    and written to the bot with merge_data(), so the sessions don't write the data of the bot at the same time and the
+    order of the data doesn't depend on which session finished first.
+    """
+    __slots__ = ("_data_operations", "_buffered_data")
+
+    def __init__(self, driver, bot):
+        super().__init__(driver, bot)
+        self._data_operations = []
+        self._buffered_data = {}
+
+    def set_data(self, key, value, send_to_backend=False):
+        self._data_operations.append((self._bot.set_data, key, value, send_to_backend))
+        # a set replaces the data of the bot and everything that was buffered before
+        self._buffered_data[key] = [(True, value)]
+
+    def append_data(self, key, value, send_to_backend=False):
+        self._data_operations.append((self._bot.append_data, key, value, send_to_backend))
+        self._buffered_data.setdefault(key, []).append((False, value))
+
+    def has_data(self, key):
+        return key in self._buffered_data or self._bot.has_data(key)
+
+    def get_data(self, key):
+        """
+        :return: the data of the key like the bot will have it after merge_data()
+        """
+        operations = self._buffered_data.get(key)
+        if operations is None:
+            return self._bot.get_data(key)
+        store = ScrapingDataStore()
+        current = self._bot.get_data(key) if not operations[0][0] else None
+        if current is not None:
+            store[key] = current
+        for is_set, value in operations:
+            if is_set:
+                store[key] = value
+            else:
+                store.append(key, value)
+        return store[key]
+
+    def merge_data(self):
+        for operation, key, value, send_to_backend in self._data_operations:
+            operation(key, value, send_to_backend=send_to_backend)
+        self._data_operations = []
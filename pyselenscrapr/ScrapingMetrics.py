@@ -0,0 +1,264 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# the upper bounds of the histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class ScrapingHistogram:
+    """
+    A histogram with fixed buckets. Observing a value is O(log buckets), quantiles are estimated from the buckets.
+    Every histogram has its own lock, so the sessions of parallel steps can observe at the same time.
+    """
+    __slots__ = ("buckets", "counts", "count", "sum", "min", "max", "_lock")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def quantile(self, q: float):
+        """
+        :param q: the quantile between 0 and 1, e.g. 0.95
+        :return: the estimated value of the quantile, None if nothing was observed
+        """
+        with self._lock:
+            return self._quantile(q)
+
+    def _quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c == 0:
+                continue
+            if seen + c >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                # linear interpolation inside of the bucket, limited by the observed values
+                value = lower + (upper - lower) * (rank - seen) / c
+                return min(max(value, self.min), self.max)
+            seen += c
+        return self.max
+
+    def snapshot(self):
+        """
+        :return: a tuple (counts, count, sum) that was read at once
+        """
+        with self._lock:
+            return list(self.counts), self.count, self.sum
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"count": self.count, "sum": self.sum, "min": self.min, "max": self.max,
+                    "p50": self._quantile(0.5), "p95": self._quantile(0.95), "p99": self._quantile(0.99)}
+
+
+class ScrapingStepMetrics:
+    """
+    The metrics of one step name: the times of the phases, the retries, the time the bot paused and the outcomes.
+    """
+    PHASES = ("wall", "execute", "can_execute", "was_executed")
+
+    def __init__(self):
+        self.times = {phase: ScrapingHistogram() for phase in self.PHASES}
+        self.retries = 0
+        self.sleep = 0.0
+        self.outcomes = {}
+
+    def to_dict(self) -> dict:
+        return {"times": {phase: h.to_dict() for phase, h in self.times.items()}, "retries": self.retries,
+                "sleep": self.sleep, "outcomes": dict(self.outcomes)}
+
+
+class ScrapingStepObservation:
+    """
+    The metrics of one run of a step. ScrapingBot and AsyncScrapingBot run a step in the same way with it: the phases
+    are timed with phase(), every attempt after the first counts as a retry and finish() records the wall time and the
+    outcome.
+    """
+    def __init__(self, metrics, name: str):
+        self._metrics = metrics
+        self.name = name
+        self.outcome = "failed"
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, phase: str):
+        # only phases that returned are observed, like a step that raised in execute has no execute time
+        started = time.perf_counter()
+        yield
+        self._metrics.observe_step(self.name, phase, time.perf_counter() - started)
+
+    def attempt(self, attempt: int):
+        if attempt > 0:
+            self._metrics.count_retry(self.name)
+
+    def finish(self):
+        self._metrics.observe_step(self.name, "wall", time.perf_counter() - self._started)
+        self._metrics.count_outcome(self.name, self.outcome)
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class ScrapingMetrics:
+    """
+    Collects the latency and retry metrics of a bot: per step the wall time, the time of execute, can_execute and
+    was_executed, the retries, the time the bot paused and the outcome, per group the wall time and the outcome and per
+    site and outcome of the page ("ok", "replayed" or "failed") the latency of the pages of pagination steps.
+
+    The metrics are available with to_dict(), to_json() and to_prometheus().
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._steps = {}
+        self._groups = {}
+        self._pages = {}
+
+    def step(self, name: str) -> ScrapingStepMetrics:
+        metrics = self._steps.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self._steps.setdefault(name, ScrapingStepMetrics())
+        return metrics
+
+    def observe_step(self, name: str, phase: str, seconds: float):
+        if self.enabled:
+            self.step(name).times[phase].observe(seconds)
+
+    def count_retry(self, name: str):
+        if self.enabled:
+            metrics = self.step(name)
+            with self._lock:
+                metrics.retries += 1
+
+    def count_sleep(self, name: str, seconds: float):
+        if self.enabled and seconds:
+            metrics = self.step(name)
+            with self._lock:
+                metrics.sleep += seconds
+
+    def count_outcome(self, name: str, outcome: str):
+        if self.enabled:
+            outcomes = self.step(name).outcomes
+            with self._lock:
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    def observe_group(self, name: str, seconds: float, outcome: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            group = self._groups.setdefault(name, {"wall": ScrapingHistogram(), "outcomes": {}})
+            group["outcomes"][outcome] = group["outcomes"].get(outcome, 0) + 1
+        group["wall"].observe(seconds)
+
+    def observe_page(self, site: str, seconds: float, outcome: str = "ok"):
+        """
+        :param site: the site of the page
+        :param seconds: the time from the navigation until the page was scraped or failed
+        :param outcome: "ok", "replayed" for a page that was taken from a fingerprint index or "failed"
+        """
+        if not self.enabled:
+            return
+        histogram = self._pages.get((site, outcome))
+        if histogram is None:
+            with self._lock:
+                histogram = self._pages.setdefault((site, outcome), ScrapingHistogram())
+        histogram.observe(seconds)
+
+    def page_latency(self, site: str = None, outcome: str = "ok") -> dict:
+        """
+        :param site: the site, None for all sites
+        :param outcome: the outcome of the pages, "ok", "replayed" or "failed"
+        :return: count, sum, min, max, p50, p95 and p99 of the page latency of a site, or a dict of them per site
+        """
+        if site is not None:
+            histogram = self._pages.get((site, outcome))
+            return histogram.to_dict() if histogram is not None else ScrapingHistogram().to_dict()
+        return {s: h.to_dict() for (s, o), h in list(self._pages.items()) if o == outcome}
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            steps = [(name, m.to_dict()) for name, m in list(self._steps.items())]
+            groups = [(name, g["wall"], dict(g["outcomes"])) for name, g in list(self._groups.items())]
+        pages = {}
+        for (site, outcome), histogram in list(self._pages.items()):
+            pages.setdefault(site, {})[outcome] = histogram.to_dict()
+        return {
+            "steps": dict(steps),
+            "groups": {name: {"wall": wall.to_dict(), "outcomes": outcomes} for name, wall, outcomes in groups},
+            "pages": pages
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def _prometheus_histogram(self, lines, name, labels, histogram):
+        counts, count, total = histogram.snapshot()
+        cumulative = 0
+        for bound, c in zip(list(histogram.buckets) + ["+Inf"], counts):
+            cumulative += c
+            lines.append(name + "_bucket{" + labels + ",le=\"" + str(bound) + "\"} " + str(cumulative))
+        lines.append(name + "_sum{" + labels + "} " + repr(total))
+        lines.append(name + "_count{" + labels + "} " + str(count))
+
+    def to_prometheus(self, prefix: str = "pyselenscrapr") -> str:
+        """
+        :return: the metrics in the Prometheus text format
+        """
+        lines = ["# TYPE " + prefix + "_step_seconds histogram"]
+        steps = list(self._steps.items())
+        for name, m in steps:
+            for phase, histogram in m.times.items():
+                if histogram.count > 0:
+                    self._prometheus_histogram(lines, prefix + "_step_seconds",
+                                               "step=\"" + _label(name) + "\",phase=\"" + phase + "\"", histogram)
+        lines.append("# TYPE " + prefix + "_step_retries_total counter")
+        for name, m in steps:
+            lines.append(prefix + "_step_retries_total{step=\"" + _label(name) + "\"} " + str(m.retries))
+        lines.append("# TYPE " + prefix + "_step_sleep_seconds_total counter")
+        for name, m in steps:
+            lines.append(prefix + "_step_sleep_seconds_total{step=\"" + _label(name) + "\"} " + repr(float(m.sleep)))
+        lines.append("# TYPE " + prefix + "_step_outcomes_total counter")
+        for name, m in steps:
+            for outcome, c in list(m.outcomes.items()):
+                lines.append(prefix + "_step_outcomes_total{step=\"" + _label(name) + "\",outcome=\"" + outcome +
+                             "\"} " + str(c))
+
+        groups = list(self._groups.items())
+        lines.append("# TYPE " + prefix + "_group_seconds histogram")
+        for name, g in groups:
+            self._prometheus_histogram(lines, prefix + "_group_seconds", "group=\"" + _label(name) + "\"", g["wall"])
+        lines.append("# TYPE " + prefix + "_group_outcomes_total counter")
+        for name, g in groups:
+            for outcome, c in list(g["outcomes"].items()):
+                lines.append(prefix + "_group_outcomes_total{group=\"" + _label(name) + "\",outcome=\"" + outcome +
+                             "\"} " + str(c))
+
+        lines.append("# TYPE " + prefix + "_page_seconds histogram")
+        for (site, outcome), histogram in list(self._pages.items()):
+            self._prometheus_histogram(lines, prefix + "_page_seconds",
+                                       "site=\"" + _label(site) + "\",outcome=\"" + outcome + "\"", histogram)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,240 @@
+import asyncio
+import inspect
+import random
+import time
+from abc import ABC
+from typing import Callable
+
+
+class ScrapingPacingEvent:
+    """
+    This enum names the places where the bot pauses. Every pause of the bot, the loop and the pagination step goes
+    through the pacing policy together with one of these events.
+    """
+    AfterStep = 0 # after a step was executed successfully
+    AfterFailedStep = 1 # after a step failed
+    AfterGroup = 2 # after all steps of a group were executed
+    AfterRun = 3 # at the end of the run
+    AfterLoopElement = 4 # after an iteration step of a loop was executed for one element
+    AfterNavigation = 5 # after the pagination navigated to a page
+    AfterPage = 6 # after a page of the pagination was scraped
+    BetweenPages = 7 # before the pagination goes to the next page
+    Retry = 8 # before a failed action is retried
+
+
+class ScrapingClock:
+    """
+    The default clock of the bot. It uses the monotonic system clock and really sleeps.
+    """
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def asleep(self, seconds: float):
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+
+class ScrapingVirtualClock(ScrapingClock):
+    """
+    A clock that never blocks. Sleeping only advances the virtual time, so a complete run can be executed in tests
+    without waiting.
+    """
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self.slept = 0.0
+
+    def now(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            self._now += seconds
+            self.slept += seconds
+
+    async def asleep(self, seconds: float):
+        self.sleep(seconds)
+        # still give other tasks the chance to run
+        await asyncio.sleep(0)
+
+    def advance(self, seconds: float):
+        self._now += seconds
+
+
+class IScrapingPacing(ABC):
+    """
+    This is a interface for the pacing policy of the bot. The policy decides how long the bot waits at a given event.
+    """
+    def pause(self, event: ScrapingPacingEvent, seconds: float, bot) -> float:
+        """
+        Pause the bot.
+
+        :param event: the event that causes the pause
+        :param seconds: the default pause of the call site in seconds
+        :param bot: the bot that pauses, its clock must be used for sleeping
+        :return: the seconds the bot paused
+        """
+        raise NotImplementedError
+
+    async def apause(self, event: ScrapingPacingEvent, seconds: float, bot) -> float:
+        """
+        Pause an AsyncScrapingBot without blocking the event loop. The default implementation runs pause() in the
+        executor of the bot.
+        """
+        return await bot.run_sync(self.pause, event, seconds, bot)
+
+
+class ScrapingPacingFixed(IScrapingPacing):
+    """
+    Sleep a fixed time. Without arguments the default pause of each call site is used, which is the classic
+    behaviour of the bot.
+    """
+    def __init__(self, seconds: float = None, events: dict = None):
+        """
+        :param seconds: the pause for all events, None to use the default of the call site
+        :param events: a dict of ScrapingPacingEvent -> seconds that overrides the pause for single events
+        """
+        self._seconds = seconds
+        self._events = events if events is not None else {}
+
+    def _duration(self, event, seconds):
+        if event in self._events:
+            return self._events[event]
+        if self._seconds is not None:
+            return self._seconds
+        return seconds
+
+    def pause(self, event, seconds, bot):
+        seconds = self._duration(event, seconds)
+        bot.clock().sleep(seconds)
+        return seconds
+
+    async def apause(self, event, seconds, bot):
+        seconds = self._duration(event, seconds)
+        await bot.clock().asleep(seconds)
+        return seconds
+
+
+class ScrapingPacingNone(IScrapingPacing):
+    """
+    Never pause.
+    """
+    def pause(self, event, seconds, bot):
+        return 0
+
+    async def apause(self, event, seconds, bot):
+        return 0
+
+
+class ScrapingPacingJitter(IScrapingPacing):
+    """
+    Sleep a random time. If min_seconds and max_seconds are given the pause is drawn uniformly from this range,
+    otherwise the default pause of the call site is scaled by a random factor between 1-factor and 1+factor.
+    """
+    def __init__(self, min_seconds: float = None, max_seconds: float = None, factor: float = 0.5, seed=None):
+        self._min_seconds = min_seconds
+        self._max_seconds = max_seconds
+        self._factor = factor
+        self._random = random.Random(seed)
+
+    def _duration(self, seconds):
+        if self._min_seconds is not None and self._max_seconds is not None:
+            return self._random.uniform(self._min_seconds, self._max_seconds)
+        return seconds * self._random.uniform(max(0, 1 - self._factor), 1 + self._factor)
+
+    def pause(self, event, seconds, bot):
+        seconds = self._duration(seconds)
+        bot.clock().sleep(seconds)
+        return seconds
+
+    async def apause(self, event, seconds, bot):
+        seconds = self._duration(seconds)
+        await bot.clock().asleep(seconds)
+        return seconds
+
+
+class ScrapingPacingCondition(IScrapingPacing):
+    """
+    Wait until a condition holds, but never longer than max_wait seconds. The condition is checked every
+    poll_interval seconds and gets a ScrapingLogic like the callbacks of a step, on the session that pauses, e.g. the
+    driver of a worker in parallel chains or pages. Exceptions in the condition count as "not yet".
+    """
+    def __init__(self, condition: Callable[["ScrapingLogic"], bool], max_wait: float = 10,
+                 poll_interval: float = 0.1, events: list = None):
+        """
+        :param condition: a function that returns True when the bot can continue
+        :param max_wait: the maximum time in seconds to wait for the condition
+        :param poll_interval: the time in seconds between two checks of the condition
+        :param events: the events where the condition is used, None for all events. All other events don't pause.
+        """
+        self._condition = condition
+        self._max_wait = max_wait
+        self._poll_interval = poll_interval
+        self._events = events
+
+    def _holds(self, bot):
+        # the page can change while waiting, so every check has to look at the page again
+        bot.element_cache().invalidate()
+        try:
+            return bool(self._condition(bot._pacing_logic()))
+        except Exception:
+            return False
+
+    def pause(self, event, seconds, bot):
+        if self._events is not None and event not in self._events:
+            return 0
+        clock = bot.clock()
+        start = clock.now()
+        deadline = start + self._max_wait
+        while not self._holds(bot):
+            remaining = deadline - clock.now()
+            if remaining <= 0:
+                break
+            clock.sleep(min(self._poll_interval, remaining))
+        return clock.now() - start
+
+    async def _aholds(self, bot):
+        from pyselenscrapr.AsyncScrapingLogic import AsyncScrapingLogic
+        bot.element_cache().invalidate()
+        try:
+            result = self._condition(AsyncScrapingLogic(bot._driver, bot))
+            if inspect.isawaitable(result):
+                result = await result
+            return bool(result)
+        except Exception:
+            return False
+
+    async def apause(self, event, seconds, bot):
+        if self._events is not None and event not in self._events:
+            return 0
+        clock = bot.clock()
+        start = clock.now()
+        deadline = start + self._max_wait
+        while not await self._aholds(bot):
+            remaining = deadline - clock.now()
+            if remaining <= 0:
+                break
+            await clock.asleep(min(self._poll_interval, remaining))
+        return clock.now() - start
+
+
+class ScrapingPacingPerEvent(IScrapingPacing):
+    """
+    Use a different policy for different events.
+    """
+    def __init__(self, policies: dict, default: IScrapingPacing = None):
+        """
+        :param policies: a dict of ScrapingPacingEvent -> IScrapingPacing
+        :param default: the policy for all other events, None to use ScrapingPacingFixed()
+        """
+        self._policies = policies
+        self._default = default if default is not None else ScrapingPacingFixed()
+
+    def pause(self, event, seconds, bot):
+        return self._policies.get(event, self._default).pause(event, seconds, bot)
+
+    async def apause(self, event, seconds, bot):
+        return await self._policies.get(event, self._default).apause(event, seconds, bot)
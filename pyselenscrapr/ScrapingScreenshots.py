@@ -0,0 +1,172 @@
+import base64
+import collections
+import hashlib
+import io
+import logging as log
+import os
+import queue
+import re
+import threading
+import time
+
+
+def _safe_name(name) -> str:
+    name = re.sub(r"[^0-9A-Za-z_.-]+", "_", str(name)).strip("_")
+    return name if name != "" else "screenshot"
+
+
+class ScrapingScreenshotFrame:
+    """
+    A screenshot that was grabbed from the driver as base64 PNG.
+    """
+    def __init__(self, name: str, data: str, digest: str):
+        self.name = name
+        self.data = data
+        self.digest = digest
+        self.time = time.time()
+
+
+class ScrapingScreenshotWriter:
+    """
+    Takes the screenshots of a bot. The bot only grabs the screenshot as base64 from the driver, decoding, the optional
+    recompression and the disk write happen in a background thread.
+
+    Every file gets a sequence number, so screenshots of repeated steps don't overwrite each other. Frames that are
+    identical to an already written frame are not written again.
+
+    In the error context mode (TakeScreenshotModes.ErrorContext) the last ring_size frames are kept in memory and only
+    written when an error occurs.
+    """
+    def __init__(self, path: str = ".", background: bool = True, dedupe: bool = True, ring_size: int = 10,
+                 recompress_format: str = None, quality: int = 80, queue_size: int = 100):
+        """
+        Constructor for ScrapingScreenshotWriter
+
+        :param path: the directory of the screenshots
+        :param background: write the screenshots in a background thread
+        :param dedupe: don't write frames that are identical to a written frame
+        :param ring_size: the number of frames that are kept in memory in the error context mode
+        :param recompress_format: a Pillow image format like "JPEG" or "WEBP" to recompress the PNG, needs Pillow
+        :param quality: the quality of the recompression
+        :param queue_size: the maximum number of frames waiting for the background thread
+        """
+        if recompress_format is not None:
+            try:
+                import PIL.Image
+            except ImportError:
+                raise ImportError("Recompressing screenshots needs Pillow, install it with: pip install Pillow")
+        self._path = path
+        self._background = background
+        self._dedupe = dedupe
+        self._recompress_format = recompress_format
+        self._quality = quality
+        self._ring = collections.deque(maxlen=ring_size)
+        self._written = set()
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+
+    def path(self) -> str:
+        return self._path
+
+    def set_path(self, path: str):
+        self._path = path
+
+    def _grab(self, driver, name):
+        data = driver.get_screenshot_as_base64()
+        return ScrapingScreenshotFrame(name, data, hashlib.sha1(data.encode("ascii")).hexdigest())
+
+    def capture(self, driver, name: str, force: bool = False):
+        """
+        Grab a screenshot and write it.
+
+        :param driver: the selenium driver
+        :param name: the name of the screenshot, e.g. group_step
+        :param force: write it also if it is identical to a written frame, e.g. the screenshot of an error
+        """
+        self._write(self._grab(driver, name), force)
+
+    def record(self, driver, name: str):
+        """
+        Grab a screenshot into the ring of the error context mode, it is only written by flush_context().
+        """
+        frame = self._grab(driver, name)
+        with self._lock:
+            if self._dedupe and len(self._ring) > 0 and self._ring[-1].digest == frame.digest:
+                # the page didn't change, the newer name is kept for the frame
+                self._ring[-1] = frame
+            else:
+                self._ring.append(frame)
+
+    def flush_context(self):
+        """
+        Write the frames of the ring, the oldest first.
+        """
+        with self._lock:
+            frames = list(self._ring)
+            self._ring.clear()
+        for frame in frames:
+            self._write(frame)
+
+    def _write(self, frame, force=False):
+        with self._lock:
+            if self._dedupe and not force:
+                if frame.digest in self._written:
+                    return
+                self._written.add(frame.digest)
+            self._sequence += 1
+            file_name = os.path.join(self._path, "%06d_%s" % (self._sequence, _safe_name(frame.name)))
+        if not self._background:
+            self._save(file_name, frame)
+            return
+        self._start()
+        self._queue.put((file_name, frame))
+
+    def _save(self, file_name, frame):
+        data = base64.b64decode(frame.data)
+        extension = ".png"
+        if self._recompress_format is not None:
+            import PIL.Image
+            image = PIL.Image.open(io.BytesIO(data))
+            if self._recompress_format.upper() == "JPEG":
+                image = image.convert("RGB")
+            out = io.BytesIO()
+            image.save(out, format=self._recompress_format, quality=self._quality)
+            data = out.getvalue()
+            extension = "." + self._recompress_format.lower().replace("jpeg", "jpg")
+        os.makedirs(self._path, exist_ok=True)
+        with open(file_name + extension, "wb") as f:
+            f.write(data)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run_writer, name="ScrapingScreenshotWriter", daemon=True)
+                self._thread.start()
+
+    def _run_writer(self):
+        while True:
+            file_name, frame = self._queue.get()
+            try:
+                if frame is None:
+                    return
+                self._save(file_name, frame)
+            except Exception as e:
+                log.warning(e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """
+        Wait until all screenshots are written.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        self.flush()
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put((None, None))
+            self._thread.join()
+        self._thread = None
@@ -39,6 +39,7 @@ class ScrapingStep(IScrapingStep):
     robot = None
     _repeat = ScrapingStepRepeat.NoRepeat
     _error_handling = ScrapingStepErrorHandling.RetryAndThrowException
+    _scheduler = None
 
     def __init__(self, name: str,
                  execute: Callable[[ScrapingLogic], None],
@@ -68,6 +69,7 @@ class ScrapingStep(IScrapingStep):
         :param retry_count: an integer representing the number of retries
         """
         self._name = name
+        self.childGroups = []
         self._error_handling = error_handling
         self._repeat = repeat
         self.can_execute = can_execute
@@ -103,7 +105,10 @@ class ScrapingStep(IScrapingStep):
         raise Exception(message)
 
     def set_previous_step(self, step):
+        old_previous = self._previous_step
         self._previous_step = step
+        if self._scheduler is not None:
+            self._scheduler.dependency_changed(self, old_previous)
 
     def add_child_group(self, group):
         self.childGroups.append(group)
@@ -123,12 +128,34 @@ class ScrapingStep(IScrapingStep):
 
     def set_executed(self):
         self._hasExecuted = True
+        if self._scheduler is not None:
+            self._scheduler.step_changed(self)
 
     def before_validation(self):
         pass
 
     def reset(self):
         self._hasExecuted = False
+        if self._scheduler is not None:
+            self._scheduler.step_changed(self)
+
+    def checkpoint_state(self):
+        """
+        The progress of the step that is saved in a checkpoint while the step is running.
+
+        :return: a picklable value or None if the step has no progress to save
+        """
+        return None
+
+    def restore_state(self, state):
+        """
+        Restore the progress of checkpoint_state(), the step continues from it on its next execution.
+        """
+        pass
+
+    def save_checkpoint(self):
+        if self.robot is not None:
+            self.robot.save_checkpoint()
 
     def log(self, message):
         if self.robot is not None:
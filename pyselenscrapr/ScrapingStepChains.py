@@ -0,0 +1,153 @@
+import logging as log
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pyselenscrapr.ScrapingLogic import ScrapingLogicBuffered
+from pyselenscrapr.ScrapingPacing import ScrapingPacingEvent
+from pyselenscrapr.ScrapingStep import ScrapingStepInterval, ScrapingStepErrorHandling
+
+
+def find_independent_chains(group) -> list:
+    """
+    Split the Order steps of a group that were not executed into independent chains. Two steps are in the same chain
+    if one of them is the previous_step of the other, directly or through other steps of the group.
+
+    :param group: the ScrapingStepGroup
+    :return: a list of chains, every chain is a list of steps in the order of the group
+    """
+    steps = [s for s in group._steps if s.interval() == ScrapingStepInterval.Order and not s.was_executed()]
+    parents = {step: step for step in steps}
+
+    def root(step):
+        while parents[step] is not step:
+            parents[step] = parents[parents[step]]
+            step = parents[step]
+        return step
+
+    for step in steps:
+        previous = step.previous_step()
+        if previous is not None and previous in parents:
+            parents[root(step)] = root(previous)
+
+    chains = {}
+    for step in steps:
+        chains.setdefault(root(step), []).append(step)
+    return list(chains.values())
+
+
+class ScrapingChainRunner:
+    """
+    Runs the independent chains of a group at the same time. Every chain runs in its own thread on its own driver
+    session: the first one on the driver of the bot, the others on sessions of the driver_factory of the bot. The
+    data of a chain is buffered and merged into the bot in the order of the chains when all chains are finished.
+
+    The steps of a chain are run like the steps of a group: the BeforeAnyStep and AfterAnyStep steps run around
+    every step, failed steps are retried and exit_bot_when_errored stops all chains.
+    """
+    def __init__(self, bot, group, chains: list):
+        self._bot = bot
+        self._group = group
+        self._chains = chains
+        self._stop = threading.Event()
+        self._interval_lock = threading.Lock()
+
+    def _next_step(self, chain):
+        for step in chain:
+            if step.was_executed():
+                continue
+            previous = step.previous_step()
+            if previous is None or previous.was_executed():
+                return step
+        return None
+
+    def _run_interval_steps(self, interval, logic_factory):
+        # the interval steps are shared by all chains, so only one chain runs them at a time
+        with self._interval_lock:
+            for s in self._bot._scheduler.steps_by_interval(self._group, interval):
+                self._bot._run_step(s, logic_factory=logic_factory)
+
+    def _run_chain(self, chain, logic) -> bool:
+        bot = self._bot
+        logic_factory = lambda: logic
+        last_step = None
+        repeat_count = 0
+        while not self._stop.is_set():
+            step = self._next_step(chain)
+            if step is None:
+                return True
+            repeat_count = repeat_count + 1 if step is last_step else 0
+            if repeat_count > bot._repeat_count_till_error:
+                bot._on_exception("The same step was repeated too many times", step)
+                return False
+            last_step = step
+
+            self._run_interval_steps(ScrapingStepInterval.BeforeAnyStep, logic_factory)
+            success = False
+            try:
+                bot._on_debug("Running step: ", step.name())
+                bot._run_step(step, logic_factory=logic_factory)
+                success = True
+            except Exception as e:
+                bot._on_debug("Exception: ", e)
+                if step.error_handling() != ScrapingStepErrorHandling.Ignore:
+                    bot._on_exception(e, step)
+
+            if success:
+                self._run_interval_steps(ScrapingStepInterval.AfterAnyStep, logic_factory)
+                bot.pace(ScrapingPacingEvent.AfterStep, 2)
+                bot._on_debug("Finished step: ", step.name())
+            else:
+                if step.exit_bot_when_errored():
+                    bot._on_exception("The bot will exit because of an error in the step: " + step.name(), step)
+                    self._stop.set()
+                    return False
+                bot.pace(ScrapingPacingEvent.AfterFailedStep, 3)
+        return False
+
+    def _run_session(self, drivers, chain, logics, index):
+        driver = drivers.get()
+        self._bot._set_session_driver(driver)
+        try:
+            logic = ScrapingLogicBuffered(driver, self._bot)
+            logics[index] = logic
+            return self._run_chain(chain, logic)
+        finally:
+            self._bot._set_session_driver(None)
+            drivers.put(driver)
+
+    def run(self) -> bool:
+        """
+        :return: True if all chains finished, False if a chain failed
+        """
+        bot = self._bot
+        workers = min(bot._parallel_chains, len(self._chains))
+        drivers = queue.Queue()
+        drivers.put(bot._driver)
+        created = []
+        logics = [None] * len(self._chains)
+        # the data of the chains is not in the bot before the merge, so no checkpoint is saved while they run
+        bot._checkpoint_paused += 1
+        try:
+            for i in range(workers - 1):
+                driver = bot._new_driver(bot._driver_factory)
+                created.append(driver)
+                drivers.put(driver)
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._run_session, drivers, chain, logics, i)
+                           for i, chain in enumerate(self._chains)]
+                results = [f.result() for f in futures]
+        finally:
+            if bot._quit_drivers:
+                for driver in created:
+                    try:
+                        driver.quit()
+                    except Exception as e:
+                        log.warning(e)
+            for logic in logics:
+                if logic is not None:
+                    logic.merge_data()
+            bot._checkpoint_paused -= 1
+        bot.save_checkpoint()
+        return all(results)
@@ -4,11 +4,15 @@ from pyselenscrapr.ScrapingStep import IScrapingStep
 class ScrapingStepGroup:
     _steps : [IScrapingStep] = []
     name = None
+    _scheduler = None
 
-    def __init__(self, name: str, steps: [IScrapingStep]=[]):
-        self._steps = steps
+    def __init__(self, name: str, steps: [IScrapingStep]=None):
+        self._steps = list(steps) if steps is not None else []
         self.name = name
 
     def add_step(self, step):
-        self._steps.append(step)
+        if self._scheduler is not None:
+            self._scheduler.append_step(self, step)
+        else:
+            self._steps.append(step)
         step.group = self
\ No newline at end of file
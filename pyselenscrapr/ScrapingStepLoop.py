@@ -1,10 +1,14 @@
-import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 
-from pyselenscrapr.ScrapingLogic import ScrapingLogic
+from pyselenscrapr.ScrapingLogic import ScrapingLogic, ScrapingLogicBuffered
+from pyselenscrapr.ScrapingPacing import ScrapingPacingEvent
 from pyselenscrapr.ScrapingStep import ScrapingStep
 
 class ScrapingLogicIterator(ScrapingLogic):
+    __slots__ = ("_element", "_index")
+
     def __init__(self, logic: ScrapingLogic, element, index):
         super().__init__(logic._driver, logic._bot)
         self._element = element
@@ -16,6 +20,24 @@ class ScrapingLogicIterator(ScrapingLogic):
     def element(self):
         return self._element
 
+class ScrapingLogicIteratorSession(ScrapingLogicBuffered):
+    """
+    The ScrapingLogicIterator of a worker session in the concurrent mode of ScrapingStepLoop. element() returns the
+    url that was extracted from the element, the driver of the logic is already on this url.
+    """
+    __slots__ = ("_element", "_index")
+
+    def __init__(self, driver, bot, element, index):
+        super().__init__(driver, bot)
+        self._element = element
+        self._index = index
+
+    def index(self):
+        return self._index
+
+    def element(self):
+        return self._element
+
 class ScrapingStepIteration(ScrapingStep):
     pass
 
@@ -26,22 +48,130 @@ class ScrapingStepLoop(ScrapingStep):
                  iteration_callback: Callable[[ScrapingLogic], any],
                  iteration_steps: list[ScrapingStep],
                  iterations: int =None,
-                 retry_count: int = 3):
+                 retry_count: int = 3,
+                 concurrency: int = 1,
+                 driver_factory: Callable[[], object] = None,
+                 url_callback: Callable[[ScrapingLogicIterator], str] = None,
+                 quit_drivers: bool = True):
+        """
+        Constructor for ScrapingStepLoop
+
+        :param name: a string representing the name of the step
+        :param iteration_callback: a function that returns the elements to iterate over
+        :param iteration_steps: the steps that are executed for every element
+        :param concurrency: the number of elements that are processed at the same time. Every worker has its own
+            driver session, so driver_factory and url_callback are required if concurrency > 1.
+        :param driver_factory: a function that creates a new selenium driver session
+        :param url_callback: a function that returns the url of the element of a ScrapingLogicIterator. The worker
+            session opens this url before the iteration steps are executed.
+        :param quit_drivers: quit the worker sessions when all elements are processed
+        """
         super().__init__(name, lambda x: self.execute(x))
+        if concurrency > 1 and (driver_factory is None or url_callback is None):
+            raise Exception("A driver_factory and an url_callback are required to process elements concurrently.")
         self._iteration_callback = iteration_callback
         self._iteration_steps = iteration_steps
+        self._concurrency = concurrency
+        self._driver_factory = driver_factory
+        self._url_callback = url_callback
+        self._quit_drivers = quit_drivers
         self.current_iteration = 0
+        self.results = []
+        self.errors = {}
+        self._completed = 0
+        self._restored = None
 
-    def execute(self, logic: ScrapingLogic):
-        self.elements = self._iteration_callback(logic)
+    def checkpoint_state(self):
+        # only the sequential mode has progress inside of the step, the concurrent mode is saved when it is finished
+        if self._concurrency > 1 or self._completed == 0:
+            return None
+        return {"completed": self._completed}
+
+    def restore_state(self, state):
+        self._restored = state
+
+    def _execute_element(self, l, index):
+        results = []
+        step = None
+        try:
+            for step in self._iteration_steps:
+                results.append(step.execute(l))
+                l.pace(ScrapingPacingEvent.AfterLoopElement, 2)
+        except Exception as e:
+            self.errors[index] = (e, step)
+        return results
 
-        index = 0
-        for element in self.elements:
+    def _execute_session(self, drivers, bot, url, index):
+        bot._set_active_step(self.name())
+        driver = drivers.get()
+        bot._set_session_driver(driver)
+        try:
+            l = ScrapingLogicIteratorSession(driver, bot, url, index)
             try:
-                for step in self._iteration_steps:
-                    l = ScrapingLogicIterator(logic, element, index)
-                    step.execute(l)
-                    time.sleep(2)
+                driver.get(url)
             except Exception as e:
-                logic._on_exception(e, step)
-            index += 1
\ No newline at end of file
+                self.errors[index] = (e, None)
+                return l, []
+            return l, self._execute_element(l, index)
+        finally:
+            bot._set_session_driver(None)
+            drivers.put(driver)
+
+    def _execute_concurrent(self, logic: ScrapingLogic):
+        # the elements belong to the session of the bot, so the urls are read there before the workers start
+        urls = [self._url_callback(ScrapingLogicIterator(logic, element, index))
+                for index, element in enumerate(self.elements)]
+
+        drivers = queue.Queue()
+        created = []
+        try:
+            for i in range(min(self._concurrency, len(urls))):
+                driver = logic._bot._new_driver(self._driver_factory)
+                created.append(driver)
+                drivers.put(driver)
+
+            with ThreadPoolExecutor(max_workers=max(1, len(created))) as executor:
+                futures = [executor.submit(self._execute_session, drivers, logic._bot, url, index)
+                           for index, url in enumerate(urls)]
+                done = [f.result() for f in futures]
+        finally:
+            if self._quit_drivers:
+                for driver in created:
+                    try:
+                        driver.quit()
+                    except Exception as e:
+                        self.log("Error on quit driver " + str(e))
+
+        # merge the data and the results in index order
+        for l, results in done:
+            l.merge_data()
+            self.results.append(results)
+
+    def execute(self, logic: ScrapingLogic):
+        self.elements = self._iteration_callback(logic)
+        self.results = []
+        self.errors = {}
+        self._completed = 0
+        if self._restored is not None and self._concurrency <= 1:
+            # the elements before the checkpoint are already processed and their data is in the bot
+            self.elements = list(self.elements)
+            self._completed = min(self._restored["completed"], len(self.elements))
+            self.results = [None] * self._completed
+            self.log("Resumed after " + str(self._completed) + " elements")
+        self._restored = None
+
+        if self._concurrency > 1:
+            self._execute_concurrent(logic)
+        else:
+            for index, element in enumerate(self.elements):
+                if index < self._completed:
+                    continue
+                self.current_iteration = index
+                l = ScrapingLogicIterator(logic, element, index)
+                self.results.append(self._execute_element(l, index))
+                self._completed = index + 1
+                self.save_checkpoint()
+
+        for index in sorted(self.errors):
+            e, step = self.errors[index]
+            logic._bot._on_exception(e, step if step is not None else self)
@@ -1,8 +1,13 @@
 import random
+import threading
 import time
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 
-from pyselenscrapr.ScrapingLogic import ScrapingLogic
+from pyselenscrapr.ScrapingFingerprintIndex import ScrapingFingerprintIndex
+from pyselenscrapr.ScrapingLogic import ScrapingLogicBuffered
+from pyselenscrapr.ScrapingPacing import ScrapingPacingEvent
 from pyselenscrapr.ScrapingStep import ScrapingStep, IScrapingStep
 
 
@@ -10,6 +15,20 @@ class ScrapingStepPaginationMode:
     RandomPages = 1
     AllPages = 2
 
+class ScrapingLogicPage(ScrapingLogicBuffered):
+    """
+    The ScrapingLogic of one page in the parallel mode of ScrapingStepPagination.
+    """
+    __slots__ = ("_page",)
+
+    def __init__(self, driver, bot, page):
+        super().__init__(driver, bot)
+        self._page = page
+
+    def page(self):
+        return self._page
+
+
 class ScrapingStepPagination(ScrapingStep):
     def __init__(self, name: str,
                  execute: Callable[[IScrapingStep], any],
@@ -17,9 +36,55 @@ class ScrapingStepPagination(ScrapingStep):
                 validate_page: Callable[[IScrapingStep, int], bool],
                  pagination_mode: ScrapingStepPaginationMode,
                  page_count: Callable[[IScrapingStep], int],
-                 exit_bot_when_errored: bool = False,):
+                 exit_bot_when_errored: bool = False,
+                 sessions: int = 1,
+                 driver_factory: Callable[[], object] = None,
+                 quit_drivers: bool = True,
+                 fingerprint_index: ScrapingFingerprintIndex = None,
+                 fingerprint_selector: str = None,
+                 fingerprint_attribute: str = "textContent",
+                 fingerprint_scope: str = None):
+        """
+        Constructor for ScrapingStepPagination
+
+        :param name: a string representing the name of the step
+        :param execute: a function that scrapes the current page
+        :param goto_page: a function that navigates to a page number
+        :param validate_page: a function that checks if the page number is shown
+        :param pagination_mode: the order in which the pages are visited
+        :param page_count: a function that returns the number of pages
+        :param exit_bot_when_errored: exit the bot if the step fails
+        :param sessions: the number of driver sessions that scrape pages in parallel. The driver of the bot is one
+            of them, the others are created with driver_factory.
+        :param driver_factory: a function that creates a new selenium driver session, required if sessions > 1
+        :param quit_drivers: quit the sessions that were created with driver_factory when all pages are scraped
+        :param fingerprint_index: a ScrapingFingerprintIndex for incremental recrawls. The content of
+            fingerprint_selector is hashed after the navigation, if it didn't change since the last run the data of the
+            page is taken from the index and execute is skipped. Pages where nothing matches are always scraped and
+            not stored.
+        :param fingerprint_selector: CSS or XPATH selector of the relevant content of a page, required with an index
+        :param fingerprint_attribute: the property of the content that is hashed, e.g. "textContent" or "innerHTML"
+        :param fingerprint_scope: the name of the pages in the index, the name of the step by default
+        """
         super().__init__(name, execute, exit_bot_when_errored=exit_bot_when_errored)
+        if sessions > 1 and driver_factory is None:
+            raise Exception("A driver_factory is required to scrape with more than one session.")
+        if fingerprint_index is not None and fingerprint_selector is None:
+            raise Exception("A fingerprint_selector is required to use a fingerprint index.")
+        self._fingerprint_index = fingerprint_index
+        self._fingerprint_selector = fingerprint_selector
+        self._fingerprint_attribute = fingerprint_attribute
+        self._fingerprint_scope = fingerprint_scope if fingerprint_scope is not None else name
+        self._sessions = sessions
+        self._driver_factory = driver_factory
+        self._quit_drivers = quit_drivers
+        self._lock = threading.Lock()
+        self._page_results = {}
+        self._failed_pages = {}
         self._executionList = []
+        self._completed_pages = []
+        self._restored = None
+        self._site = None
         self._goto_page = goto_page
         self._pagination_mode = pagination_mode
         self._validate_page = validate_page
@@ -34,6 +99,36 @@ class ScrapingStepPagination(ScrapingStep):
             list.append(None)
         return list
 
+    def checkpoint_state(self):
+        if len(self._executionList) == 0:
+            return None
+        return {"page_count": self._page_count_value, "completed": list(self._completed_pages)}
+
+    def restore_state(self, state):
+        self._restored = state
+
+    def _page_count_to_scrape(self, logic):
+        if self._restored is not None:
+            return self._restored["page_count"]
+        return self._page_count(logic)
+
+    def _start_pages(self, page_count):
+        self._page_count_value = page_count
+        self._executionList = self._fill_all_pages()
+        self._completed_pages = []
+        if self._restored is not None:
+            # the pages of the checkpoint are already scraped and their data is in the bot
+            for page in self._restored["completed"]:
+                if page < len(self._executionList):
+                    self._executionList[page] = True
+                    self._completed_pages.append(page)
+            self.log("Resumed with " + str(len(self._completed_pages)) + " scraped pages")
+            self._restored = None
+
+    def _page_done(self, page):
+        self._executionList[page] = True
+        self._completed_pages.append(page)
+
     def finished(self):
         for i in self._executionList:
             if i is None:
@@ -41,18 +136,21 @@ class ScrapingStepPagination(ScrapingStep):
         return True
 
     def _get_next_page(self):
+        if self._pagination_mode == ScrapingStepPaginationMode.RandomPages:
+            pages = [i for i in range(1, len(self._executionList)) if self._executionList[i] is None]
+            if len(pages) > 0:
+                return random.choice(pages)
+            return None
         for i in range(1, len(self._executionList)):
-            if self._pagination_mode == ScrapingStepPaginationMode.RandomPages:
-                r = random.randint(1, len(self._executionList)-1)
-                if self._executionList[r] is None:
-                    return r
-            else:
-                if self._executionList[i] is None:
-                    return i
+            if self._executionList[i] is None:
+                return i
         return None
 
-    def _sleep(self, t):
-        time.sleep(t)
+    def _sleep(self, t, event=ScrapingPacingEvent.Retry):
+        if self.robot is not None:
+            self.robot.pace(event, t)
+        else:
+            time.sleep(t)
 
     def can_retry(self):
         return False
@@ -62,11 +160,174 @@ class ScrapingStepPagination(ScrapingStep):
 
     def sleep_random(self):
         t = random.randint(self._min_wait_time, self._max_wait_time)
-        self._sleep(t)
+        self._sleep(t, ScrapingPacingEvent.BetweenPages)
+
+    def page_results(self) -> dict:
+        """
+        The return values of execute for each page number.
+        """
+        return self._page_results
+
+    def failed_pages(self) -> dict:
+        """
+        The pages that could not be scraped with the error message for each page number.
+        """
+        return self._failed_pages
+
+    def _navigate(self, l, page, retry=3):
+        for i in range(0, retry):
+            try:
+                self._goto_page(l, page)
+                l.pace(ScrapingPacingEvent.AfterNavigation, 1)
+                if self._validate_page(l, page):
+                    return True
+            except Exception as e:
+                self.log("Error: " + str(e))
+                l.pace(ScrapingPacingEvent.Retry, 1)
+        return False
+
+    def _scrape(self, l, page):
+        # returns the outcome of the page for the metrics
+        try:
+            fingerprint = None
+            if self._fingerprint_index is not None:
+                fingerprint = l.fingerprint(self._fingerprint_selector, self._fingerprint_attribute)
+                # without content, e.g. an error page, the page is scraped and not stored in the index
+                hit, stored = self._fingerprint_index.get(self._fingerprint_scope, page, fingerprint) \
+                    if fingerprint is not None else (False, None)
+                if hit:
+                    self.log("Page " + str(page) + " didn't change, the data of the index is used")
+                    for operation, key, value, send_to_backend in stored["data"]:
+                        getattr(l, operation)(key, value, send_to_backend=send_to_backend)
+                    self._page_results[page] = stored["result"]
+                    return "replayed"
+
+            self._page_results[page] = self._execute(l)
+            if fingerprint is not None:
+                self._store_fingerprint(l, page, fingerprint)
+            l.take_screenshot(self, l._driver)
+            l.pace(ScrapingPacingEvent.AfterPage, 1)
+            return "ok"
+        except Exception as e:
+            self.log("Error on try to scrape logic" + str(e))
+            return "failed"
+
+    def _store_fingerprint(self, l, page, fingerprint):
+        # the logic of the page is buffered, so the data the page produced can be stored and replayed
+        data = [(operation.__name__, key, value, send_to_backend)
+                for operation, key, value, send_to_backend in l._data_operations]
+        try:
+            self._fingerprint_index.put(self._fingerprint_scope, page, fingerprint,
+                                        {"result": self._page_results[page], "data": data})
+        except Exception as e:
+            self.log("Page " + str(page) + " was not stored in the fingerprint index: " + str(e))
+
+    def _metrics_site(self, logic):
+        # the page latency is collected per site, the host of the current url or the name of the step
+        if self.robot is None or not self.robot.metrics().enabled:
+            return None
+        try:
+            host = urlparse(logic._driver.current_url).netloc
+        except Exception:
+            host = ""
+        return host if host != "" else self.name()
+
+    def _observe_page(self, started, outcome):
+        if self._site is not None:
+            self.robot.metrics().observe_page(self._site, time.perf_counter() - started, outcome)
+
+    def _claim_next_page(self, scheduled):
+        with self._lock:
+            next_page = self._get_next_page()
+            if next_page is not None:
+                # False marks a page that is taken by a session but not finished yet
+                self._executionList[next_page] = False
+                scheduled.append(next_page)
+            return next_page
+
+    def _run_session(self, driver, bot, scheduled, logics):
+        bot._set_active_step(self.name())
+        bot._set_session_driver(driver)
+        try:
+            self._run_pages(driver, bot, scheduled, logics)
+        finally:
+            bot._set_session_driver(None)
+
+    def _run_pages(self, driver, bot, scheduled, logics):
+        while True:
+            next_page = self._claim_next_page(scheduled)
+            if next_page is None:
+                return
+            self.log("Scraping page " + str(next_page) + " of " + str(self._page_count_value) + " pages")
+
+            retry = 3
+            started = time.perf_counter()
+            l = ScrapingLogicPage(driver, bot, next_page)
+            logics[next_page] = l
+            if not self._navigate(l, next_page, retry):
+                self._failed_pages[next_page] = "Could not navigate to page " + str(next_page) + " after " + \
+                                                str(retry) + " attempts."
+                self._observe_page(started, "failed")
+                self._merge_finished(next_page, False, scheduled, logics)
+                continue
+
+            self._observe_page(started, self._scrape(l, next_page))
+            self._merge_finished(next_page, True, scheduled, logics)
+            self.sleep_random()
+
+    def _merge_finished(self, page, success, scheduled, logics):
+        # the data is merged in the order the pages were taken, like the sequential mode would have written it. A
+        # page is merged as soon as all pages that were taken before it are finished, so checkpoints contain it.
+        with self._merge_lock:
+            self._finished[page] = success
+            merged = False
+            while self._merged < len(scheduled) and scheduled[self._merged] in self._finished:
+                merged_page = scheduled[self._merged]
+                logics[merged_page].merge_data()
+                if self._finished[merged_page]:
+                    self._page_done(merged_page)
+                self._merged += 1
+                merged = True
+            if merged:
+                self.save_checkpoint()
+
+    def _execute_parallel(self, logic):
+        drivers = [logic._driver]
+        created = []
+        try:
+            for i in range(1, self._sessions):
+                driver = logic._bot._new_driver(self._driver_factory)
+                drivers.append(driver)
+                created.append(driver)
+
+            scheduled = []
+            logics = {}
+            self._merge_lock = threading.Lock()
+            self._finished = {}
+            self._merged = 0
+            with ThreadPoolExecutor(max_workers=len(drivers)) as executor:
+                futures = [executor.submit(self._run_session, d, logic._bot, scheduled, logics) for d in drivers]
+                for f in futures:
+                    f.result()
+        finally:
+            if self._quit_drivers:
+                for driver in created:
+                    try:
+                        driver.quit()
+                    except Exception as e:
+                        self.log("Error on quit driver " + str(e))
+
+        if len(self._failed_pages) > 0:
+            self.raise_exception(" ".join(self._failed_pages[p] for p in sorted(self._failed_pages)))
 
     def execute(self, logic):
-        self._page_count_value = self._page_count(logic)
-        self._executionList = self._fill_all_pages()
+        self._site = self._metrics_site(logic)
+        self._start_pages(self._page_count_to_scrape(logic))
+        self._page_results = {}
+        self._failed_pages = {}
+
+        if self._sessions > 1:
+            return self._execute_parallel(logic)
 
         while not self.finished():
             next_page = self._get_next_page()
@@ -77,34 +338,22 @@ class ScrapingStepPagination(ScrapingStep):
                 break
 
             retry = 3
-            success = False
-            l = ScrapingLogic(logic._driver, logic._bot)
-            for i in range(0, retry):
-                try:
-                    self._goto_page(l, next_page)
-                    l.sleep(1)
-                    if self._validate_page(l, next_page):
-                        success = True
-                        break
-                except Exception as e:
-                    self.log("Error: " + str(e))
-                    l.sleep(1)
-
-            if not success:
-                self.raise_exception("Could not navigate to page " + str(next_page)+" after "+str(retry)+" attempts.")
+            started = time.perf_counter()
+            # the logic of the step is used for all pages, it only keeps the driver and the bot
+            if not self._navigate(logic, next_page, retry):
+                self._failed_pages[next_page] = "Could not navigate to page " + str(next_page) + " after " + \
+                                                str(retry) + " attempts."
+                self._observe_page(started, "failed")
+                self.raise_exception(self._failed_pages[next_page])
 
-            try:
-                l = ScrapingLogic(logic._driver, logic._bot)
-                self._execute(l)
-                l.take_screenshot(self)
-                l.sleep(1)
-            except Exception as e:
-                self.log("Error on try to scrape logic" + str(e))
+            if self._fingerprint_index is not None:
+                l = ScrapingLogicPage(logic._driver, logic._bot, next_page)
+                outcome = self._scrape(l, next_page)
+                l.merge_data()
+            else:
+                outcome = self._scrape(logic, next_page)
+            self._observe_page(started, outcome)
 
-            self._executionList[next_page] = True
+            self._page_done(next_page)
+            self.save_checkpoint()
             self.sleep_random()
-
-
-
-
-
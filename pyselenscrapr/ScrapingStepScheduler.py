@@ -0,0 +1,182 @@
+import heapq
+import threading
+
+from pyselenscrapr.ScrapingStep import ScrapingStepInterval
+
+
+class ScrapingStepGroupIndex:
+    """
+    The index of one step group: the steps by interval, the number of steps that were not executed and a heap of
+    the Order steps that may be ready, sorted by their position in the group.
+    """
+    def __init__(self, group, counted: bool):
+        self.group = group
+        self.counted = counted
+        self.positions = {}
+        self.by_interval = {}
+        self.pending = 0
+        self.ready = []
+        self.in_ready = set()
+
+    def push(self, step):
+        for position in self.positions[step]:
+            if position not in self.in_ready:
+                self.in_ready.add(position)
+                heapq.heappush(self.ready, (position, step))
+
+
+class ScrapingStepScheduler:
+    """
+    Keeps the indexes the bot needs to choose the next step: the dependency graph of previous_step, the steps of
+    every group by interval and the number of steps that were not executed per group. The steps report changes of
+    their executed state with set_executed() and reset(), so the next step and the finished checks don't have to scan
+    all steps. The indexes are locked, so steps of independent chains can report changes from their threads.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._groups = {}
+        # the indexes of the groups that contain a step
+        self._step_groups = {}
+        self._dependents = {}
+        self._executed = {}
+        self._pending = 0
+
+    def add_group(self, group, counted: bool = True):
+        """
+        Index a group and its steps. Counted groups are part of finished().
+
+        :param group: the ScrapingStepGroup
+        :param counted: True if the group is one of the groups of the bot
+        """
+        with self._lock:
+            index = self._groups.get(id(group))
+            if index is not None:
+                if counted and not index.counted:
+                    index.counted = True
+                    self._pending += index.pending
+                return index
+            index = ScrapingStepGroupIndex(group, counted)
+            self._groups[id(group)] = index
+            group._scheduler = self
+            for position, step in enumerate(group._steps):
+                self._add(index, step, position)
+            return index
+
+    def _index(self, group) -> ScrapingStepGroupIndex:
+        index = self._groups.get(id(group))
+        if index is None:
+            index = self.add_group(group, counted=False)
+        return index
+
+    def append_step(self, group, step):
+        """
+        Append a step to a group and index it.
+        """
+        with self._lock:
+            group._steps.append(step)
+            index = self._groups.get(id(group))
+            if index is None:
+                # indexing the group indexes the new step too
+                self.add_group(group, counted=False)
+                return
+            self._add(index, step, len(group._steps) - 1)
+
+    def _add(self, index, step, position):
+        step._scheduler = self
+        if step not in index.positions:
+            self._step_groups.setdefault(step, []).append(index)
+        index.positions.setdefault(step, []).append(position)
+        index.by_interval.setdefault(step.interval(), []).append(step)
+
+        executed = step.was_executed()
+        self._executed[step] = executed
+        if not executed:
+            index.pending += 1
+            if index.counted:
+                self._pending += 1
+        self._add_dependency(step)
+        if self._is_ready(step):
+            index.push(step)
+
+    def _add_dependency(self, step):
+        previous = step.previous_step()
+        if previous is None:
+            return
+        self._dependents.setdefault(previous, []).append(step)
+        if getattr(previous, "_scheduler", None) is None:
+            previous._scheduler = self
+        if previous not in self._executed:
+            self._executed[previous] = previous.was_executed()
+
+    def dependency_changed(self, step, old_previous):
+        """
+        Called by a step when its previous_step changed.
+        """
+        with self._lock:
+            if old_previous is not None and step in self._dependents.get(old_previous, []):
+                self._dependents[old_previous].remove(step)
+            if step in self._executed:
+                self._add_dependency(step)
+                if self._is_ready(step):
+                    self._push(step)
+
+    def _is_ready(self, step) -> bool:
+        if step.interval() != ScrapingStepInterval.Order or step.was_executed():
+            return False
+        previous = step.previous_step()
+        return previous is None or previous.was_executed()
+
+    def _push(self, step):
+        for index in self._step_groups.get(step, ()):
+            index.push(step)
+
+    def step_changed(self, step):
+        """
+        Called by a step when it was executed or reset.
+        """
+        with self._lock:
+            executed = step.was_executed()
+            if self._executed.get(step) == executed:
+                return
+            self._executed[step] = executed
+            change = -1 if executed else 1
+            for index in self._step_groups.get(step, ()):
+                occurrences = len(index.positions[step])
+                index.pending += change * occurrences
+                if index.counted:
+                    self._pending += change * occurrences
+
+            if executed:
+                for dependent in self._dependents.get(step, ()):
+                    if self._is_ready(dependent):
+                        self._push(dependent)
+            elif self._is_ready(step):
+                # dependents that are not ready anymore are removed from the heap when they show up at the top
+                self._push(step)
+
+    def next_step(self, group):
+        """
+        :return: the first step of the group in the Order interval that was not executed and whose previous step was
+            executed, or None
+        """
+        with self._lock:
+            index = self._index(group)
+            ready = index.ready
+            while len(ready) > 0:
+                position, step = ready[0]
+                if self._is_ready(step):
+                    return step
+                heapq.heappop(ready)
+                index.in_ready.discard(position)
+            return None
+
+    def steps_by_interval(self, group, interval) -> list:
+        with self._lock:
+            return [s for s in self._index(group).by_interval.get(interval, ()) if not s.was_executed()]
+
+    def is_group_finished(self, group) -> bool:
+        with self._lock:
+            return self._index(group).pending == 0
+
+    def finished(self) -> bool:
+        return self._pending == 0
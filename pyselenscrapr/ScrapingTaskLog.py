@@ -0,0 +1,108 @@
+import collections
+import itertools
+import threading
+import time
+
+
+class ScrapingTaskLogEntry:
+    """
+    One entry of the task log. The message is only formatted when it is read.
+    """
+    __slots__ = ("sequence", "time", "level", "step", "_message", "_args")
+
+    def __init__(self, sequence: int, level: str, message, args: tuple, step: str = None):
+        self.sequence = sequence
+        self.time = time.time()
+        self.level = level
+        self.step = step
+        self._message = message
+        self._args = args
+
+    def message(self) -> str:
+        if len(self._args) == 0:
+            return str(self._message)
+        return str(self._message) + " ".join([str(x) for x in self._args])
+
+    def __str__(self):
+        return self.message()
+
+    def to_dict(self) -> dict:
+        return {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.time)),
+            "message": self.message(),
+            "step": self.step,
+            "level": self.level
+        }
+
+
+class ScrapingTaskLog:
+    """
+    The task log of a bot. Every level has its own ring buffer, so many debug entries don't push the errors out of the
+    log. Messages are stored with their arguments and formatted when the log is read.
+    """
+    def __init__(self, size: int = 1000, retention: dict = None):
+        """
+        Constructor for ScrapingTaskLog
+
+        :param size: the number of entries that are kept per level
+        :param retention: the number of entries that are kept for single levels, e.g. {"debug": 200, "error": 1000}
+        """
+        self._size = size
+        self._retention = retention if retention is not None else {}
+        self._levels = {}
+        self._sequence = itertools.count(1)
+        self._reported = 0
+        self._lock = threading.Lock()
+
+    def append(self, level: str, message, *args, step: str = None) -> ScrapingTaskLogEntry:
+        """
+        Add an entry to the log.
+
+        :param level: the level, e.g. "debug" or "error"
+        :param message: the message, the args are appended separated by spaces when it is formatted
+        :param step: the name of the step
+        """
+        # exceptions keep their traceback and with it the frames of the failed step, so they are formatted now
+        if isinstance(message, BaseException):
+            message = str(message)
+        if any(isinstance(a, BaseException) for a in args):
+            args = tuple(str(a) if isinstance(a, BaseException) else a for a in args)
+        entry = ScrapingTaskLogEntry(next(self._sequence), level, message, args, step)
+        entries = self._levels.get(level)
+        if entries is None:
+            with self._lock:
+                entries = self._levels.setdefault(level, collections.deque(maxlen=self._retention.get(level, self._size)))
+        entries.append(entry)
+        return entry
+
+    def _entries(self, after: int = 0) -> list:
+        with self._lock:
+            levels = list(self._levels.values())
+        entries = [e for entries in levels for e in list(entries) if e.sequence > after]
+        entries.sort(key=lambda e: e.sequence)
+        return entries
+
+    def entries(self) -> list:
+        """
+        :return: all entries of the log as dicts with the keys time, message, step and level, the oldest first
+        """
+        return [e.to_dict() for e in self._entries()]
+
+    def tail(self, count: int) -> list:
+        """
+        :return: the last count entries as dicts
+        """
+        return [e.to_dict() for e in self._entries()[-count:]] if count > 0 else []
+
+    def report(self) -> list:
+        """
+        The entries since the last report as dicts. Used for the error reports to the backend, so every report only
+        contains what happened since the previous one.
+        """
+        entries = self._entries(self._reported)
+        if len(entries) > 0:
+            self._reported = entries[-1].sequence
+        return [e.to_dict() for e in entries]
+
+    def __len__(self):
+        return sum(len(entries) for entries in list(self._levels.values()))
@@ -0,0 +1,208 @@
+import time
+import weakref
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+# The common part of the wait scripts. The script resolves with true as soon as the condition holds and with false at
+# the deadline. Conditions are checked again on every DOM mutation and every 100 ms for changes without a mutation,
+# e.g. of the layout. arguments: the deadline in ms, the arguments of the condition, the callback of selenium
+WAIT_PRELUDE = """
+var done = arguments[arguments.length - 1], timeout = arguments[0], args = arguments;
+var finished = false, cleanups = [];
+function finish(value) {
+    if (finished) { return; }
+    finished = true;
+    for (var i = 0; i < cleanups.length; i++) { try { cleanups[i](); } catch (e) {} }
+    done(value);
+}
+var deadline = setTimeout(function () { finish(false); }, timeout);
+cleanups.push(function () { clearTimeout(deadline); });
+function every(ms, f) {
+    var t = setInterval(f, ms);
+    cleanups.push(function () { clearInterval(t); });
+}
+function observe(check) {
+    if (check()) { finish(true); return; }
+    var o = new MutationObserver(function () { if (check()) { finish(true); } });
+    o.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    cleanups.push(function () { o.disconnect(); });
+    every(100, function () { if (check()) { finish(true); } });
+}
+function find(selector, isXPath, root) {
+    root = root || document;
+    if (isXPath) {
+        return document.evaluate(selector, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return root.querySelector(selector);
+}
+function visible(e) {
+    var style = window.getComputedStyle(e);
+    return !!(e.offsetWidth || e.offsetHeight || e.getClientRects().length) &&
+        style.visibility !== "hidden" && style.display !== "none";
+}
+function text(e) {
+    return e.innerText !== undefined ? e.innerText : e.textContent;
+}
+"""
+
+# arguments: deadline, the ready state "interactive" or "complete"
+WAIT_READY_STATE_SCRIPT = WAIT_PRELUDE + """
+var states = ["loading", "interactive", "complete"], wanted = states.indexOf(args[1]);
+function ready() { return states.indexOf(document.readyState) >= wanted; }
+if (ready()) { finish(true); } else {
+    var listener = function () { if (ready()) { finish(true); } };
+    document.addEventListener("readystatechange", listener);
+    cleanups.push(function () { document.removeEventListener("readystatechange", listener); });
+}
+"""
+
+# The page reloaded when the marker that was set on the old page is gone and the new page is complete. If the page
+# unloads while the script waits, selenium raises an error and the wait is started again on the new page.
+# arguments: deadline
+WAIT_RELOAD_SCRIPT = WAIT_PRELUDE + """
+observe(function () { return !window._incomplete_data && document.readyState === "complete"; });
+"""
+
+# arguments: deadline, selector, is xpath, state ("present", "visible" or "clickable"), context element or null
+WAIT_ELEMENT_SCRIPT = WAIT_PRELUDE + """
+var selector = args[1], isXPath = args[2], state = args[3], root = args[4];
+observe(function () {
+    var e = find(selector, isXPath, root);
+    if (!e) { return false; }
+    if (state === "present") { return true; }
+    return visible(e) && (state === "visible" || !e.disabled);
+});
+"""
+
+# arguments: deadline, selector, is xpath, only hidden (true if a hidden element counts as gone), context element
+WAIT_ELEMENT_GONE_SCRIPT = WAIT_PRELUDE + """
+var selector = args[1], isXPath = args[2], hidden = args[3], root = args[4];
+observe(function () {
+    var e = find(selector, isXPath, root);
+    return !e || (hidden && !visible(e));
+});
+"""
+
+# arguments: deadline, selector, is xpath, the old text or null for the text at the start, context element or null
+WAIT_TEXT_CHANGE_SCRIPT = WAIT_PRELUDE + """
+var selector = args[1], isXPath = args[2], old = args[3], root = args[4];
+if (old === null) {
+    var e = find(selector, isXPath, root);
+    old = e ? text(e) : null;
+}
+observe(function () {
+    var e = find(selector, isXPath, root);
+    return e !== null && text(e) !== old;
+});
+"""
+
+# Counts the pending fetch and XMLHttpRequest calls of the page. The counter is installed on the first wait of a
+# page, requests that started before are not known.
+# arguments: deadline, idle time in ms
+WAIT_NETWORK_IDLE_SCRIPT = WAIT_PRELUDE + """
+var idle = args[1];
+var net = window.__pyselenscrapr_network;
+if (!net) {
+    net = window.__pyselenscrapr_network = {pending: 0, last: Date.now()};
+    var start = function () { net.pending++; net.last = Date.now(); };
+    var end = function () { net.pending = Math.max(0, net.pending - 1); net.last = Date.now(); };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            start();
+            return fetch.apply(this, arguments).then(function (r) { end(); return r; },
+                                                     function (e) { end(); throw e; });
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        start();
+        this.addEventListener("loadend", end);
+        return send.apply(this, arguments);
+    };
+}
+function quiet() { return net.pending === 0 && Date.now() - net.last >= idle; }
+if (quiet()) { finish(true); } else { every(Math.max(10, Math.min(100, idle / 4)), function () { if (quiet()) { finish(true); } }); }
+"""
+
+# arguments: deadline, quiet time in ms
+WAIT_DOM_QUIET_SCRIPT = WAIT_PRELUDE + """
+var quiet = args[1], last = Date.now();
+var o = new MutationObserver(function () { last = Date.now(); });
+o.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+cleanups.push(function () { o.disconnect(); });
+every(Math.max(10, Math.min(100, quiet / 4)), function () { if (Date.now() - last >= quiet) { finish(true); } });
+"""
+
+# the seconds selenium waits longer than the deadline of the script, so the script can resolve with false first
+SCRIPT_TIMEOUT_MARGIN = 5
+
+# the script timeout that was set on a driver
+_script_timeouts = weakref.WeakKeyDictionary()
+
+
+def ensure_script_timeout(driver, seconds: float):
+    """
+    Raise the script timeout of a driver to at least seconds plus the margin. The timeout is only set if it is lower
+    than needed, so a wait costs no extra round-trip after the first one.
+
+    :param driver: the selenium driver
+    :param seconds: the deadline of the wait
+    """
+    needed = seconds + SCRIPT_TIMEOUT_MARGIN
+    try:
+        current = _script_timeouts.get(driver)
+    except TypeError:
+        current = None
+    if current is not None and current >= needed:
+        return
+    driver.set_script_timeout(needed)
+    try:
+        _script_timeouts[driver] = needed
+    except TypeError:
+        pass
+
+
+def forget_script_timeout(driver):
+    """
+    Forget the script timeout that was set on a driver, so the next wait sets it again. Call it when the timeout of
+    the driver was changed elsewhere.
+    """
+    try:
+        _script_timeouts.pop(driver, None)
+    except TypeError:
+        pass
+
+
+def is_unload_error(e: Exception) -> bool:
+    """
+    :return: True if the exception is the error of selenium for a page that unloaded while a script was waiting
+    """
+    return isinstance(e, JavascriptException) and "unloaded" in str(e).lower()
+
+
+def wait_async(driver, script: str, timeout: float, *args) -> bool:
+    """
+    Run a wait script with execute_async_script. It is a single round-trip that returns as soon as the condition holds.
+
+    If selenium times out before the deadline of the script, the script timeout of the driver was lowered since it
+    was set here, so it is set again and the wait goes on for the rest of the deadline.
+
+    :param driver: the selenium driver
+    :param script: one of the WAIT_*_SCRIPT scripts
+    :param timeout: the deadline in seconds
+    :param args: the arguments of the condition
+    :return: True if the condition holds, False at the deadline
+    :raises TimeoutException: if selenium timed out at the deadline
+    """
+    deadline = time.monotonic() + timeout
+    ensure_script_timeout(driver, timeout)
+    try:
+        return driver.execute_async_script(script, int(timeout * 1000), *args) is True
+    except TimeoutException:
+        forget_script_timeout(driver)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise
+    ensure_script_timeout(driver, remaining)
+    return driver.execute_async_script(script, int(remaining * 1000), *args) is True
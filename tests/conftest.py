@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # pagination steps take a screenshot of every page into the working directory
+    monkeypatch.chdir(tmp_path)
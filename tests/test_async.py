@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+from pyselenscrapr.AsyncScrapingBot import AsyncScrapingBot
+from pyselenscrapr.AsyncScrapingStep import AsyncScrapingStep, AsyncScrapingStepLoop, AsyncScrapingStepPagination
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingPacing import ScrapingPacingEvent, ScrapingPacingFixed, ScrapingVirtualClock
+from pyselenscrapr.ScrapingStepPagination import ScrapingStepPaginationMode
+
+URL = "https://fixtures.local/list/"
+
+
+def test_parallel_chains_are_rejected():
+    with pytest.raises(ValueError):
+        AsyncScrapingBot(ScrapingFakeDriver(), parallel_chains=2, driver_factory=ScrapingFakeDriver)
+
+
+def test_step_loop_and_pagination_in_virtual_time():
+    fixtures = {URL + str(p): "<html><body><p>%d</p></body></html>" % p for p in range(1, 3)}
+    clock = ScrapingVirtualClock()
+    bot = AsyncScrapingBot(ScrapingFakeDriver(fixtures, start_url=URL + "1"), clock=clock,
+                           pacing=ScrapingPacingFixed(events={ScrapingPacingEvent.BetweenPages: 4}))
+
+    async def scrape(l):
+        l.append_data("pages", await l.element_text("p"))
+
+    bot.add_step(AsyncScrapingStep("open", lambda l: l.get(URL + "1")))
+    bot.add_step(AsyncScrapingStepPagination("pages", scrape, lambda l, p: l.get(URL + str(p)), lambda l, p: True,
+                                             ScrapingStepPaginationMode.AllPages, lambda l: 2))
+    bot.add_step(AsyncScrapingStepLoop("loop", lambda l: [1, 2, 3],
+                                       [AsyncScrapingStep("item", lambda l: l.append_data("items", l.element()))]))
+
+    async def main():
+        seen = set()
+        run = asyncio.ensure_future(bot.run())
+        # the other task keeps running while the bot pauses
+        while not run.done():
+            seen.add(clock.now())
+            await asyncio.sleep(0)
+        return await run, seen
+
+    started = time.monotonic()
+    finished, seen = asyncio.run(main())
+    assert finished
+    assert time.monotonic() - started < 5
+    assert bot.get_data("pages") == ["1", "2"]
+    assert bot.get_data("items") == [1, 2, 3]
+    # the same pauses as the run of ScrapingBot in test_pacing.test_fixed_in_virtual_time
+    assert clock.slept == 26
+    assert clock.now() == clock.slept
+    # the task saw the virtual time between the pauses, not only before and after the run
+    assert len(seen) > 5
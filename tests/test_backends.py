@@ -0,0 +1,139 @@
+import csv
+import json
+import sqlite3
+import time
+
+import pytest
+
+from pyselenscrapr.ScrapingBackendLocal import ScrapingBackendCsv, ScrapingBackendJsonl, ScrapingBackendSqlite
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+
+
+def new_bot(backend, **kwargs):
+    return ScrapingBot(ScrapingFakeDriver({}), pacing=ScrapingPacingNone(), backend=backend, **kwargs)
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_jsonl(tmp_path):
+    backend = ScrapingBackendJsonl(str(tmp_path / "data.jsonl"))
+    backend.saveData({"rows": [{"a": 1}, {"a": 2, "b": [1]}], "title": "x"})
+    backend.close()
+    with open(tmp_path / "data.jsonl", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert lines == [{"key": "rows", "data": {"a": 1, "b": None}}, {"key": "rows", "data": {"a": 2, "b": [1]}},
+                     {"key": "title", "data": {"value": "x"}}]
+
+
+def test_csv_adds_columns_that_show_up_later(tmp_path):
+    backend = ScrapingBackendCsv(str(tmp_path), flush_rows=1)
+    backend.saveData({"rows": {"a": 1}})
+    backend.saveData({"rows": {"a": 2, "b": "x"}})
+    backend.saveData({"rows": {"b": "y"}})
+    backend.close()
+    assert read_csv(tmp_path / "rows.csv") == [["a", "b"], ["1", ""], ["2", "x"], ["", "y"]]
+
+
+def test_csv_appends_to_an_existing_file(tmp_path):
+    for value in (1, 2):
+        backend = ScrapingBackendCsv(str(tmp_path))
+        backend.saveData({"rows": {"a": value}})
+        backend.close()
+    assert read_csv(tmp_path / "rows.csv") == [["a"], ["1"], ["2"]]
+
+
+def test_sqlite(tmp_path):
+    backend = ScrapingBackendSqlite(str(tmp_path / "data.db"))
+    backend.saveData({"rows": [{"a": 1}]})
+    backend.flush()
+    backend.saveData({"rows": [{"a": 2, "b": {"c": 1}}]})
+    backend.close()
+    connection = sqlite3.connect(str(tmp_path / "data.db"))
+    assert connection.execute("SELECT a, b FROM rows").fetchall() == [(1, None), (2, "{\"c\": 1}")]
+
+
+def test_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+    from pyselenscrapr.ScrapingBackendLocal import ScrapingBackendParquet
+    backend = ScrapingBackendParquet(str(tmp_path))
+    backend.saveData({"rows": [{"a": 1}, {"a": 2}]})
+    backend.close()
+    assert list(pd.read_parquet(str(tmp_path / "rows"))["a"]) == [1, 2]
+
+
+def test_stream_data(tmp_path):
+    backend = ScrapingBackendCsv(str(tmp_path))
+    bot = new_bot(backend, stream_data=True)
+    bot.append_data("rows", {"a": 1})
+    bot.append_data("rows", {"a": 2})
+    backend.flush()
+    assert bot.has_data("rows")
+    assert bot.streamed_count("rows") == 2
+    with pytest.raises(Exception, match="streamed"):
+        bot.get_data("rows")
+    assert read_csv(tmp_path / "rows.csv") == [["a"], ["1"], ["2"]]
+
+
+def delta_bot(backend):
+    bot = new_bot(backend, delta_sync=True)
+    bot.set_data("title", "first")
+    bot.append_data("rows", {"a": 1})
+    bot.send_data_to_backend()
+    # the changes are only delivered when they are written, so they are sent again
+    bot.set_data("title", "second")
+    bot.append_data("rows", {"a": 2})
+    bot.send_data_to_backend()
+    backend.flush()
+    bot.append_data("rows", {"a": 3})
+    bot.send_data_to_backend()
+    return bot
+
+
+def test_delta_changes_replace_set_keys_and_skip_sent_rows(tmp_path):
+    backend = ScrapingBackendCsv(str(tmp_path))
+    bot = delta_bot(backend)
+    backend.close()
+    assert read_csv(tmp_path / "title.csv") == [["value"], ["second"]]
+    assert read_csv(tmp_path / "rows.csv") == [["a"], ["1"], ["2"], ["3"]]
+    assert bot._data.changes()[2] == {}
+
+
+def test_user_data_with_delta_keys_is_saved_as_it_is(tmp_path):
+    backend = ScrapingBackendCsv(str(tmp_path))
+    backend.saveData({"sequence": 1, "set": {"a": 1}, "append": {}})
+    backend.close()
+    assert read_csv(tmp_path / "sequence.csv") == [["value"], ["1"]]
+    assert read_csv(tmp_path / "set.csv") == [["a"], ["1"]]
+
+
+def test_delta_set_replaces_the_rows_of_sqlite(tmp_path):
+    backend = ScrapingBackendSqlite(str(tmp_path / "data.db"), flush_rows=1)
+    delta_bot(backend)
+    backend.close()
+    connection = sqlite3.connect(str(tmp_path / "data.db"))
+    assert connection.execute("SELECT value FROM title").fetchall() == [("second",)]
+    assert connection.execute("SELECT a FROM rows").fetchall() == [(1,), (2,), (3,)]
+
+
+def test_delta_set_is_marked_in_jsonl(tmp_path):
+    backend = ScrapingBackendJsonl(str(tmp_path / "data.jsonl"), flush_rows=1)
+    delta_bot(backend)
+    backend.close()
+    with open(tmp_path / "data.jsonl", encoding="utf-8") as f:
+        titles = [json.loads(line) for line in f if "title" in line]
+    assert titles == [{"key": "title", "replace": True, "data": {"value": "first"}},
+                      {"key": "title", "replace": True, "data": {"value": "second"}}]
+
+
+def test_idle_records_are_flushed_after_the_interval(tmp_path):
+    backend = ScrapingBackendCsv(str(tmp_path), flush_interval=0.05)
+    backend.saveData({"rows": {"a": 1}})
+    time.sleep(0.5)
+    assert read_csv(tmp_path / "rows.csv") == [["a"], ["1"]]
+    backend.close()
@@ -0,0 +1,111 @@
+import logging
+import os
+
+import pytest
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingCheckpoint import ScrapingCheckpoint
+from pyselenscrapr.ScrapingDataStore import ScrapingDataStore
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+from pyselenscrapr.ScrapingStepPagination import ScrapingStepPagination, ScrapingStepPaginationMode
+
+URL = "https://fixtures.local/list/"
+
+
+def state(store, step=0):
+    return {"data": store, "step": step}
+
+
+def test_journal_between_complete_checkpoints(tmp_path):
+    checkpoint = ScrapingCheckpoint(str(tmp_path / "run.checkpoint"), interval=0, compact_every=3)
+    store = ScrapingDataStore(chunk_size=2)
+    store.append("rows", {"a": 0})
+    store["title"] = "first"
+    checkpoint.save(state(store))
+    size = os.path.getsize(checkpoint.path())
+
+    store.append("rows", {"a": 1})
+    store.append("items", "x")
+    checkpoint.save(state(store, 1))
+    store["title"] = "second"
+    store.append("rows", {"a": 2})
+    del store["items"]
+    checkpoint.save(state(store, 2))
+    # only the journal grew
+    assert os.path.getsize(checkpoint.path()) == size
+    assert os.path.exists(checkpoint.journal_path())
+
+    loaded = ScrapingCheckpoint(checkpoint.path()).load()
+    assert loaded["step"] == 2
+    assert list(loaded["data"]["rows"]["a"]) == [0, 1, 2]
+    assert loaded["data"]["title"] == "second"
+    assert "items" not in loaded["data"]
+
+    # the third checkpoint after the complete one writes the complete state again
+    checkpoint.save(state(store, 3))
+    assert not os.path.exists(checkpoint.journal_path())
+    assert ScrapingCheckpoint(checkpoint.path()).load()["step"] == 3
+
+
+def test_a_record_cut_off_by_a_crash_is_ignored(tmp_path, caplog):
+    checkpoint = ScrapingCheckpoint(str(tmp_path / "run.checkpoint"), interval=0)
+    store = ScrapingDataStore()
+    store.append("items", "x")
+    checkpoint.save(state(store))
+    store.append("items", "y")
+    checkpoint.save(state(store, 1))
+    store.append("items", "z")
+    checkpoint.save(state(store, 2))
+    with open(checkpoint.journal_path(), "rb+") as f:
+        f.truncate(os.path.getsize(checkpoint.journal_path()) - 5)
+    with caplog.at_level(logging.WARNING):
+        loaded = ScrapingCheckpoint(checkpoint.path()).load()
+    assert loaded["step"] == 1
+    assert loaded["data"]["items"] == ["x", "y"]
+    assert "Skipped the last record" in caplog.text
+
+
+def test_a_corrupt_record_in_the_middle_is_an_error(tmp_path):
+    checkpoint = ScrapingCheckpoint(str(tmp_path / "run.checkpoint"), interval=0)
+    store = ScrapingDataStore()
+    store.append("items", "x")
+    checkpoint.save(state(store))
+    for step in (1, 2):
+        store.append("items", step)
+        checkpoint.save(state(store, step))
+    with open(checkpoint.journal_path(), "rb+") as f:
+        # the first byte of the first record after its length
+        f.seek(8)
+        f.write(b"\xff")
+    with pytest.raises(Exception, match="corrupt"):
+        ScrapingCheckpoint(checkpoint.path()).load()
+
+
+def test_resume_from_an_incremental_checkpoint(tmp_path):
+    path = str(tmp_path / "run.checkpoint")
+    fixtures = {URL + str(p): "<html><body><p>%d</p></body></html>" % p for p in range(1, 6)}
+
+    def new_bot(fail_on):
+        bot = ScrapingBot(ScrapingFakeDriver(fixtures, start_url=URL + "1"), pacing=ScrapingPacingNone(),
+                          checkpoint=ScrapingCheckpoint(path, interval=0))
+
+        def scrape(l):
+            page = l.current_url.rsplit("/", 1)[1]
+            if page == fail_on:
+                raise KeyboardInterrupt()
+            l.append_data("pages", {"page": int(page)})
+
+        bot.add_step(ScrapingStepPagination("list", scrape, lambda l, p: l.get(URL + str(p)), lambda l, p: True,
+                                            ScrapingStepPaginationMode.AllPages, lambda l: 5))
+        return bot
+
+    bot = new_bot("4")
+    try:
+        bot.run()
+    except KeyboardInterrupt:
+        pass
+    assert os.path.exists(path + ".journal")
+    bot = new_bot(None)
+    bot.run(resume_from=path)
+    assert list(bot.get_data("pages")["page"]) == [1, 2, 3, 4, 5]
@@ -0,0 +1,73 @@
+import pandas as pd
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingLogic import ScrapingLogicBuffered
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+
+
+def new_bot():
+    return ScrapingBot(ScrapingFakeDriver({}), pacing=ScrapingPacingNone())
+
+
+def test_append_rows_builds_a_frame():
+    bot = new_bot()
+    bot.append_data("rows", {"a": 1})
+    bot.append_data("rows", [{"a": 2}, {"a": 3}])
+    assert list(bot.get_data("rows")["a"]) == [1, 2, 3]
+
+
+def test_append_items_builds_a_list():
+    bot = new_bot()
+    bot.append_data("items", "x")
+    bot.append_data("items", "y")
+    assert bot.get_data("items") == ["x", "y"]
+
+
+def test_append_after_set_keeps_the_value():
+    bot = new_bot()
+    bot.set_data("items", ["x"])
+    bot.append_data("items", "y")
+    assert bot.get_data("items") == ["x", "y"]
+
+
+def test_buffered_two_appends_are_visible_with_the_data_of_the_bot():
+    bot = new_bot()
+    bot.append_data("rows", {"a": 0})
+    l = ScrapingLogicBuffered(bot._driver, bot)
+    l.append_data("rows", {"a": 1})
+    l.append_data("rows", {"a": 2})
+    assert list(l.get_data("rows")["a"]) == [0, 1, 2]
+    # nothing is written to the bot before the merge
+    assert list(bot.get_data("rows")["a"]) == [0]
+
+
+def test_buffered_two_appends_of_items():
+    bot = new_bot()
+    l = ScrapingLogicBuffered(bot._driver, bot)
+    l.append_data("items", "x")
+    l.append_data("items", "y")
+    assert l.has_data("items")
+    assert l.get_data("items") == ["x", "y"]
+    assert not bot.has_data("items")
+
+
+def test_buffered_set_replaces_the_data_of_the_bot():
+    bot = new_bot()
+    bot.set_data("items", ["old"])
+    l = ScrapingLogicBuffered(bot._driver, bot)
+    l.set_data("items", ["new"])
+    l.append_data("items", "more")
+    assert l.get_data("items") == ["new", "more"]
+
+
+def test_buffered_merge_writes_the_operations_in_order():
+    bot = new_bot()
+    first = ScrapingLogicBuffered(bot._driver, bot)
+    second = ScrapingLogicBuffered(bot._driver, bot)
+    second.append_data("rows", {"a": 3})
+    first.append_data("rows", {"a": 1})
+    first.append_data("rows", pd.DataFrame([{"a": 2}]))
+    first.merge_data()
+    second.merge_data()
+    assert list(bot.get_data("rows")["a"]) == [1, 2, 3]
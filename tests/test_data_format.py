@@ -0,0 +1,51 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyselenscrapr.ScrapingDataFormat import ScrapingDataFormat, decode_frame, encode_frame
+
+
+def frame():
+    return pd.DataFrame({"int": [1, 2], "float": [1.5, np.nan], "text": ["x", None],
+                         "time": pd.to_datetime(["2024-01-02 03:04:05", None])})
+
+
+@pytest.mark.parametrize("data_format", [ScrapingDataFormat.Records, ScrapingDataFormat.Split,
+                                         ScrapingDataFormat.Columns])
+def test_json_round_trip(data_format):
+    encoded = json.loads(json.dumps(encode_frame(frame(), data_format)))
+    assert "NaN" not in json.dumps(encoded)
+    decoded = decode_frame(encoded)
+    assert list(decoded.columns) == ["int", "float", "text", "time"]
+    assert decoded["int"].tolist() == [1, 2]
+    assert decoded["float"].iloc[0] == 1.5
+    assert decoded["text"].iloc[0] == "x"
+    assert decoded["time"].iloc[0] == "2024-01-02T03:04:05"
+    # the nulls are missing values again
+    assert decoded.iloc[1].isna().tolist() == [False, True, True, True]
+
+
+def test_nan_and_nat_are_null():
+    records = encode_frame(frame())
+    assert records[1] == {"int": 2, "float": None, "text": None, "time": None}
+    assert encode_frame(frame(), ScrapingDataFormat.Columns)["columns"]["time"] == ["2024-01-02T03:04:05", None]
+
+
+def test_arrow_round_trip():
+    pytest.importorskip("pyarrow")
+    encoded = json.loads(json.dumps(encode_frame(frame(), ScrapingDataFormat.Arrow)))
+    pd.testing.assert_frame_equal(decode_frame(encoded), frame(), check_dtype=False)
+
+
+@pytest.mark.parametrize("data_format", [ScrapingDataFormat.Records, ScrapingDataFormat.Columns])
+def test_duplicate_columns_are_rejected(data_format):
+    df = pd.DataFrame([[1, 2]], columns=["a", "a"])
+    with pytest.raises(ValueError, match="duplicate"):
+        encode_frame(df, data_format)
+
+
+def test_split_keeps_duplicate_columns():
+    df = pd.DataFrame([[1, 2]], columns=["a", "a"])
+    assert encode_frame(df, ScrapingDataFormat.Split) == {"columns": ["a", "a"], "data": [[1, 2]]}
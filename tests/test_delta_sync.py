@@ -0,0 +1,181 @@
+import pickle
+
+from pyselenscrapr.ScrapingBackend import IScrapingBackend, ScrapingBackendWebhook
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingDataStore import ScrapingDataStore
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+
+
+class DeferredBackend(IScrapingBackend):
+    """
+    Keeps the changes and reports the delivery only when deliver() is called, like a backend that sends in the
+    background.
+    """
+    def __init__(self):
+        self.sent = []
+        self._delivered = []
+
+    def save_changes(self, data, delivered):
+        self.sent.append(data)
+        self._delivered.append(delivered)
+
+    def deliver(self):
+        for delivered in self._delivered:
+            delivered()
+        self._delivered = []
+
+    def errorHandling(self, error, debugData=None):
+        pass
+
+
+def new_bot(backend):
+    return ScrapingBot(ScrapingFakeDriver({}), pacing=ScrapingPacingNone(), backend=backend, delta_sync=True)
+
+
+def test_store_watermarks():
+    store = ScrapingDataStore()
+    store.append("rows", {"a": 1})
+    store["title"] = "x"
+    changed_set, changed_append, token = store.changes()
+    assert changed_set == {"title": "x"}
+    assert changed_append["rows"][0] == 0
+    store.acknowledge(token)
+    store.append("rows", {"a": 2})
+    changed_set, changed_append, token = store.changes()
+    assert changed_set == {}
+    offset, rows = changed_append["rows"]
+    assert offset == 1 and list(rows["a"]) == [2]
+
+
+def test_store_keeps_the_highest_watermark():
+    store = ScrapingDataStore()
+    store.append("items", "x")
+    old_token = store.changes()[2]
+    store.append("items", "y")
+    new_token = store.changes()[2]
+    store.acknowledge(new_token)
+    store.acknowledge(old_token)
+    assert store.changes()[2] == {}
+
+
+def test_store_set_during_the_send_is_sent_again():
+    store = ScrapingDataStore()
+    store["title"] = "x"
+    token = store.changes()[2]
+    store["title"] = "y"
+    store.acknowledge(token)
+    assert store.changes()[0] == {"title": "y"}
+
+
+def test_store_can_be_pickled():
+    store = ScrapingDataStore()
+    store.append("items", "x")
+    copy = pickle.loads(pickle.dumps(store))
+    copy.append("items", "y")
+    assert copy["items"] == ["x", "y"]
+
+
+def test_changes_are_acknowledged_on_delivery():
+    backend = DeferredBackend()
+    bot = new_bot(backend)
+    bot.append_data("items", "x")
+    assert bot.send_changes_to_backend()
+    # not delivered yet, so the same rows are sent again
+    bot.append_data("items", "y")
+    bot.send_changes_to_backend()
+    assert backend.sent[1]["append"]["items"] == {"offset": 0, "rows": ["x", "y"]}
+    backend.deliver()
+    bot.append_data("items", "z")
+    bot.send_changes_to_backend()
+    assert backend.sent[2]["append"]["items"] == {"offset": 2, "rows": ["z"]}
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+
+class Session:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.posts = 0
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.posts += 1
+        return Response(self.status_code)
+
+    def close(self):
+        pass
+
+
+def test_webhook_errors_are_not_acknowledged():
+    session = Session(500)
+    bot = new_bot(ScrapingBackendWebhook("http://hook", retries=0, session=session))
+    bot.append_data("items", "x")
+    assert not bot.send_changes_to_backend()
+    session.status_code = 200
+    assert bot.send_changes_to_backend()
+    assert bot._data.changes()[2] == {}
+
+
+def test_webhook_in_the_background_acknowledges_after_the_post():
+    session = Session(500)
+    backend = ScrapingBackendWebhook("http://hook", retries=0, session=session, background=True)
+    bot = new_bot(backend)
+    bot.append_data("items", "x")
+    assert bot.send_changes_to_backend()
+    backend.flush()
+    assert "items" in bot._data.changes()[1]
+    session.status_code = 200
+    bot.send_changes_to_backend()
+    backend.close()
+    assert bot._data.changes()[2] == {}
+
+
+def test_values_from_reads_only_the_new_rows():
+    store = ScrapingDataStore(chunk_size=3)
+    for i in range(8):
+        store.append("rows", {"a": i})
+    accumulator = store._values["rows"]
+    for offset in range(9):
+        rows = accumulator.values_from(offset)
+        assert list(rows.get("a", [])) == list(range(offset, 8))
+        assert list(rows.index) == list(range(offset, 8))
+    # the frame of all rows is not built for a delta
+    assert accumulator._frame is None
+    assert list(store["rows"]["a"]) == list(range(8))
+    assert list(accumulator.values_from(5)["a"]) == [5, 6, 7]
+
+
+class FailingBackend(DeferredBackend):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def save_changes(self, data, delivered):
+        if self.failures > 0:
+            self.failures -= 1
+            raise Exception("backend down")
+        super().save_changes(data, delivered)
+
+
+def test_a_failed_send_is_sent_again_with_the_same_sequence():
+    backend = FailingBackend(1)
+    bot = new_bot(backend)
+    bot.append_data("items", "x")
+    assert not bot.send_changes_to_backend()
+    assert bot.send_changes_to_backend()
+    # the same changes, not delivered yet
+    assert bot.send_changes_to_backend()
+    assert [d["sequence"] for d in backend.sent] == [1, 1]
+    backend.deliver()
+    bot.append_data("items", "y")
+    bot.send_changes_to_backend()
+    assert [d["sequence"] for d in backend.sent] == [1, 1, 2]
+    # new changes before the delivery get a new number
+    bot.append_data("items", "z")
+    bot.send_changes_to_backend()
+    assert backend.sent[-1]["sequence"] == 3
+    assert backend.sent[-1]["append"]["items"] == {"offset": 1, "rows": ["y", "z"]}
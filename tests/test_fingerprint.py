@@ -0,0 +1,93 @@
+import asyncio
+
+from pyselenscrapr.AsyncScrapingBot import AsyncScrapingBot
+from pyselenscrapr.AsyncScrapingStep import AsyncScrapingStepPagination
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingFingerprintIndex import ScrapingFingerprintIndex
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+from pyselenscrapr.ScrapingStepPagination import ScrapingStepPagination, ScrapingStepPaginationMode
+
+URL = "https://fixtures.local/list/"
+
+
+def site(pages, content):
+    return {URL + str(p): "<html><body><ul id=\"list\">%s</ul></body></html>" % content(p) for p in range(1, pages + 1)}
+
+
+def run(fixtures, index, sessions=1):
+    driver = ScrapingFakeDriver(fixtures, start_url=URL + "1")
+    bot = ScrapingBot(driver, pacing=ScrapingPacingNone())
+    scraped = []
+
+    def scrape(l):
+        scraped.append(l.current_url)
+        for item in l.snapshot("#list li", all=True):
+            l.append_data("items", item["text"])
+
+    bot.add_step(ScrapingStepPagination("list", scrape, lambda l, p: l.get(URL + str(p)), lambda l, p: True,
+                                        ScrapingStepPaginationMode.AllPages, lambda l: len(fixtures),
+                                        sessions=sessions,
+                                        driver_factory=lambda: ScrapingFakeDriver(fixtures, start_url=URL + "1"),
+                                        fingerprint_index=index, fingerprint_selector="#list li"))
+    bot.run()
+    return bot.get_data("items"), scraped
+
+
+def test_unchanged_pages_are_replayed(tmp_path):
+    index = ScrapingFingerprintIndex(str(tmp_path / "index.db"))
+    fixtures = site(3, lambda p: "<li>%d a</li><li>%d b</li>" % (p, p))
+    items, scraped = run(fixtures, index)
+    assert len(scraped) == 3
+    fixtures[URL + "2"] = fixtures[URL + "2"].replace("2 b", "2 c")
+    replayed, scraped = run(fixtures, index)
+    assert scraped == [URL + "2"]
+    assert replayed == ["1 a", "1 b", "2 a", "2 c", "3 a", "3 b"]
+    assert index.stats() == {"hits": 2, "misses": 4}
+
+
+def test_pages_without_content_are_not_stored(tmp_path):
+    index = ScrapingFingerprintIndex(str(tmp_path / "index.db"))
+    fixtures = site(2, lambda p: "" if p == 2 else "<li>1</li>")
+    run(fixtures, index)
+    items, scraped = run(fixtures, index)
+    assert scraped == [URL + "2"]
+    assert items == ["1"]
+
+
+def test_replay_with_sessions(tmp_path):
+    index = ScrapingFingerprintIndex(str(tmp_path / "index.db"))
+    fixtures = site(4, lambda p: "<li>%d</li>" % p)
+    run(fixtures, index, sessions=2)
+    items, scraped = run(fixtures, index, sessions=2)
+    assert scraped == []
+    assert items == ["1", "2", "3", "4"]
+
+
+def test_async_pagination_replays_unchanged_pages(tmp_path):
+    index = ScrapingFingerprintIndex(str(tmp_path / "index.db"))
+    fixtures = site(3, lambda p: "<li>%d</li>" % p)
+
+    def run_async():
+        bot = AsyncScrapingBot(ScrapingFakeDriver(fixtures, start_url=URL + "1"), pacing=ScrapingPacingNone())
+        scraped = []
+
+        async def scrape(l):
+            scraped.append(await l.attribute("current_url"))
+            for item in await l.snapshot("#list li", all=True):
+                l.append_data("items", item["text"])
+
+        bot.add_step(AsyncScrapingStepPagination("list", scrape, lambda l, p: l.get(URL + str(p)),
+                                                 lambda l, p: True, ScrapingStepPaginationMode.AllPages,
+                                                 lambda l: len(fixtures), fingerprint_index=index,
+                                                 fingerprint_selector="#list li"))
+        asyncio.run(bot.run())
+        return bot, scraped
+
+    run_async()
+    fixtures[URL + "3"] = fixtures[URL + "3"].replace("3", "three")
+    bot, scraped = run_async()
+    assert scraped == [URL + "3"]
+    assert bot.get_data("items") == ["1", "2", "three"]
+    assert bot.metrics().page_latency("fixtures.local", outcome="replayed")["count"] == 2
+    assert bot.metrics().page_latency("fixtures.local")["count"] == 1
@@ -0,0 +1,92 @@
+import pytest
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingLogic import ScrapingLogic, grid_to_df
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+
+URL = "https://fixtures.local/"
+
+
+def new_logic(html, **kwargs):
+    driver = ScrapingFakeDriver({URL: html}, start_url=URL)
+    bot = ScrapingBot(driver, pacing=ScrapingPacingNone(), **kwargs)
+    return ScrapingLogic(driver, bot)
+
+
+def test_snapshot_reads_the_values_again():
+    l = new_logic("<html><body><p id=\"price\">1.99</p></body></html>", element_cache=True)
+    assert l.snapshot("#price")["text"] == "1.99"
+    # the page changes the text with javascript, without a command of the bot
+    l._driver._soup.find(id="price").string = "2.99"
+    assert l.snapshot("#price")["text"] == "2.99"
+
+
+def test_snapshot_of_a_missing_element():
+    l = new_logic("<html><body></body></html>")
+    assert l.snapshot("#missing") is None
+    assert l.snapshot("#missing", all=True) == []
+
+
+def test_the_logic_of_the_bot_is_shared_and_has_no_state():
+    l = new_logic("<html><body><p id=\"a\">A</p></body></html>")
+    bot = l._bot
+    assert bot._new_logic() is bot._new_logic()
+    with pytest.raises(AttributeError):
+        bot._new_logic().page = 1
+    # driver functions are wrapped once, the results of elements are wrapped into a logic
+    assert l.find_element is l.find_element
+    assert l.find_element(By.ID, "a").text == "A"
+
+
+def test_grid_to_df_converts_numbers_by_position():
+    df = grid_to_df([["A", "A", "B"], ["1", "x", "1,000"], ["2", "y", ""]], header_rows=1)
+    assert list(df.columns) == ["A", "A.1", "B"]
+    assert list(df["A"]) == [1, 2]
+    assert list(df["A.1"]) == ["x", "y"]
+    assert df["B"].iloc[0] == 1000
+
+
+def test_grid_to_df_with_a_repeated_multi_index():
+    df = grid_to_df([["h", "h"], ["a", "a"], ["1", "2"]], header_rows=2)
+    assert list(df.columns) == [("h", "a"), ("h", "a")]
+    assert df.iloc[0].tolist() == [1, 2]
+
+
+def test_extract_tables():
+    l = new_logic("<html><body><table id=\"t\"><tr><th>Id</th><th>Name</th></tr><tr><td>1</td><td>A</td></tr>"
+                  "<tr><td>2</td><td>B</td></tr></table></body></html>")
+    df = l.extract_tables("#t", concat=True)
+    assert list(df.columns) == ["Id", "Name"]
+    assert list(df["Id"]) == [1, 2]
+
+
+def test_snapshot_is_one_round_trip():
+    l = new_logic("<html><body><a href=\"/1\">One</a><a href=\"/2\">Two</a></body></html>")
+    l._driver.reset_stats()
+    matches = l.snapshot("a", ["href"], all=True)
+    assert [m["text"] for m in matches] == ["One", "Two"]
+    assert l._driver.round_trips == 1
+
+
+def test_dom_snapshot_is_read_once_per_page_state():
+    html = "<html><body><h1 id=\"title\">%s</h1><a href=\"/%s\">next</a><li>1</li><li>2</li></body></html>"
+    driver = ScrapingFakeDriver({URL + "1": html % ("One", "2"), URL + "2": html % ("Two", "1")}, start_url=URL + "1")
+    bot = ScrapingBot(driver, pacing=ScrapingPacingNone(), element_cache=True, dom_snapshot=True)
+    l = ScrapingLogic(driver, bot)
+    driver.reset_stats()
+    assert l.element_exists("#title")
+    assert l.element_count("li") == 2
+    assert l.element_text("#title") == "One"
+    assert driver.round_trips == 1
+    assert driver.commands[Command.GET_PAGE_SOURCE] == 1
+
+    # a mutating command of the logic or of an element of the snapshot starts a new page state
+    l.execute_script("window.scrollTo(0, 0)")
+    assert l.element_count("li") == 2
+    assert driver.commands[Command.GET_PAGE_SOURCE] == 2
+    l.get_all_elements("a")[0].click()
+    assert l.element_text("#title") == "Two"
+    assert driver.commands[Command.GET_PAGE_SOURCE] == 3
@@ -0,0 +1,81 @@
+import threading
+import time
+
+from selenium.webdriver.remote.command import Command
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+from pyselenscrapr.ScrapingStep import ScrapingStep
+from pyselenscrapr.ScrapingStepLoop import ScrapingStepLoop
+
+URL = "https://fixtures.local/"
+ITEMS = 6
+FIXTURES = {URL: "<html><body>%s</body></html>" % "".join("<a href=\"/item/%d\">%d</a>" % (i, i) for i in range(ITEMS))}
+FIXTURES.update({URL + "item/%d" % i: "<html><body><h1>Item %d</h1></body></html>" % i for i in range(ITEMS)})
+
+
+def read_item(l):
+    index = l.index()
+    # the first elements finish last
+    time.sleep(0.01 * (ITEMS - index))
+    if index == 2 and l.get_data("fail") is not None:
+        raise Exception("broken item")
+    l.append_data("items", {"index": index, "title": l.element_text("h1")})
+    return l._driver
+
+
+def run(concurrency, fail=False):
+    workers = []
+    lock = threading.Lock()
+
+    def driver_factory():
+        driver = ScrapingFakeDriver(FIXTURES)
+        with lock:
+            workers.append(driver)
+        return driver
+
+    bot = ScrapingBot(ScrapingFakeDriver(FIXTURES, start_url=URL), pacing=ScrapingPacingNone())
+    errors = []
+    bot.set_exception_handler(errors.append)
+    if fail:
+        bot.set_data("fail", True)
+
+    def open_item(l):
+        # the serial mode is on the driver of the bot and opens the url itself
+        if l._driver is bot._driver:
+            l.get(URL + "item/%d" % l.index())
+
+    loop = ScrapingStepLoop("items", lambda l: l.find_elements("xpath", "//a"),
+                            [ScrapingStep("open", open_item), ScrapingStep("read", read_item)],
+                            concurrency=concurrency, driver_factory=driver_factory,
+                            url_callback=lambda l: URL + "item/%d" % l.index())
+    bot.add_step(loop)
+    bot.run()
+    return bot, loop, workers, errors
+
+
+def test_concurrent_results_match_the_serial_order():
+    serial, serial_loop, workers, errors = run(1)
+    bot, loop, workers, errors = run(3)
+    assert len(workers) == 3
+    assert errors == []
+    assert list(bot.get_data("items")["index"]) == list(range(ITEMS))
+    assert bot.get_data("items").equals(serial.get_data("items"))
+    # every element ran its steps on a worker session
+    assert len(loop.results) == ITEMS
+    assert all(results[1] in workers for results in loop.results)
+
+
+def test_an_element_that_raises_is_reported_once():
+    bot, loop, workers, errors = run(3, fail=True)
+    assert [str(e) for e in errors] == ["broken item"]
+    assert list(loop.errors) == [2]
+    assert list(bot.get_data("items")["index"]) == [0, 1, 3, 4, 5]
+
+
+def test_worker_drivers_are_quit():
+    bot, loop, workers, errors = run(2, fail=True)
+    assert len(workers) == 2
+    assert all(driver.commands[Command.QUIT] == 1 for driver in workers)
+    assert bot._driver.commands[Command.QUIT] == 0
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+from pyselenscrapr.AsyncScrapingBot import AsyncScrapingBot
+from pyselenscrapr.AsyncScrapingStep import AsyncScrapingStep
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingMetrics import ScrapingMetrics
+from pyselenscrapr.ScrapingPacing import ScrapingPacingFixed, ScrapingPacingNone, ScrapingVirtualClock
+from pyselenscrapr.ScrapingStep import ScrapingStepErrorHandling
+from pyselenscrapr.ScrapingStepPagination import ScrapingStepPagination, ScrapingStepPaginationMode
+
+URL = "https://fixtures.local/list/"
+
+
+def test_counters_from_many_threads():
+    metrics = ScrapingMetrics()
+
+    def work():
+        for i in range(2000):
+            metrics.observe_step("step", "wall", 0.01)
+            metrics.count_retry("step")
+            metrics.count_sleep("step", 1)
+            metrics.count_outcome("step", "ok")
+    threads = [threading.Thread(target=work) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    step = metrics.to_dict()["steps"]["step"]
+    assert step["times"]["wall"]["count"] == 16000
+    assert step["retries"] == 16000
+    assert step["sleep"] == 16000
+    assert step["outcomes"] == {"ok": 16000}
+
+
+def test_page_latency_per_outcome():
+    fixtures = {URL + str(p): "<html><body><p>%d</p></body></html>" % p for p in range(1, 4)}
+    driver = ScrapingFakeDriver(fixtures, start_url=URL + "1")
+    bot = ScrapingBot(driver, pacing=ScrapingPacingNone())
+
+    def scrape(l):
+        if l.current_url.endswith("/2"):
+            raise Exception("broken page")
+
+    bot.add_step(ScrapingStepPagination("list", scrape, lambda l, p: l.get(URL + str(p)), lambda l, p: True,
+                                        ScrapingStepPaginationMode.AllPages, lambda l: 3))
+    bot.run()
+    metrics = bot.metrics()
+    assert metrics.page_latency("fixtures.local")["count"] == 2
+    assert metrics.page_latency("fixtures.local", outcome="failed")["count"] == 1
+    assert set(metrics.to_dict()["pages"]["fixtures.local"]) == {"ok", "failed"}
+    assert "outcome=\"failed\"" in metrics.to_prometheus()
+
+
+def test_async_steps_are_measured_and_attributed():
+    driver = ScrapingFakeDriver({URL + "1": "<html><body><p>1</p></body></html>"}, start_url=URL + "1")
+    bot = AsyncScrapingBot(driver, pacing=ScrapingPacingFixed(1), clock=ScrapingVirtualClock(), profile_driver=True)
+    attempts = []
+
+    async def read(l):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise Exception("first attempt fails")
+        await l.element_text("p")
+
+    bot.add_step(AsyncScrapingStep("open", lambda l: l.get(URL + "1")))
+    bot.add_step(AsyncScrapingStep("read", read, error_handling=ScrapingStepErrorHandling.Ignore))
+    assert asyncio.run(bot.run())
+
+    steps = bot.metrics().to_dict()["steps"]
+    assert steps["open"]["times"]["execute"]["count"] == 1
+    assert steps["open"]["outcomes"] == {"executed": 1}
+    assert steps["read"]["retries"] == 1
+    assert steps["read"]["times"]["wall"]["count"] == 1
+    # the pause after each step
+    assert steps["open"]["sleep"] == 1
+    assert "step=\"read\"" in bot.metrics().to_prometheus()
+    assert {r["step"] for r in bot.profiler().report()} == {"open", "read"}
@@ -0,0 +1,132 @@
+import collections
+import threading
+import time
+
+import pytest
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingLogic import ScrapingLogic
+from pyselenscrapr.ScrapingPacing import IScrapingPacing, ScrapingPacingCondition, ScrapingPacingEvent, \
+    ScrapingPacingFixed, ScrapingPacingJitter, ScrapingPacingNone, ScrapingPacingPerEvent, ScrapingVirtualClock
+from pyselenscrapr.ScrapingStep import ScrapingStep
+from pyselenscrapr.ScrapingStepLoop import ScrapingStepLoop
+from pyselenscrapr.ScrapingStepPagination import ScrapingStepPagination, ScrapingStepPaginationMode
+
+
+def new_bot(condition):
+    return ScrapingBot(ScrapingFakeDriver({}), pacing=ScrapingPacingCondition(condition, max_wait=1),
+                       clock=ScrapingVirtualClock())
+
+
+def test_condition_is_checked_on_the_logic_that_pauses():
+    drivers = []
+    bot = new_bot(lambda l: drivers.append(l._driver) or True)
+    worker = ScrapingFakeDriver({})
+    ScrapingLogic(worker, bot).pace(ScrapingPacingEvent.AfterPage, 1)
+    bot.pace(ScrapingPacingEvent.AfterStep, 1)
+    assert drivers == [worker, bot._driver]
+
+
+def test_condition_is_checked_on_the_session_of_the_thread():
+    drivers = []
+    bot = new_bot(lambda l: drivers.append(l._driver) or True)
+    worker = ScrapingFakeDriver({})
+
+    def run():
+        bot._set_session_driver(worker)
+        bot.pace(ScrapingPacingEvent.AfterStep, 1)
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    assert drivers == [worker]
+
+
+def test_condition_waits_at_most_max_wait():
+    bot = new_bot(lambda l: False)
+    assert bot.pace(ScrapingPacingEvent.AfterStep, 1) >= 1
+
+
+class Recorder(IScrapingPacing):
+    """
+    Records every pause of the policy it wraps.
+    """
+    def __init__(self, policy):
+        self.policy = policy
+        self.pauses = []
+
+    def pause(self, event, seconds, bot):
+        paused = self.policy.pause(event, seconds, bot)
+        self.pauses.append((event, paused))
+        return paused
+
+    def totals(self):
+        totals = collections.defaultdict(float)
+        for event, paused in self.pauses:
+            totals[event] += paused
+        return dict(totals)
+
+    def counts(self):
+        return dict(collections.Counter(event for event, paused in self.pauses))
+
+
+URL = "https://fixtures.local/list/"
+EXPECTED_COUNTS = {ScrapingPacingEvent.AfterStep: 3, ScrapingPacingEvent.AfterNavigation: 2,
+                   ScrapingPacingEvent.AfterPage: 2, ScrapingPacingEvent.BetweenPages: 2,
+                   ScrapingPacingEvent.AfterLoopElement: 3, ScrapingPacingEvent.AfterGroup: 1,
+                   ScrapingPacingEvent.AfterRun: 1}
+
+
+def run_in_virtual_time(policy):
+    """
+    Run a group with a step, a pagination over 2 pages and a loop over 3 elements.
+    """
+    fixtures = {URL + str(p): "<html><body><p>%d</p></body></html>" % p for p in range(1, 3)}
+    clock = ScrapingVirtualClock()
+    recorder = Recorder(policy)
+    bot = ScrapingBot(ScrapingFakeDriver(fixtures, start_url=URL + "1"), pacing=recorder, clock=clock)
+    bot.add_step(ScrapingStep("open", lambda l: l.get(URL + "1")))
+    bot.add_step(ScrapingStepPagination("pages", lambda l: l.append_data("pages", l.element_text("p")),
+                                        lambda l, p: l.get(URL + str(p)), lambda l, p: True,
+                                        ScrapingStepPaginationMode.AllPages, lambda l: 2))
+    bot.add_step(ScrapingStepLoop("loop", lambda l: [1, 2, 3],
+                                  [ScrapingStep("item", lambda l: l.append_data("items", l.element()))]))
+    started = time.monotonic()
+    assert bot.run()
+    # nothing really slept
+    assert time.monotonic() - started < 5
+    assert bot.get_data("pages") == ["1", "2"]
+    assert bot.get_data("items") == [1, 2, 3]
+    assert recorder.counts() == EXPECTED_COUNTS
+    assert clock.slept == pytest.approx(sum(paused for event, paused in recorder.pauses))
+    assert clock.now() == clock.slept
+    return clock, recorder
+
+
+def test_fixed_in_virtual_time():
+    clock, recorder = run_in_virtual_time(ScrapingPacingFixed(events={ScrapingPacingEvent.BetweenPages: 4}))
+    assert recorder.totals() == {ScrapingPacingEvent.AfterStep: 6, ScrapingPacingEvent.AfterNavigation: 2,
+                                 ScrapingPacingEvent.AfterPage: 2, ScrapingPacingEvent.BetweenPages: 8,
+                                 ScrapingPacingEvent.AfterLoopElement: 6, ScrapingPacingEvent.AfterGroup: 1,
+                                 ScrapingPacingEvent.AfterRun: 1}
+    assert clock.slept == 26
+
+
+def test_jitter_in_virtual_time():
+    clock, recorder = run_in_virtual_time(ScrapingPacingJitter(min_seconds=1, max_seconds=2, seed=7))
+    assert all(1 <= paused <= 2 for event, paused in recorder.pauses)
+    assert len(set(paused for event, paused in recorder.pauses)) > 1
+    # the same seed pauses the same
+    assert run_in_virtual_time(ScrapingPacingJitter(min_seconds=1, max_seconds=2, seed=7))[0].slept == clock.slept
+
+
+def test_per_event_in_virtual_time():
+    clock, recorder = run_in_virtual_time(ScrapingPacingPerEvent({
+        ScrapingPacingEvent.AfterStep: ScrapingPacingFixed(0.5),
+        ScrapingPacingEvent.BetweenPages: ScrapingPacingNone()
+    }))
+    totals = recorder.totals()
+    assert totals[ScrapingPacingEvent.AfterStep] == 1.5
+    assert totals[ScrapingPacingEvent.BetweenPages] == 0
+    assert totals[ScrapingPacingEvent.AfterLoopElement] == 6
+    assert clock.slept == 13.5
@@ -0,0 +1,79 @@
+import threading
+
+from selenium.webdriver.remote.command import Command
+
+from pyselenscrapr.ScrapingBotPool import ScrapingBotPool
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+from pyselenscrapr.ScrapingStep import ScrapingStep
+
+
+def new_pool(max_workers, setup):
+    drivers = []
+    lock = threading.Lock()
+
+    def driver_factory():
+        driver = ScrapingFakeDriver({})
+        with lock:
+            drivers.append(driver)
+        return driver
+
+    return ScrapingBotPool(driver_factory, setup, max_workers=max_workers, pacing=ScrapingPacingNone()), drivers
+
+
+def test_drivers_are_reused_and_replaced_after_a_bot_raised():
+    bots = []
+
+    def scrape(job):
+        attempts = []
+
+        def execute(l):
+            attempts.append(l)
+            l.set_data("job", job)
+            if job == "raise" or (job == "retry" and len(attempts) == 1):
+                raise Exception("broken " + job)
+        return execute
+
+    def raise_error(e):
+        raise e
+
+    def setup(bot, job):
+        bots.append(bot)
+        # the error of the job "raise" escapes bot.run()
+        bot.set_exception_handler(raise_error if job == "raise" else lambda e: None)
+        bot.add_step(ScrapingStep("scrape", scrape(job)))
+
+    pool, drivers = new_pool(1, setup)
+    with pool:
+        results = pool.run(["ok", "retry", "ok", "raise", "ok"])
+        assert [r.success for r in results] == [True, True, True, False, True]
+        assert str(results[3].error) == "broken raise"
+        # the driver of a retried step goes back to the queue, the one of the bot that raised is quit and replaced
+        assert len(drivers) == 2
+        assert [bot._driver for bot in bots] == [drivers[0]] * 4 + [drivers[1]]
+        assert drivers[0].commands[Command.QUIT] == 1
+        assert drivers[1].commands[Command.QUIT] == 0
+        for result, bot in zip(results, bots):
+            assert result.data == bot._data.to_dict()
+        assert [r.data for r in results] == [{"job": job} for job in ("ok", "retry", "ok", "raise", "ok")]
+    assert drivers[1].commands[Command.QUIT] == 1
+
+
+def test_concurrent_jobs_share_the_drivers():
+    bots = []
+    lock = threading.Lock()
+
+    def setup(bot, job):
+        with lock:
+            bots.append(bot)
+        bot.add_step(ScrapingStep("scrape", lambda l: l.set_data("job", job)))
+
+    pool, drivers = new_pool(2, setup)
+    with pool:
+        results = pool.run(list(range(6)))
+    assert [r.index for r in results] == list(range(6))
+    assert [r.data for r in results] == [{"job": i} for i in range(6)]
+    assert all(r.success for r in results)
+    assert 1 <= len(drivers) <= 2
+    assert set(bot._driver for bot in bots) == set(drivers)
+    assert all(d.commands[Command.QUIT] == 1 for d in drivers)
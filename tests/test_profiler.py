@@ -0,0 +1,41 @@
+from pyselenscrapr import ScrapingDriverProfiler
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+from pyselenscrapr.ScrapingStep import ScrapingStep
+
+URL = "https://fixtures.local/"
+FIXTURES = {URL: "<html><body><p>text</p><a href=\"/next\">next</a></body></html>",
+            URL + "next": "<html><body><p>next</p></body></html>"}
+
+
+def run(profile_driver):
+    driver = ScrapingFakeDriver(FIXTURES)
+    helpers = []
+    driver.add_script("return 1", lambda *args: helpers.append(ScrapingDriverProfiler._active_helper.name) or 1)
+    bot = ScrapingBot(driver, pacing=ScrapingPacingNone(), profile_driver=profile_driver, element_cache=False)
+    bot.add_step(ScrapingStep("open", lambda l: l.get(URL)))
+    bot.add_step(ScrapingStep("read", lambda l: l.set_data("text", l.element_text("p"))))
+    # click_on_best_element looks the element up with get_best_element, the commands count for the outer helper
+    bot.add_step(ScrapingStep("click", lambda l: l.click_on_best_element("a")))
+    bot.add_step(ScrapingStep("direct", lambda l: l._driver.execute_script("return 1") and l.execute_script("return 1")))
+    bot.run()
+    return bot, driver, helpers
+
+
+def test_commands_are_attributed_to_the_step_and_the_helper():
+    bot, driver, helpers = run(True)
+    rows = {(r["step"], r["helper"]): r for r in bot.profiler().report()}
+    assert set(rows) == {("open", "driver.get"), ("read", "element_text"), ("click", "click_on_best_element"),
+                         ("direct", ""), ("direct", "driver.execute_script")}
+    assert bot.profiler().total()["calls"] == driver.round_trips
+    assert helpers == [None, "driver.execute_script"]
+    # the helper is only set while a call runs
+    assert ScrapingDriverProfiler._active_helper.name is None
+
+
+def test_disabled_profiler_names_no_helper():
+    bot, driver, helpers = run(False)
+    assert bot.profiler().report() == []
+    assert helpers == [None, None]
+    assert bot.get_data("text") == "text"
@@ -0,0 +1,95 @@
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+from pyselenscrapr.ScrapingStep import ScrapingStep, ScrapingStepInterval
+
+
+class LinearScrapingBot(ScrapingBot):
+    """
+    Chooses the steps with the linear scans the bot used before the ScrapingStepScheduler.
+    """
+    def all_groups_executed(self):
+        for group in self._stepGroups:
+            for step in group._steps:
+                if not step.was_executed():
+                    return False
+        return True
+
+    def get_next_step(self, step):
+        for s in self._current_group._steps:
+            if s.interval() != ScrapingStepInterval.Order:
+                continue
+            if s.was_executed():
+                continue
+            if s.previous_step() is None:
+                return s
+            if s.previous_step().was_executed():
+                return s
+        return None
+
+    def get_all_steps_by_interval(self, interval):
+        return [s for s in self._current_group._steps if s.interval() == interval and not s.was_executed()]
+
+    def _is_group_finished(self, group):
+        for step in group._steps:
+            if not step.was_executed():
+                return False
+        return True
+
+
+def run(bot_cls):
+    bot = bot_cls(ScrapingFakeDriver(), pacing=ScrapingPacingNone())
+    order = []
+
+    def step(name, execute=None, **kwargs):
+        def run_step(l):
+            order.append(name)
+            if execute is not None:
+                execute(l)
+        s = ScrapingStep(name, run_step, **kwargs)
+        # like bot.add_step, for the steps that are added with ScrapingStepGroup.add_step
+        s.before_validation = None
+        s.after_validation = None
+        return s
+
+    first = bot.add_step_group("first")
+    second = bot.add_step_group("second")
+    a = step("a")
+    extra = step("extra")
+    runs = {}
+
+    def reset_and_extend(l):
+        runs["c"] = runs.get("c", 0) + 1
+        if runs["c"] == 1:
+            # a runs again, b waits for it again, a new step is appended and a is appended a second time
+            a.reset()
+            b.reset()
+            first.add_step(extra)
+            first.add_step(a)
+
+    b = step("b", previous_step=a)
+    bot.add_step(b, first)
+    bot.add_step(a, first)
+    bot.add_step(step("c", reset_and_extend), first)
+    bot.add_step(step("before", interval=ScrapingStepInterval.BeforeAnyStep), first)
+
+    e = step("e")
+
+    def reset_e(l):
+        runs["g"] = runs.get("g", 0) + 1
+        if runs["g"] == 1:
+            e.reset()
+            f.reset()
+
+    f = step("f", previous_step=e)
+    bot.add_step(f, second)
+    bot.add_step(e, second)
+    bot.add_step(step("g", reset_e, previous_step=f), second)
+    assert bot.run("first")
+    return order
+
+
+def test_the_scheduler_chooses_the_steps_like_the_linear_scan():
+    order = run(ScrapingBot)
+    assert order == run(LinearScrapingBot)
+    assert order == ["before", "a", "b", "c", "a", "b", "extra", "e", "f", "g", "e", "f"]
@@ -0,0 +1,95 @@
+import base64
+import os
+import threading
+
+import pytest
+
+from selenium.webdriver.remote.command import Command
+
+from pyselenscrapr.ScrapingBot import ScrapingBot, TakeScreenshotModes
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+from pyselenscrapr.ScrapingScreenshots import ScrapingScreenshotWriter
+from pyselenscrapr.ScrapingStep import ScrapingStep
+
+URL = "https://fixtures.local/"
+FIXTURES = {URL + str(p): "<html><body><p>%d</p></body></html>" % p for p in range(1, 6)}
+
+
+class PageScreenshots(ScrapingFakeDriver):
+    """
+    A fake driver whose screenshot is the url of the page, so every page has another screenshot.
+    """
+    def get_screenshot_as_base64(self):
+        self.execute(Command.SCREENSHOT)
+        return base64.b64encode(self.current_url.encode("utf-8")).decode("ascii")
+
+
+class SlowWriter(ScrapingScreenshotWriter):
+    """
+    Writes a file only when the test allows it, so the files are still queued when the bot flushes.
+    """
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self.allowed = threading.Event()
+
+    def _save(self, file_name, frame):
+        self.allowed.wait()
+        super()._save(file_name, frame)
+
+
+class Stop(BaseException):
+    pass
+
+
+def stop(e):
+    # the error ends the run after its screenshots were taken
+    raise Stop()
+
+
+def new_bot(writer, mode):
+    bot = ScrapingBot(PageScreenshots(FIXTURES, start_url=URL + "1"), pacing=ScrapingPacingNone(),
+                      take_screenshots_mode=mode, screenshot_writer=writer)
+    bot.set_exception_handler(stop)
+    return bot
+
+
+def written(path):
+    return sorted(os.listdir(path))
+
+
+def test_flush_writes_every_queued_screenshot(tmp_path):
+    writer = SlowWriter(str(tmp_path))
+    bot = new_bot(writer, TakeScreenshotModes.Always)
+    for p in range(1, 6):
+        bot._driver.get(URL + str(p))
+        bot._take_screenshot(ScrapingStep("page" + str(p), lambda l: None))
+    assert written(tmp_path) == []
+    writer.allowed.set()
+    bot._flush_screenshots()
+    assert written(tmp_path) == ["%06d_page%d.png" % (p, p) for p in range(1, 6)]
+    with open(tmp_path / "000003_page3.png", "rb") as f:
+        assert f.read() == (URL + "3").encode("utf-8")
+    writer.close()
+
+
+def test_error_context_keeps_the_last_shots_before_the_error(tmp_path):
+    writer = ScrapingScreenshotWriter(str(tmp_path), ring_size=2)
+    bot = new_bot(writer, TakeScreenshotModes.ErrorContext)
+    for p in range(1, 5):
+        bot.add_step(ScrapingStep("page" + str(p), lambda l, p=p: l.get(URL + str(p))))
+
+    def fail(l):
+        raise Exception("broken")
+    bot.add_step(ScrapingStep("fail", fail))
+    with pytest.raises(Stop):
+        bot.run()
+    writer.flush()
+    files = written(tmp_path)
+    # the shots of page1 and page2 were pushed out of the ring
+    assert not any("page1" in f or "page2" in f for f in files)
+    assert [f.split("_", 1)[1] for f in files[:3]] == ["default_page3.png", "default_page4.png", "default_fail.png"]
+    # the page didn't change since page4, the error shot is still written
+    with open(tmp_path / files[1], "rb") as a, open(tmp_path / files[2], "rb") as b:
+        assert a.read() == b.read()
+    writer.close()
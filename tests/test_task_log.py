@@ -0,0 +1,21 @@
+from pyselenscrapr.ScrapingTaskLog import ScrapingTaskLog
+
+
+def test_exceptions_are_formatted_on_append():
+    log = ScrapingTaskLog()
+    try:
+        raise ValueError("broken")
+    except ValueError as e:
+        entry = log.append("debug", "Exception: ", e)
+    assert entry._args == ("broken",)
+    assert entry.message() == "Exception: broken"
+    assert log.append("error", KeyError("key"))._message == "'key'"
+
+
+def test_levels_have_their_own_ring():
+    log = ScrapingTaskLog(size=2, retention={"error": 3})
+    for i in range(5):
+        log.append("debug", "d", i)
+        log.append("error", "e", i)
+    messages = [e["message"] for e in log.entries()]
+    assert messages == ["e2", "d3", "e3", "d4", "e4"]
@@ -0,0 +1,83 @@
+import pytest
+from selenium.common.exceptions import JavascriptException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from pyselenscrapr.ScrapingBot import ScrapingBot
+from pyselenscrapr.ScrapingFakeDriver import ScrapingFakeDriver
+from pyselenscrapr.ScrapingLogic import ScrapingLogic
+from pyselenscrapr.ScrapingPacing import ScrapingPacingNone
+from pyselenscrapr.ScrapingWaits import WAIT_ELEMENT_SCRIPT, WAIT_READY_STATE_SCRIPT
+
+URL = "https://fixtures.local/"
+HTML = "<html><body><p id=\"a\">Text</p><button id=\"b\" disabled>Go</button></body></html>"
+
+
+def new_logic(html=HTML):
+    driver = ScrapingFakeDriver({URL: html}, start_url=URL)
+    return ScrapingLogic(driver, ScrapingBot(driver, pacing=ScrapingPacingNone()))
+
+
+def raising(e):
+    def handler(*args):
+        raise e
+    return handler
+
+
+def test_wait_for_element():
+    l = new_logic()
+    assert l.wait_for_element("#a", timeout=1)
+    assert not l.wait_for_element("#missing", timeout=1)
+    assert l.wait_for_element("//p", timeout=1)
+    assert not l.wait_for_element("#b", timeout=1, state="clickable")
+    assert l.wait_for_element_gone("#missing", timeout=1)
+    assert l.wait_for_ready_state(timeout=1)
+
+
+def test_wait_until_present_with_a_locator():
+    l = new_logic()
+    assert l.wait_until_present((By.ID, "a"), timeout=0.2)
+    assert not l.wait_until_present((By.ID, "missing"), timeout=0.2)
+    assert l.wait_until_present("#a", timeout=1)
+    assert not l.wait_until_present(None)
+
+
+class StaleElement:
+    def is_enabled(self):
+        raise StaleElementReferenceException("stale")
+
+
+def test_wait_until_present_with_an_element():
+    l = new_logic()
+    assert l.wait_until_present(l._driver.find_element(By.ID, "a"))
+    assert not l.wait_until_present(StaleElement())
+
+
+def test_wait_returns_false_on_timeout_and_unload():
+    l = new_logic()
+    l._driver.add_script(WAIT_READY_STATE_SCRIPT, raising(TimeoutException("script timeout")))
+    assert not l.wait_for_ready_state(timeout=0)
+    l._driver.add_script(WAIT_ELEMENT_SCRIPT, raising(JavascriptException("document unloaded while waiting")))
+    assert not l.wait_for_element("#a", timeout=1)
+
+
+def test_wait_raises_script_errors():
+    l = new_logic()
+    l._driver.add_script(WAIT_ELEMENT_SCRIPT, raising(JavascriptException("MutationObserver is not defined")))
+    with pytest.raises(JavascriptException):
+        l.wait_for_element("#a", timeout=1)
+
+
+def test_wait_sets_the_script_timeout_again_after_an_early_timeout():
+    l = new_logic()
+    calls = []
+
+    def early_timeout(*args):
+        calls.append(args[0])
+        if len(calls) == 1:
+            # the script timeout was lowered elsewhere, selenium times out before the deadline of the script
+            raise TimeoutException("script timeout")
+        return True
+    l._driver.add_script(WAIT_ELEMENT_SCRIPT, early_timeout)
+    assert l.wait_for_element("#a", timeout=5)
+    assert len(calls) == 2
+    assert l._driver.commands["setTimeouts"] == 2
@@ -0,0 +1,132 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pyselenscrapr.ScrapingBackend import ScrapingBackendWebhook
+
+
+class StandIn:
+    """
+    A local HTTP stand-in for the webhook. It records every request and answers with the next status of statuses,
+    200 when there is none left.
+    """
+    def __init__(self):
+        self.requests = []
+        self.statuses = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                encoding = self.headers.get("Content-Encoding")
+                if encoding == "gzip":
+                    body = gzip.decompress(body)
+                stand_in.requests.append({"path": self.path, "encoding": encoding, "body": json.loads(body),
+                                          "client": self.client_address})
+                status = stand_in.statuses.pop(0) if len(stand_in.statuses) > 0 else 200
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:" + str(self.server.server_address[1])
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def bodies(self, path="/data"):
+        return [r["body"] for r in self.requests if r["path"] == path]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    s = StandIn()
+    yield s
+    s.close()
+
+
+def test_requests_share_a_pooled_connection(stand_in):
+    backend = ScrapingBackendWebhook(stand_in.url)
+    for i in range(3):
+        backend.saveData({"i": i})
+    backend.notify("done")
+    backend.close()
+    assert stand_in.bodies() == [{"i": 0}, {"i": 1}, {"i": 2}]
+    assert stand_in.bodies("/notify") == [{"message": "done"}]
+    # the connection of the first request is kept open and used for all others
+    assert len({r["client"] for r in stand_in.requests}) == 1
+
+
+def test_background_flush_waits_for_the_requests(stand_in):
+    backend = ScrapingBackendWebhook(stand_in.url, background=True)
+    delivered = []
+    for i in range(5):
+        backend.save_changes({"sequence": i}, lambda i=i: delivered.append(i))
+    backend.flush()
+    assert stand_in.bodies() == [{"sequence": i} for i in range(5)]
+    assert delivered == [0, 1, 2, 3, 4]
+    backend.close()
+
+
+def test_batches_are_sent_as_a_list(stand_in):
+    backend = ScrapingBackendWebhook(stand_in.url, background=True, batch_size=3, batch_interval=0.05)
+    for i in range(4):
+        backend.saveData({"i": i})
+    backend.flush()
+    backend.close()
+    assert stand_in.bodies() == [[{"i": 0}, {"i": 1}, {"i": 2}], [{"i": 3}]]
+
+
+def test_gzip(stand_in):
+    backend = ScrapingBackendWebhook(stand_in.url, compress=True)
+    backend.saveData({"text": "a" * 1000})
+    backend.close()
+    assert stand_in.requests[0]["encoding"] == "gzip"
+    assert stand_in.bodies() == [{"text": "a" * 1000}]
+
+
+def test_retry_with_backoff_on_server_errors(stand_in):
+    stand_in.statuses = [503, 500]
+    backend = ScrapingBackendWebhook(stand_in.url, retries=3, backoff=0.01)
+    delivered = []
+    backend.save_changes({"sequence": 1}, lambda: delivered.append(1))
+    backend.close()
+    assert len(stand_in.bodies()) == 3
+    assert delivered == [1]
+
+
+def test_server_errors_after_the_last_retry_are_not_delivered(stand_in):
+    stand_in.statuses = [503, 503]
+    backend = ScrapingBackendWebhook(stand_in.url, retries=1, backoff=0.01)
+    with pytest.raises(Exception):
+        backend.save_changes({"sequence": 1}, lambda: pytest.fail("delivered"))
+    backend.close()
+
+
+def test_an_error_of_a_callback_does_not_block_flush(stand_in):
+    backend = ScrapingBackendWebhook(stand_in.url, background=True, batch_size=2, batch_interval=0.05)
+    delivered = []
+
+    def broken():
+        raise Exception("broken callback")
+
+    backend.save_changes({"sequence": 1}, broken)
+    backend.save_changes({"sequence": 2}, lambda: delivered.append(2))
+    backend.save_changes({"sequence": 3}, lambda: delivered.append(3))
+    flushed = threading.Thread(target=backend.flush, daemon=True)
+    flushed.start()
+    flushed.join(timeout=5)
+    assert not flushed.is_alive()
+    assert delivered == [2, 3]
+    backend.close()